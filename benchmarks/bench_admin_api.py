@@ -0,0 +1,226 @@
+# Load test of the admin API against local stand-ins: stub auth/users servers
+# with configurable latency and a Mongo stand-in (see mongo_standin.py).
+#
+#   python -m benchmarks.bench_admin_api --concurrency 1 10 50 --duration 5
+#   python -m benchmarks.bench_admin_api --save local
+#   python -m benchmarks.bench_admin_api --compare local --tolerance 0.2
+#
+# Each scenario runs closed-loop: `concurrency` clients send requests back to
+# back for `duration` seconds. Throughput counts successful (< 400) responses
+# only; p50/p95/p99 latency and the error rate are printed alongside. Results
+# can be saved as a baseline in benchmarks/baselines/<name>.json (ignored by
+# git, as numbers from one machine say nothing about another); with --compare
+# the run exits non-zero when a scenario loses throughput or gains latency
+# beyond --tolerance, or its error rate rises beyond --error-tolerance.
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.mongo_standin import default_backend, open_database
+from benchmarks.stats import summarize
+from benchmarks.stub_services import StubServer, build_stub_app
+
+BASELINES = Path(__file__).parent / "baselines"
+SCENARIOS = ("login", "register", "block", "change_role", "users_info")
+ADMIN_EMAIL = "bench@example.com"
+ADMIN_PASSWORD = "benchpassword"
+REGISTER_IDS = itertools.count()
+
+
+def scenario_request(name: str, users: int):
+    # Returns (method, path, json body) for the next request of a scenario.
+    user_id = str(random.randrange(users))
+    if name == "login":
+        return (
+            "POST",
+            "/admin/login",
+            {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+        )
+    if name == "register":
+        email = f"bench{next(REGISTER_IDS)}-{os.getpid()}@example.com"
+        return "POST", "/admin/register", {"email": email, "password": "x" * 12}
+    if name == "block":
+        return "PATCH", f"/admin/block/{user_id}", {"to_block": random.random() < 0.5}
+    if name == "change_role":
+        rol = random.choice(("student", "teacher"))
+        return "PATCH", f"/admin/change_role/{user_id}", {"rol": rol}
+    return "GET", "/admin/users_info", None
+
+
+async def drive(client, name, concurrency, duration, users, headers) -> dict:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            method, path, body = scenario_request(name, users)
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=headers)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    result = summarize(latencies)
+    errors = sum(n for status, n in statuses.items() if status >= 400)
+    result["throughput"] = (len(latencies) - errors) / elapsed
+    result["errors"] = errors
+    result["error_rate"] = errors / len(latencies) if latencies else 0.0
+    result["statuses"] = {str(status): n for status, n in sorted(statuses.items())}
+    return result
+
+
+async def seed_admin(db) -> str:
+    from src.app.repositories.admin_repository import AdminRepository
+    from src.app.security.security import hash_password
+
+    admin = await AdminRepository(db).create(
+        ADMIN_EMAIL, hash_password(ADMIN_PASSWORD), "bench"
+    )
+    return admin.id
+
+
+async def run(args) -> dict[str, dict]:
+    from src.app.main import app
+    from src.app.db.db_client import get_db
+    from src.app.externals.http_client import close_http_pool
+    from src.app.repositories.log_writer import close_log_writer
+    from src.app.security.hashing import shutdown_hashing_pool
+    from src.app.security.security import create_access_token
+
+    db = open_database(args.backend, args.mongo_uri)
+    app.dependency_overrides[get_db] = lambda: db
+    admin_id = await seed_admin(db)
+    token = create_access_token(id=admin_id, email=ADMIN_EMAIL)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = {}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in args.scenarios:
+            for concurrency in args.concurrency:
+                result = await drive(
+                    client, name, concurrency, args.duration, args.users, headers
+                )
+                results[f"{name}@{concurrency}"] = result
+                print(
+                    f"{name:<12} c={concurrency:<4} {result['throughput']:8.1f} req/s"
+                    f"  p50 {result['p50_ms']:7.1f}  p95 {result['p95_ms']:7.1f}"
+                    f"  p99 {result['p99_ms']:7.1f} ms  errors {result['error_rate']:.1%}"
+                    f"  statuses {result['statuses']}"
+                )
+    await close_log_writer()
+    await close_http_pool()
+    shutdown_hashing_pool()
+    app.dependency_overrides.clear()
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_baseline(name: str, args, results: dict) -> Path:
+    BASELINES.mkdir(exist_ok=True)
+    path = BASELINES / f"{name}.json"
+    meta = {
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "latency": args.latency,
+        "users": args.users,
+        "duration": args.duration,
+    }
+    path.write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n")
+    return path
+
+
+def error_rate(result: dict) -> float:
+    # Older baselines only stored the error count.
+    if "error_rate" in result:
+        return result["error_rate"]
+    return result["errors"] / result["count"] if result["count"] else 0.0
+
+
+def compare(name: str, results: dict, tolerance: float, error_tolerance: float) -> bool:
+    baseline = json.loads((BASELINES / f"{name}.json").read_text())
+    print(f"\ncompared with baseline '{name}' ({baseline['meta'].get('commit')})")
+    ok = True
+    for key, current in results.items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        throughput = (
+            current["throughput"] / previous["throughput"] - 1
+            if previous["throughput"]
+            else 0
+        )
+        p95 = current["p95_ms"] / previous["p95_ms"] - 1 if previous["p95_ms"] else 0
+        errors = error_rate(current) - error_rate(previous)
+        regressed = (
+            throughput < -tolerance or p95 > tolerance or errors > error_tolerance
+        )
+        ok = ok and not regressed
+        print(
+            f"{key:<18} throughput {throughput:+7.1%}  p95 {p95:+7.1%}"
+            f"  errors {errors * 100:+5.1f} pts{'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument(
+        "--backend", choices=("memory", "mongomock", "mongo"), default=default_backend()
+    )
+    parser.add_argument("--mongo-uri")
+    parser.add_argument("--save", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--error-tolerance", type=float, default=0.01)
+    args = parser.parse_args()
+
+    with StubServer(build_stub_app(latency=args.latency, users=args.users)) as stub:
+        os.environ["URL_AUTH"] = stub.url
+        os.environ["URL_USERS"] = stub.url
+        results = asyncio.run(run(args))
+
+    if args.save:
+        print(f"baseline saved to {save_baseline(args.save, args, results)}")
+    if args.compare and not compare(
+        args.compare, results, args.tolerance, args.error_tolerance
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Concurrent /admin/block throughput against a local stub auth server.
+#
+#   python -m benchmarks.bench_block_throughput --concurrency 50 --latency 0.05
+#
+# With a non-blocking client the throughput approaches concurrency / latency;
+# a client that blocks the event loop caps it at 1 / latency.
+import argparse
+import asyncio
+import os
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.stub_services import StubServer, build_stub_app
+
+
+class InMemoryLogRepository:
+    def __init__(self) -> None:
+        self.logs = []
+
+    async def create_log(self, user_id: str, action: str):
+        self.logs.append({"user_id": user_id, "action": action})
+        return self.logs[-1]
+
+
+async def run(concurrency: int, total: int) -> float:
+    from src.app.main import app
+    from src.app.routes.admin_router import get_iam_service
+    from src.app.security.security import create_access_token
+    from src.app.services.iam_service import IAMService
+    from src.app.externals.http_client import close_http_pool
+
+    repository = InMemoryLogRepository()
+    app.dependency_overrides[get_iam_service] = lambda: IAMService(repository)
+    token = create_access_token(id="bench", email="bench@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker(client: AsyncClient):
+        while not queue.empty():
+            i = queue.get_nowait()
+            response = await client.patch(
+                f"/admin/block/{i}", json={"to_block": True}, headers=headers
+            )
+            response.raise_for_status()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    await close_http_pool()
+    app.dependency_overrides.clear()
+    assert len(repository.logs) == total
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with StubServer(build_stub_app(latency=args.latency, users=args.requests)) as stub:
+        os.environ["URL_AUTH"] = stub.url
+        elapsed = asyncio.run(run(args.concurrency, args.requests))
+
+    print(f"requests:        {args.requests}")
+    print(f"concurrency:     {args.concurrency}")
+    print(f"stub latency:    {args.latency * 1000:.0f} ms")
+    print(f"elapsed:         {elapsed:.2f} s")
+    print(f"throughput:      {args.requests / elapsed:.1f} req/s")
+    if args.latency:
+        print(f"blocking bound:  {1 / args.latency:.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
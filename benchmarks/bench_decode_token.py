@@ -0,0 +1,30 @@
+# Cost of authenticating a request with and without the verified-token cache.
+#
+#   python -m benchmarks.bench_decode_token --iterations 20000
+import argparse
+import timeit
+
+from src.app.security.security import (
+    create_access_token,
+    decode_token,
+    decode_token_cached,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    token = create_access_token(id="bench", email="bench@example.com")
+    decode_token_cached(token)
+
+    for label, fn in (("uncached", decode_token), ("cached", decode_token_cached)):
+        seconds = min(
+            timeit.repeat(lambda: fn(token), number=args.iterations, repeat=3)
+        )
+        print(f"{label:<9} {seconds / args.iterations * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# p99 latency of the liveness probe `/` with and without a /admin/login storm.
+#
+#   python -m benchmarks.bench_login_storm --storm 64 --duration 5
+#
+# With hashing offloaded to the worker pool, `/` stays flat during the storm;
+# excess logins are shed with 503 instead of queueing on the event loop.
+#
+#   python -m benchmarks.bench_login_storm --brute-force
+#
+# sends wrong passwords through the login throttle instead: after the allowed
+# failures every attempt is answered with 429 and no bcrypt work is done.
+import argparse
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.stats import summarize
+
+PASSWORD = "stormpassword"
+
+
+class InMemoryAdminRepository:
+    def __init__(self, admin) -> None:
+        self.admin = admin
+
+    async def get_by_email(self, email):
+        return self.admin if email == self.admin.email else None
+
+    async def get_by_id(self, admin_id):
+        return self.admin if admin_id == self.admin.id else None
+
+
+async def probe(client: AsyncClient, duration: float) -> list[float]:
+    samples = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/")
+        response.raise_for_status()
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return samples
+
+
+async def storm(
+    client: AsyncClient, stop: asyncio.Event, statuses: Counter, password: str
+):
+    body = {"email": "storm@example.com", "password": password}
+    while not stop.is_set():
+        response = await client.post("/admin/login", json=body)
+        statuses[response.status_code] += 1
+        if response.status_code == 503:
+            await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+        elif response.status_code == 429:
+            # A real attacker would keep hammering; yield so the probe runs.
+            await asyncio.sleep(0)
+
+
+async def run(storm_size: int, duration: float, brute_force: bool):
+    from src.app.main import app
+    from src.app.entities.admin_entity import AdminDTA
+    from src.app.metrics.metrics import PASSWORD_HASH_DURATION
+    from src.app.routes.admin_router import get_admin_service
+    from src.app.security.login_throttle import get_login_throttle
+    from src.app.security.security import hash_password
+    from src.app.security.hashing import shutdown_hashing_pool
+    from src.app.services.admin_service import AdminService
+
+    admin = AdminDTA(
+        id="storm",
+        email="storm@example.com",
+        hashed_password=hash_password(PASSWORD),
+        signup_date=datetime.now(timezone.utc),
+        other_id="none",
+    )
+    repository = InMemoryAdminRepository(admin)
+    throttle = get_login_throttle() if brute_force else None
+    password = "wrong" + PASSWORD if brute_force else PASSWORD
+    app.dependency_overrides[get_admin_service] = lambda: AdminService(
+        repository, throttle=throttle
+    )
+    statuses: Counter = Counter()
+    verifies = PASSWORD_HASH_DURATION.count("verify")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle = await probe(client, duration)
+        stop = asyncio.Event()
+        stormers = [
+            asyncio.create_task(storm(client, stop, statuses, password))
+            for _ in range(storm_size)
+        ]
+        loaded = await probe(client, duration)
+        stop.set()
+        await asyncio.gather(*stormers)
+
+    shutdown_hashing_pool()
+    app.dependency_overrides.clear()
+    verifies = PASSWORD_HASH_DURATION.count("verify") - verifies
+    return summarize(idle), summarize(loaded), statuses, verifies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--storm", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--brute-force", action="store_true")
+    args = parser.parse_args()
+
+    idle, loaded, statuses, verifies = asyncio.run(
+        run(args.storm, args.duration, args.brute_force)
+    )
+    for label, stats in (("idle", idle), ("login storm", loaded)):
+        print(
+            f"{label:<12} n={stats['count']:<5} p50={stats['p50_ms']:.1f} ms "
+            f"p95={stats['p95_ms']:.1f} ms p99={stats['p99_ms']:.1f} ms"
+        )
+    print("login statuses:", dict(statuses))
+    print("bcrypt verifications:", verifies)
+
+
+if __name__ == "__main__":
+    main()
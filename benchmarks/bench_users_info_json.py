@@ -0,0 +1,96 @@
+# Cost of building and serializing users_info payloads.
+#
+#   python -m benchmarks.bench_users_info_json --sizes 10000 100000
+#
+# "build" turns upstream rows into GetUserInfoResponse (validated or
+# model_construct for trusted data); "encode" is the response body rendering:
+# the previous path (model_dump + stdlib json, or one model_dump_json per
+# streamed item) against the pydantic-core list adapter and orjson.
+import argparse
+import asyncio
+import json
+import time
+
+from src.app.routes.responses import dumps, list_adapter
+from src.app.routes.streaming import json_array
+from src.app.schemas.admin_schemas import GetUserInfoResponse
+
+
+def make_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": str(i),
+            "name": f"Name{i}",
+            "last_name": f"Last{i}",
+            "email": f"user{i}@example.com",
+            "role": "student",
+            "is_locked": i % 7 == 0,
+        }
+        for i in range(n)
+    ]
+
+
+def timed(fn) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(3):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+async def per_item_stream(models) -> bytes:
+    async def source():
+        for model in models:
+            yield model
+
+    parts = ["["]
+    separator = ""
+    async for model in source():
+        parts.append(separator + model.model_dump_json())
+        separator = ","
+    parts.append("]")
+    return "".join(parts).encode()
+
+
+async def chunked_stream(models) -> bytes:
+    async def source():
+        for model in models:
+            yield model
+
+    return b"".join([chunk async for chunk in json_array(source())])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    adapter = list_adapter(GetUserInfoResponse)
+    for n in args.sizes:
+        rows = make_rows(n)
+        build_validated, models = timed(
+            lambda: [GetUserInfoResponse(**row) for row in rows]
+        )
+        build_trusted, _ = timed(
+            lambda: [GetUserInfoResponse.model_construct(**row) for row in rows]
+        )
+        cases = {
+            "model_dump + json": lambda: json.dumps(
+                [model.model_dump() for model in models]
+            ).encode(),
+            "list adapter": lambda: adapter.dump_json(models),
+            "dicts + orjson": lambda: dumps(rows),
+            "stream per item": lambda: asyncio.run(per_item_stream(models)),
+            "stream chunked": lambda: asyncio.run(chunked_stream(models)),
+        }
+        print(f"\n{n} users")
+        print(f"  build validated   {build_validated * 1000:9.1f} ms")
+        print(f"  build trusted     {build_trusted * 1000:9.1f} ms")
+        for label, fn in cases.items():
+            seconds, body = timed(fn)
+            print(f"  {label:<17} {seconds * 1000:9.1f} ms  {len(body) / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Memory and time of the users_info join.
+#
+#   python -m benchmarks.bench_users_join --users 100000
+#
+# Compares the retained size of the id -> is_locked index (dict vs the
+# columnar LockIndex) and the peak memory of joining all users into a list
+# of models vs emitting them lazily, page by page, as the endpoint does.
+import argparse
+import json
+import time
+import tracemalloc
+
+from bson import ObjectId
+
+from src.app.schemas.admin_schemas import GetUserInfoResponse
+from src.app.services.user_join import LockIndex, join_users
+
+PAGE_SIZE = 500
+
+
+def make_payloads(n: int) -> tuple[bytes, list[bytes]]:
+    # Upstream bodies are kept as JSON bytes so that every measured variant
+    # pays for decoding its own rows, like a real response would.
+    ids = [str(ObjectId()) for _ in range(n)]
+    auth = json.dumps([{"id": id, "is_locked": i % 7 == 0} for i, id in enumerate(ids)])
+    users = [
+        json.dumps(
+            [
+                {
+                    "id": id,
+                    "name": f"Name{i}",
+                    "last_name": f"Last{i}",
+                    "email": f"user{i}@example.com",
+                    "role": "student",
+                }
+                for i, id in enumerate(ids[start : start + PAGE_SIZE], start)
+            ]
+        ).encode()
+        for start in range(0, n, PAGE_SIZE)
+    ]
+    return auth.encode(), users
+
+
+def dict_index(auth: bytes) -> dict[str, bool]:
+    return {entry["id"]: entry["is_locked"] for entry in json.loads(auth)}
+
+
+def columnar_index(auth: bytes) -> LockIndex:
+    index = LockIndex()
+    index.add_page(json.loads(auth))
+    return index.freeze()
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.users
+    auth, pages = make_payloads(n)
+    build = GetUserInfoResponse.model_construct
+
+    print(f"{n} users, bytes per user (retained / peak) and time")
+    for label, fn in (("dict index", dict_index), ("columnar index", columnar_index)):
+        index, elapsed, current, peak = measure(lambda: fn(auth))
+        print(
+            f"  {label:<22} {current / n:7.1f} / {peak / n:7.1f}   {elapsed * 1000:7.1f} ms"
+        )
+
+    ids = [entry["id"] for entry in json.loads(auth)]
+    for label, index in (
+        ("dict lookups", dict_index(auth)),
+        ("columnar lookups", columnar_index(auth)),
+    ):
+        start = time.perf_counter()
+        for id in ids:
+            index.get(id)
+        print(
+            f"  {label:<22} {'':>17}   {(time.perf_counter() - start) * 1000:7.1f} ms"
+        )
+
+    index = columnar_index(auth)
+
+    def materialized():
+        return [
+            build(**user, is_locked=is_locked)
+            for page in pages
+            for user, is_locked in join_users(json.loads(page), index)
+        ]
+
+    def streamed():
+        count = 0
+        for page in pages:
+            for user, is_locked in join_users(json.loads(page), index):
+                build(**user, is_locked=is_locked)
+                count += 1
+        return count
+
+    for label, fn in (("join into list", materialized), ("join lazily", streamed)):
+        result, elapsed, current, peak = measure(fn)
+        print(
+            f"  {label:<22} {current / n:7.1f} / {peak / n:7.1f}   {elapsed * 1000:7.1f} ms"
+        )
+        del result
+
+
+if __name__ == "__main__":
+    main()
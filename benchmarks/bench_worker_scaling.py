@@ -0,0 +1,143 @@
+# Throughput of /admin/users_info as the number of worker processes grows.
+#
+#   python -m benchmarks.bench_worker_scaling --workers 1 2 4 --duration 5
+#
+# For each worker count the app (benchmarks/scaling_app.py) is started through
+# src.app.server, exactly as in production, against a stub upstream. Each
+# worker fetches the listing once into its own users_info cache, so requests
+# are dominated by serializing --users rows, which is CPU-bound: throughput
+# should grow with workers up to the number of cores. Load comes from
+# --clients separate processes so the load generator does not become the
+# bottleneck.
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.stats import summarize
+from benchmarks.stub_services import StubServer, _free_port, build_stub_app
+
+
+def token() -> str:
+    from src.app.security.security import create_access_token
+
+    return create_access_token(id="bench", email="bench@example.com")
+
+
+def start_server(workers: int, port: int, stub_url: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        URL_AUTH=stub_url,
+        URL_USERS=stub_url,
+        PORT=str(port),
+        LOG_LEVEL="warning",
+        USERS_INFO_CACHE_TTL="3600",
+        LOG_WRITER_ENABLED="false",
+    )
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.app.server",
+            "--app",
+            "benchmarks.scaling_app:app",
+            "--workers",
+            str(workers),
+        ],
+        env=env,
+    )
+
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+async def client_loop(url: str, headers: dict, concurrency: int, duration: float):
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(client):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return latencies, errors
+
+
+def client_process(args) -> tuple[list[float], int]:
+    return asyncio.run(client_loop(*args))
+
+
+def measure(base_url: str, clients: int, concurrency: int, duration: float) -> dict:
+    headers = {"Authorization": f"Bearer {token()}"}
+    job = (f"{base_url}/admin/users_info", headers, concurrency, duration)
+    with multiprocessing.get_context("spawn").Pool(clients) as pool:
+        start = time.perf_counter()
+        outcomes = pool.map(client_process, [job] * clients)
+        elapsed = time.perf_counter() - start
+    latencies = [latency for samples, _ in outcomes for latency in samples]
+    result = summarize(latencies)
+    result["throughput"] = len(latencies) / elapsed
+    result["errors"] = sum(errors for _, errors in outcomes)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    cores = os.cpu_count() or 1
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, cores}))
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{cores} CPU cores, {args.users} users per response")
+    baseline = None
+    with StubServer(build_stub_app(users=args.users)) as stub:
+        for workers in args.workers:
+            port = _free_port()
+            process = start_server(workers, port, stub.url)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                wait_ready(f"{base_url}/")
+                # Fills every worker's cache before measuring.
+                measure(base_url, args.clients, args.concurrency, args.warmup)
+                result = measure(
+                    base_url, args.clients, args.concurrency, args.duration
+                )
+            finally:
+                process.terminate()
+                process.wait()
+            baseline = baseline or result["throughput"]
+            print(
+                f"workers={workers:<3} {result['throughput']:8.1f} req/s"
+                f"  x{result['throughput'] / baseline:4.2f}"
+                f"  p50 {result['p50_ms']:7.1f}  p99 {result['p99_ms']:7.1f} ms"
+                f"  errors {result['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
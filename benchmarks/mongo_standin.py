@@ -0,0 +1,92 @@
+# Database stand-ins for the benchmarks: mongomock-motor when installed, a
+# real mongod when a URI is given, or a tiny in-memory collection that covers
+# only the operations the benchmarked endpoints perform.
+from types import SimpleNamespace
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+UNIQUE_FIELDS = {"admin": ("email",)}
+
+
+class InMemoryCollection:
+    def __init__(
+        self, database: "InMemoryDatabase", name: str, unique: tuple[str, ...] = ()
+    ) -> None:
+        self.database = database
+        self.name = name
+        self.full_name = f"bench.{name}"
+        self.docs: list[dict] = []
+        self.unique = unique
+        self._seen = {field: set() for field in unique}
+
+    def _check_unique(self, doc: dict) -> None:
+        for field in self.unique:
+            if doc.get(field) in self._seen[field]:
+                raise DuplicateKeyError(f"duplicate {field}")
+        for field in self.unique:
+            self._seen[field].add(doc.get(field))
+
+    async def insert_one(self, doc: dict):
+        doc.setdefault("_id", ObjectId())
+        self._check_unique(doc)
+        self.docs.append(doc)
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def insert_many(self, docs: list[dict], ordered: bool = True):
+        for doc in docs:
+            await self.insert_one(doc)
+        return SimpleNamespace(inserted_ids=[doc["_id"] for doc in docs])
+
+    async def find_one(self, query: dict, projection=None, sort=None):
+        for doc in reversed(self.docs) if sort else self.docs:
+            if all(doc.get(key) == value for key, value in query.items()):
+                return doc
+        return None
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        doc = await self.find_one(query)
+        if doc is None:
+            if not upsert:
+                return SimpleNamespace(matched_count=0)
+            doc = dict(query)
+            self.docs.append(doc)
+        for key, value in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + value
+        doc.update(update.get("$set", {}))
+        return SimpleNamespace(matched_count=1)
+
+    async def create_indexes(self, indexes):
+        return []
+
+
+class InMemoryDatabase:
+    def __init__(self) -> None:
+        self._collections: dict[str, InMemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = InMemoryCollection(
+                self, name, UNIQUE_FIELDS.get(name, ())
+            )
+        return self._collections[name]
+
+
+def open_database(backend: str, uri: str | None = None, name: str = "bench"):
+    if backend == "mongomock":
+        from mongomock_motor import AsyncMongoMockClient
+
+        return AsyncMongoMockClient()[name]
+    if backend == "mongo":
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        return AsyncIOMotorClient(uri or "mongodb://localhost:27017")[name]
+    return InMemoryDatabase()
+
+
+def default_backend() -> str:
+    try:
+        import mongomock_motor  # noqa: F401
+    except ImportError:
+        return "memory"
+    return "mongomock"
@@ -0,0 +1,21 @@
+# The admin app as run by bench_worker_scaling: MongoDB is replaced by the
+# in-memory stand-in and the lifespan only opens the HTTP pool, so each worker
+# process serves users_info from the stub upstreams without a database.
+from contextlib import asynccontextmanager
+
+from benchmarks.mongo_standin import open_database
+from src.app.db.db_client import get_db
+from src.app.externals.http_client import close_http_pool, get_http_pool
+from src.app.main import app
+
+
+@asynccontextmanager
+async def lifespan(_):
+    get_http_pool()
+    yield
+    await close_http_pool()
+
+
+db = open_database("memory")
+app.dependency_overrides[get_db] = lambda: db
+app.router.lifespan_context = lifespan
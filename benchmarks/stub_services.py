@@ -0,0 +1,131 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import uvicorn
+from datetime import datetime, timezone
+from fastapi import FastAPI, Request, Response
+
+
+def build_stub_app(latency: float = 0.0, users: int = 100) -> FastAPI:
+    # Minimal stand-in for the auth and users services used by auth_external.
+    # Listings honour offset/limit and updated_since, and carry an ETag that
+    # changes whenever a PATCH modifies a user.
+    app = FastAPI()
+    app.state.latency = latency
+    app.state.version = 0
+    now = datetime.now(timezone.utc)
+    auth = [
+        {"id": str(i), "is_locked": i % 7 == 0, "updated_at": now} for i in range(users)
+    ]
+    people = [
+        {
+            "id": str(i),
+            "name": f"Name{i}",
+            "last_name": f"Last{i}",
+            "email": f"user{i}@example.com",
+            "role": "student" if i % 3 else "teacher",
+            "updated_at": now,
+        }
+        for i in range(users)
+    ]
+    app.state.auth = auth
+    app.state.people = people
+    by_id = {
+        id(auth): {row["id"]: row for row in auth},
+        id(people): {row["id"]: row for row in people},
+    }
+
+    async def delay():
+        if app.state.latency:
+            await asyncio.sleep(app.state.latency)
+
+    def update(rows, user_id, **changes):
+        row = by_id[id(rows)].get(user_id)
+        if row is None:
+            return False
+        row.update(changes, updated_at=datetime.now(timezone.utc))
+        app.state.version += 1
+        return True
+
+    @app.patch("/auth/block/{user_id}")
+    async def block(user_id: str, request: Request):
+        await delay()
+        body = await request.json()
+        if not update(auth, user_id, is_locked=body["block"]):
+            return Response(status_code=404)
+        return {"id": user_id}
+
+    @app.patch("/auth/rol/{user_id}")
+    async def role(user_id: str, request: Request):
+        await delay()
+        body = await request.json()
+        if not update(people, user_id, role=body["role"]):
+            return Response(status_code=404)
+        return {"id": user_id}
+
+    def listing(request, rows, offset, limit, updated_since):
+        etag = f'W/"{app.state.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        if updated_since is not None:
+            rows = [row for row in rows if row["updated_at"] >= updated_since]
+        rows = rows[offset:] if limit is None else rows[offset : offset + limit]
+        body = [
+            {key: value for key, value in row.items() if key != "updated_at"}
+            for row in rows
+        ]
+        return Response(
+            json.dumps(body), media_type="application/json", headers={"ETag": etag}
+        )
+
+    @app.get("/auth")
+    async def auth_list(
+        request: Request,
+        offset: int = 0,
+        limit: int | None = None,
+        updated_since: datetime | None = None,
+    ):
+        await delay()
+        return listing(request, auth, offset, limit, updated_since)
+
+    @app.get("/users")
+    async def users_list(
+        request: Request,
+        offset: int = 0,
+        limit: int | None = None,
+        updated_since: datetime | None = None,
+    ):
+        await delay()
+        return listing(request, people, offset, limit, updated_since)
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    def __init__(self, app: FastAPI) -> None:
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        config = uvicorn.Config(
+            app, host="127.0.0.1", port=self.port, log_level="warning"
+        )
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join()
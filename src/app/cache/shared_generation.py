@@ -0,0 +1,34 @@
+import fcntl
+import mmap
+import os
+import struct
+
+_COUNTER = struct.Struct("<Q")
+
+
+class SharedGeneration:
+    # A 64-bit counter in a memory-mapped file, shared by every worker process
+    # on the host. Reads are a plain memory load; increments take an exclusive
+    # flock so concurrent bumps from different workers are not lost.
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < _COUNTER.size:
+            os.ftruncate(self._fd, _COUNTER.size)
+        self._map = mmap.mmap(self._fd, _COUNTER.size)
+
+    def value(self) -> int:
+        return _COUNTER.unpack_from(self._map)[0]
+
+    def bump(self) -> int:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            value = self.value() + 1
+            _COUNTER.pack_into(self._map, 0, value)
+            return value
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
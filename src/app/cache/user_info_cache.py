@@ -0,0 +1,244 @@
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from src.app.config.config import get_settings
+from src.app.schemas.admin_schemas import GetUserInfoResponse
+from src.app.cache.shared_generation import SharedGeneration
+
+_settings = get_settings()
+
+# Distinguishes validators issued by different processes, whose counters overlap.
+INSTANCE = os.urandom(4).hex()
+
+
+@dataclass
+class CachedView:
+    items: list[GetUserInfoResponse]
+    next_cursor: int | None
+    stored_at: float
+    positions: dict[str, int] = field(default_factory=dict)
+    version: int = 0
+
+
+class UserInfoCache:
+    # Merged users_info views keyed by (cursor, limit). The total number of
+    # cached users is bounded, with every view counting as at least one so
+    # empty pages past the end cannot pile up; least recently used views are
+    # evicted first and expired ones are purged whenever a view is stored.
+    # Views older than `ttl` are kept as last-known-good snapshots for another
+    # `stale_ttl` seconds, served while a single background refresh runs.
+    # With a `shared` generation, a user write in any worker process drops the
+    # views cached by every other worker on the host.
+    def __init__(
+        self,
+        ttl: float,
+        max_items: int,
+        stale_ttl: float = 0.0,
+        clock=time.monotonic,
+        shared: SharedGeneration | None = None,
+    ) -> None:
+        self.ttl = ttl
+        self.max_items = max_items
+        self.stale_ttl = stale_ttl
+        self.shared = shared
+        self._shared_seen = shared.value() if shared is not None else 0
+        self._clock = clock
+        self._views: OrderedDict[tuple, CachedView] = OrderedDict()
+        self._size = 0
+        self._refreshing: dict[tuple, asyncio.Task] = {}
+        self._versions = itertools.count(1)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> CachedView | None:
+        view = self._lookup(key)
+        if view is None or self.age(view) >= self.ttl:
+            self.misses += 1
+            return None
+        self._views.move_to_end(key)
+        self.hits += 1
+        return view
+
+    def peek(self, key: tuple) -> CachedView | None:
+        # Fresh view lookup that does not count as a hit or miss.
+        view = self._lookup(key)
+        if view is None or self.age(view) >= self.ttl:
+            return None
+        return view
+
+    def etag(self, view: CachedView) -> str:
+        # Changes when the view is re-fetched or any user write bumps the
+        # generation, which is cheaper than hashing the items.
+        return f'W/"{INSTANCE}-{view.version}-{self.generation}"'
+
+    def get_stale(self, key: tuple) -> CachedView | None:
+        view = self._lookup(key)
+        if view is not None:
+            self._views.move_to_end(key)
+            self.stale_hits += 1
+        return view
+
+    def age(self, view: CachedView) -> float:
+        return self._clock() - view.stored_at
+
+    def refresh(self, key: tuple, fetch) -> None:
+        # Single-flight: at most one refresh per key runs at a time. `fetch`
+        # returns (items, next_cursor).
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: tuple, fetch) -> None:
+        generation = self.generation
+        try:
+            items, next_cursor = await fetch()
+        except Exception as e:
+            logging.warning(f"users_info background refresh failed: {e!r}")
+            return
+        self.put(key, items, next_cursor, generation)
+
+    def _lookup(self, key: tuple) -> CachedView | None:
+        self._sync_shared()
+        view = self._views.get(key)
+        if view is not None and self.age(view) >= self.ttl + self.stale_ttl:
+            self._drop(key)
+            view = None
+        return view
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_items > 0
+
+    def put(
+        self,
+        key: tuple,
+        items: list[GetUserInfoResponse],
+        next_cursor: int | None,
+        generation: int,
+    ) -> None:
+        # A write that happened while the view was being fetched makes it stale.
+        self._sync_shared()
+        if not self.enabled or generation != self.generation:
+            return
+        if len(items) > self.max_items:
+            return
+        if key in self._views:
+            self._drop(key)
+        self._purge_expired()
+        view = CachedView(
+            items, next_cursor, self._clock(), version=next(self._versions)
+        )
+        view.positions = {item.id: index for index, item in enumerate(items)}
+        self._views[key] = view
+        self._size += _weight(view)
+        while self._size > self.max_items:
+            oldest = next(iter(self._views))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def patch(self, user_id: str, **changes) -> None:
+        self.generation += 1
+        for view in self._views.values():
+            index = view.positions.get(user_id)
+            if index is not None:
+                view.items[index] = view.items[index].model_copy(update=changes)
+        self._publish()
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        self.generation += 1
+        stale = [
+            key
+            for key, view in self._views.items()
+            if user_id is None or user_id in view.positions
+        ]
+        for key in stale:
+            self._drop(key)
+        self._publish()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "views": len(self._views),
+            "items": self._size,
+        }
+
+    def _drop(self, key: tuple) -> None:
+        view = self._views.pop(key)
+        self._size -= _weight(view)
+
+    def _purge_expired(self) -> None:
+        expired = [
+            key
+            for key, view in self._views.items()
+            if self.age(view) >= self.ttl + self.stale_ttl
+        ]
+        for key in expired:
+            self._drop(key)
+
+    def _clear(self) -> None:
+        self.generation += 1
+        self._views.clear()
+        self._size = 0
+
+    def _sync_shared(self) -> None:
+        if self.shared is None:
+            return
+        value = self.shared.value()
+        if value != self._shared_seen:
+            self._shared_seen = value
+            self._clear()
+
+    def _publish(self) -> None:
+        # Our own bump must not drop the views just patched, unless another
+        # worker bumped in between.
+        if self.shared is None:
+            return
+        value = self.shared.bump()
+        if value != self._shared_seen + 1:
+            self._clear()
+        self._shared_seen = value
+
+
+def _weight(view: CachedView) -> int:
+    return max(1, len(view.items))
+
+
+_cache: UserInfoCache | None = None
+
+
+def get_user_info_cache() -> UserInfoCache:
+    global _cache
+    if _cache is None:
+        _cache = UserInfoCache(
+            ttl=_settings.users_info_cache_ttl,
+            max_items=_settings.users_info_cache_max_items,
+            stale_ttl=_settings.users_info_stale_ttl,
+            shared=(
+                SharedGeneration(_settings.users_info_cache_shared_path)
+                if _settings.users_info_cache_shared_path
+                else None
+            ),
+        )
+    return _cache
+
+
+def _reset_after_fork() -> None:
+    # A forked worker starts with its own cache and validator namespace.
+    global _cache, INSTANCE
+    _cache = None
+    INSTANCE = os.urandom(4).hex()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
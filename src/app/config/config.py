@@ -1,17 +1,82 @@
 from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import model_validator
+from typing import Literal
 import os
 
 
 class Settings(BaseSettings):
     mongo_uri: str = "mongodb://localhost:27017"
     mongo_db: str = "backoffice_db"
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_max_idle_time_ms: int | None = None
+    mongo_compressors: str = ""
+    mongo_server_selection_timeout_ms: int = 30_000
+    mongo_read_preference: str = "primary"
     log_level: str = "INFO"
     host: str = "127.0.0.1"
     port: int = 8000
+    workers: int = 1
+    worker_backend: Literal["uvicorn", "gunicorn"] = "uvicorn"
+    worker_timeout: int = 30
     url_auth: str = "http://localhost:8000"
     url_users: str = "http://localhost:8001"
+    http_timeout: float = 5.0
+    http_max_connections_per_host: int = 100
+    http_max_keepalive_per_host: int = 20
+    http_keepalive_expiry: float = 30.0
+    upstream_page_size: int = 500
+    upstream_get_retries: int = 2
+    upstream_retry_base_delay: float = 0.05
+    upstream_retry_max_delay: float = 1.0
+    retry_budget_ratio: float = 0.2
+    retry_budget_min_per_second: float = 5.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 10.0
+    auth_fetch_timeout: float = 10.0
+    users_fetch_timeout: float = 10.0
+    users_info_cache_ttl: float = 30.0
+    users_info_cache_max_items: int = 100_000
+    users_info_stale_ttl: float = 300.0
+    users_info_cache_shared_path: str = ""
+    users_info_trust_upstream: bool = False
+    users_info_join_mode: Literal["inner", "left"] = "inner"
+    user_directory_enabled: bool = False
+    user_directory_sync_interval: float = 30.0
+    user_directory_full_sync_every: int = 20
+    user_directory_sync_overlap: float = 5.0
+    user_directory_lease_ttl: float = 90.0
+    bulk_concurrency: int = 16
+    log_writer_enabled: bool = True
+    log_batch_size: int = 100
+    log_flush_interval: float = 0.2
+    log_queue_size: int = 10_000
+    log_flush_retries: int = 2
+    log_flush_retry_delay: float = 0.05
+    log_shutdown_timeout: float = 10.0
+    token_cache_size: int = 10_000
+    token_cache_ttl: float = 300.0
+    metrics_loop_lag_interval: float = 0.5
+    blocking_detector_enabled: bool = False
+    blocking_detector_threshold: float = 0.1
+    login_throttle_enabled: bool = True
+    login_throttle_backend: Literal["memory", "mongo"] = "memory"
+    login_throttle_window: float = 900.0
+    login_max_failures_per_email: int = 5
+    login_max_failures_per_ip: int = 50
+    login_throttle_max_keys: int = 100_000
+    login_trust_forwarded_for: bool = False
+    hash_scheme: Literal["bcrypt", "argon2"] = "bcrypt"
+    hash_calibrate: bool = True
+    hash_latency_budget: float = 0.25
+    hash_bcrypt_rounds: int = 12
+    hash_argon2_time_cost: int = 3
+    hash_argon2_memory_cost: int = 65536
+    hash_argon2_parallelism: int = 1
+    hash_pool_kind: str = "thread"
+    hash_pool_workers: int = 4
+    hash_pool_max_queue: int = 32
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
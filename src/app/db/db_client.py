@@ -1,16 +1,54 @@
+import asyncio
+import os
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from src.app.config.config import get_settings
+from src.app.db.pool_monitor import PoolStatsListener
+from src.app.metrics.metrics import MongoCommandMetrics
 
 _settings = get_settings()
 _client: AsyncIOMotorClient | None = None
+pool_stats = PoolStatsListener()
+
+
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": _settings.mongo_max_pool_size,
+        "minPoolSize": _settings.mongo_min_pool_size,
+        "serverSelectionTimeoutMS": _settings.mongo_server_selection_timeout_ms,
+        "readPreference": _settings.mongo_read_preference,
+        "event_listeners": [pool_stats, MongoCommandMetrics()],
+    }
+    if _settings.mongo_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = _settings.mongo_max_idle_time_ms
+    if _settings.mongo_compressors:
+        options["compressors"] = _settings.mongo_compressors
+    return options
 
 
 def get_client() -> AsyncIOMotorClient:
     global _client
     if _client is None:
-        _client = AsyncIOMotorClient(_settings.mongo_uri)
+        _client = AsyncIOMotorClient(_settings.mongo_uri, **client_options())
     return _client
 
 
 def get_db() -> AsyncIOMotorDatabase:
     return get_client()[_settings.mongo_db]
+
+
+async def warm_pool(client: AsyncIOMotorClient, connections: int) -> None:
+    # Concurrent pings each check out their own connection, so the pool is
+    # filled to `connections` before the first request arrives.
+    await asyncio.gather(
+        *(client.admin.command("ping") for _ in range(max(connections, 1)))
+    )
+
+
+def _reset_after_fork() -> None:
+    # MongoClient is not fork-safe: a forked worker opens its own connections.
+    global _client
+    _client = None
+    pool_stats.reset()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
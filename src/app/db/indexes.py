@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+from src.app.exceptions.exceptions import MissingUniqueIndexError
+from src.app.repositories import (
+    admin_repository,
+    login_attempts_repository,
+    logs_repository,
+    user_directory_repository,
+)
+
+# Collection name -> indexes declared by the repository that owns it.
+INDEX_REGISTRY: dict[str, list[IndexModel]] = {
+    admin_repository.REPOSITORY: admin_repository.AdminRepository.INDEXES,
+    logs_repository.REPOSITORY: logs_repository.LogRepository.INDEXES,
+    user_directory_repository.REPOSITORY: (
+        user_directory_repository.UserDirectoryRepository.INDEXES
+    ),
+    login_attempts_repository.REPOSITORY: (
+        login_attempts_repository.LoginAttemptsRepository.INDEXES
+    ),
+}
+
+
+async def ensure_indexes(
+    db: AsyncIOMotorDatabase, registry: dict[str, list[IndexModel]] = INDEX_REGISTRY
+) -> None:
+    # create_indexes is a no-op for indexes that already exist with the same spec.
+    async def create(collection: str, indexes: list[IndexModel]) -> None:
+        try:
+            await db[collection].create_indexes(indexes)
+        except PyMongoError as e:
+            logging.error(f"Could not create indexes on '{collection}': {e}")
+
+    await asyncio.gather(
+        *(create(collection, indexes) for collection, indexes in registry.items())
+    )
+
+
+async def diff_indexes(
+    db: AsyncIOMotorDatabase, registry: dict[str, list[IndexModel]] = INDEX_REGISTRY
+) -> dict[str, dict[str, list[str]]]:
+    infos = await asyncio.gather(
+        *(db[collection].index_information() for collection in registry)
+    )
+    report = {}
+    for (collection, indexes), info in zip(registry.items(), infos):
+        expected = {index.document["name"] for index in indexes}
+        existing = set(info) - {"_id_"}
+        report[collection] = {
+            "missing": sorted(expected - existing),
+            "extra": sorted(existing - expected),
+        }
+    return report
+
+
+async def prepare_indexes(
+    db: AsyncIOMotorDatabase, registry: dict[str, list[IndexModel]] = INDEX_REGISTRY
+) -> None:
+    # Unique indexes are the only duplicate check on writes (admin.email), so
+    # the service refuses to start without them; other missing indexes only
+    # cost performance and are logged.
+    await ensure_indexes(db, registry)
+    report = await diff_indexes(db, registry)
+    log_index_report(report)
+    missing = missing_unique_indexes(report, registry)
+    if missing:
+        raise MissingUniqueIndexError(missing)
+
+
+def missing_unique_indexes(
+    report: dict[str, dict[str, list[str]]], registry: dict[str, list[IndexModel]]
+) -> dict[str, list[str]]:
+    missing = {}
+    for collection, indexes in registry.items():
+        names = [
+            index.document["name"]
+            for index in indexes
+            if index.document.get("unique")
+            and index.document["name"] in report[collection]["missing"]
+        ]
+        if names:
+            missing[collection] = names
+    return missing
+
+
+def log_index_report(report: dict[str, dict[str, list[str]]]) -> None:
+    for collection, diff in report.items():
+        if diff["missing"]:
+            logging.error(f"Missing indexes on '{collection}': {diff['missing']}")
+        if diff["extra"]:
+            logging.warning(f"Unregistered indexes on '{collection}': {diff['extra']}")
@@ -0,0 +1,56 @@
+from collections import defaultdict
+from pymongo import monitoring
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    # Tracks connection pool activity per server from pymongo's CMAP events.
+    def __init__(self) -> None:
+        self._servers: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def reset(self) -> None:
+        self._servers.clear()
+
+    def _count(self, event, counter: str, delta: int = 1) -> None:
+        address = "%s:%s" % event.address
+        self._servers[address][counter] += delta
+
+    def pool_created(self, event):
+        self._count(event, "pools_created")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count(event, "pools_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count(event, "connections_created")
+        self._count(event, "open")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count(event, "connections_closed")
+        self._count(event, "open", -1)
+
+    def connection_check_out_started(self, event):
+        self._count(event, "waiting")
+
+    def connection_check_out_failed(self, event):
+        self._count(event, "waiting", -1)
+        self._count(event, "check_out_failures")
+
+    def connection_checked_out(self, event):
+        self._count(event, "waiting", -1)
+        self._count(event, "in_use")
+        self._count(event, "checked_out")
+
+    def connection_checked_in(self, event):
+        self._count(event, "in_use", -1)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {address: dict(counters) for address, counters in self._servers.items()}
@@ -30,3 +30,41 @@ class UserNotFoundError(Exception):
 class BadRequestError(Exception):
     def __init__(self):
         super().__init__(f"Bad request")
+
+
+class HashingPoolFullError(Exception):
+    def __init__(self):
+        super().__init__(f"Password hashing pool is saturated")
+
+
+class UpstreamTimeoutError(Exception):
+    def __init__(self, upstream: str):
+        self.upstream = upstream
+        super().__init__(f"Upstream '{upstream}' did not answer in time")
+
+
+class UpstreamUnavailableError(Exception):
+    def __init__(self, upstream: str, retry_after: float):
+        self.upstream = upstream
+        self.retry_after = retry_after
+        super().__init__(f"Upstream '{upstream}' is unavailable (circuit open)")
+
+
+class UpstreamError(Exception):
+    def __init__(self, upstream: str, status_code: int):
+        self.upstream = upstream
+        self.status_code = status_code
+        super().__init__(f"Upstream '{upstream}' answered {status_code}")
+
+
+class LoginThrottledError(Exception):
+    def __init__(self, scope: str, retry_after: float):
+        self.scope = scope
+        self.retry_after = retry_after
+        super().__init__(f"Too many failed logins for this {scope}")
+
+
+class MissingUniqueIndexError(Exception):
+    def __init__(self, missing: dict[str, list[str]]):
+        self.missing = missing
+        super().__init__(f"Unique indexes are missing: {missing}")
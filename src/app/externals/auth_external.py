@@ -1,21 +1,32 @@
 import os
-import requests
+import asyncio
+import httpx
 import logging
-from src.app.exceptions.exceptions import UserNotFoundError, BadRequestError
+from dataclasses import dataclass
+from datetime import datetime
+from src.app.exceptions.exceptions import (
+    UserNotFoundError,
+    BadRequestError,
+    UpstreamError,
+)
+from src.app.externals.http_client import HTTPClientPool
+from src.app.externals.circuit_breaker import guarded_request
+from src.app.externals.single_flight import SingleFlight
+from src.app.metrics.metrics import observe_upstream
 
 
-async def block_user_auth(id: str, to_block: bool):
+async def block_user_auth(id: str, to_block: bool, http: HTTPClientPool):
     prefix = await get_auth_url()
     AUTH_SERVICE_URL = f"{prefix}/auth/block/{id}"
     payload = {"block": to_block}
-    return await send_patch_request(id, AUTH_SERVICE_URL, payload)
+    return await send_patch_request(id, AUTH_SERVICE_URL, payload, http)
 
 
-async def change_rol_auth(id: str, new_rol: str):
+async def change_rol_auth(id: str, new_rol: str, http: HTTPClientPool):
     prefix = await get_auth_url()
     AUTH_SERVICE_URL = f"{prefix}/auth/rol/{id}"
     payload = {"role": new_rol}
-    return await send_patch_request(id, AUTH_SERVICE_URL, payload)
+    return await send_patch_request(id, AUTH_SERVICE_URL, payload, http)
 
 
 async def get_auth_url():
@@ -25,29 +36,66 @@ async def get_auth_url():
     return prefix
 
 
-async def send_patch_request(id, AUTH_SERVICE_URL, payload):
+async def get_users_url():
+    prefix = os.getenv("URL_USERS")
+    if prefix is None:
+        raise RuntimeError("Environment variable 'URL_USERS' is not set")
+    return prefix
+
+
+@observe_upstream("send_patch_request")
+async def send_patch_request(id, AUTH_SERVICE_URL, payload, http: HTTPClientPool):
     logging.info(f"Log: Sending request to {AUTH_SERVICE_URL} with payload: {payload}")
     try:
-        response = requests.patch(AUTH_SERVICE_URL, json=payload, timeout=5)
+        response = await guarded_request(
+            "auth",
+            http.for_url(AUTH_SERVICE_URL),
+            "PATCH",
+            AUTH_SERVICE_URL,
+            json=payload,
+        )
         logging.info(f"Auth service response: {response.status_code}, {response.text}")
-        if response.status_code == 200:
+        if response.is_success:
             return
         elif response.status_code == 404:
             raise UserNotFoundError(user_id=id)
         elif response.status_code == 400:
             raise BadRequestError()
+        # Anything else means the change was not applied upstream.
+        raise UpstreamError("auth", response.status_code)
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"Request to auth service failed: {e}")
         raise Exception("Auth service request failed") from e
 
 
-async def get_user_info_auth():
+# Concurrent identical listing reads share one upstream request.
+upstream_reads = SingleFlight()
+
+
+def page_params(offset: int, limit: int | None) -> dict:
+    if limit is None:
+        return {}
+    return {"offset": offset, "limit": limit}
+
+
+@upstream_reads.coalesce(lambda http, offset=0, limit=None: ("auth", offset, limit))
+@observe_upstream("get_user_info_auth")
+async def get_user_info_auth(
+    http: HTTPClientPool, offset: int = 0, limit: int | None = None
+):
     prefix = await get_auth_url()
     AUTH_SERVICE_URL = f"{prefix}/auth"
     try:
-        response = requests.get(AUTH_SERVICE_URL, timeout=5)
-        logging.info(f"Auth service response: {response.status_code}, {response.text}")
+        response = await guarded_request(
+            "auth",
+            http.for_url(AUTH_SERVICE_URL),
+            "GET",
+            AUTH_SERVICE_URL,
+            retry=True,
+            params=page_params(offset, limit),
+        )
+        logging.info(f"Auth service response: {response.status_code}")
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 404:
@@ -55,19 +103,28 @@ async def get_user_info_auth():
         else:
             raise Exception("Unexpected error from auth service")
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"Request to auth service failed: {e}")
         raise Exception("Auth service request failed") from e
 
 
-async def get_user_info_users():
-    prefix = os.getenv("URL_USERS")
-    if prefix is None:
-        raise RuntimeError("Environment variable 'URL_USERS' is not set")
+@upstream_reads.coalesce(lambda http, offset=0, limit=None: ("users", offset, limit))
+@observe_upstream("get_user_info_users")
+async def get_user_info_users(
+    http: HTTPClientPool, offset: int = 0, limit: int | None = None
+):
+    prefix = await get_users_url()
     USERS_SERVICE_URL = f"{prefix}/users"
     try:
-        response = requests.get(USERS_SERVICE_URL, timeout=5)
-        logging.info(f"Auth service response: {response.status_code}, {response.text}")
+        response = await guarded_request(
+            "users",
+            http.for_url(USERS_SERVICE_URL),
+            "GET",
+            USERS_SERVICE_URL,
+            retry=True,
+            params=page_params(offset, limit),
+        )
+        logging.info(f"Users service response: {response.status_code}")
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 404:
@@ -75,6 +132,94 @@ async def get_user_info_users():
         else:
             raise Exception("Unexpected error from auth service")
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"Request to auth service failed: {e}")
         raise Exception("Auth service request failed") from e
+
+
+@dataclass
+class ListingChanges:
+    rows: list[dict] | None  # None when the upstream answered 304 Not Modified
+    etag: str | None
+    size: int
+
+
+@observe_upstream("fetch_listing_changes")
+async def fetch_listing_changes(
+    upstream: str,
+    http: HTTPClientPool,
+    etag: str | None = None,
+    updated_since: datetime | None = None,
+) -> ListingChanges:
+    # Conditional, incremental read of the /auth or /users listing. The ETag
+    # is treated as a version of the whole dataset, so a 304 means nothing
+    # changed since the previous sync.
+    if upstream == "auth":
+        url = f"{await get_auth_url()}/auth"
+    else:
+        url = f"{await get_users_url()}/users"
+    headers = {"If-None-Match": etag} if etag else {}
+    params = {"updated_since": updated_since.isoformat()} if updated_since else {}
+    try:
+        response = await guarded_request(
+            upstream,
+            http.for_url(url),
+            "GET",
+            url,
+            retry=True,
+            params=params,
+            headers=headers,
+        )
+        logging.info(f"{upstream} listing changes response: {response.status_code}")
+        if response.status_code == 304:
+            return ListingChanges(None, etag, 0)
+        if response.status_code == 200:
+            return ListingChanges(
+                response.json(), response.headers.get("ETag"), len(response.content)
+            )
+        raise Exception(f"Unexpected error from {upstream} service")
+
+    except httpx.HTTPError as e:
+        logging.error(f"Request to {upstream} service failed: {e}")
+        raise Exception(f"{upstream} service request failed") from e
+
+
+async def iter_pages(
+    fetch, http: HTTPClientPool, page_size: int, offset: int = 0, limit=None
+):
+    # Walks an upstream listing with offset/limit query parameters. Upstreams
+    # that ignore those parameters answer with the whole list, which is then
+    # windowed locally and yielded once. A short list does not look any
+    # different from a real page, so when starting past the beginning the
+    # head of the listing is fetched alongside the first page: if the page
+    # starts with it, the offset was ignored.
+    remaining = limit
+    first_id = None
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        if first_id is None and offset > 0:
+            page, head = await asyncio.gather(
+                fetch(http, offset=offset, limit=size),
+                fetch(http, offset=0, limit=1),
+            )
+            ignored = len(head) > 1 or (
+                bool(head) and bool(page) and page[0].get("id") == head[0].get("id")
+            )
+        else:
+            page = await fetch(http, offset=offset, limit=size)
+            ignored = len(page) > size
+        if ignored:
+            window = page[offset:]
+            yield window if remaining is None else window[:remaining]
+            return
+        if first_id is not None and page and page[0].get("id") == first_id:
+            return
+        if page:
+            if first_id is None:
+                first_id = page[0].get("id")
+            yield page
+        if len(page) < size:
+            return
+        offset += len(page)
+        if remaining is not None:
+            remaining -= len(page)
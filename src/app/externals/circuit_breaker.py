@@ -0,0 +1,210 @@
+import asyncio
+import os
+import random
+import time
+import httpx
+from src.app.config.config import get_settings
+from src.app.exceptions.exceptions import UpstreamUnavailableError
+from src.app.metrics.registry import REGISTRY
+
+_settings = get_settings()
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+RETRYABLE_STATUSES = (502, 503, 504)
+
+UPSTREAM_CIRCUIT_STATE = REGISTRY.gauge(
+    "upstream_circuit_state",
+    "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open).",
+    ("upstream",),
+)
+UPSTREAM_RETRIES = REGISTRY.counter(
+    "upstream_retries_total",
+    "Retries of idempotent upstream requests.",
+    ("upstream",),
+)
+UPSTREAM_RETRIES_DENIED = REGISTRY.counter(
+    "upstream_retries_denied_total",
+    "Retries skipped because the global retry budget was exhausted.",
+    ("upstream",),
+)
+
+
+class CircuitBreaker:
+    # Opens after `failure_threshold` consecutive failures and fails fast for
+    # `reset_timeout` seconds. Then a single probe request is let through
+    # (half-open): success closes the circuit, failure opens it again.
+    def __init__(
+        self,
+        upstream: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock=time.monotonic,
+    ) -> None:
+        self.upstream = upstream
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.state = CLOSED
+        self._set_state(CLOSED)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        UPSTREAM_CIRCUIT_STATE.set(self.upstream, value=STATE_VALUES[state])
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def before_call(self) -> None:
+        if self.state == OPEN:
+            if self.retry_after() > 0:
+                raise UpstreamUnavailableError(self.upstream, self.retry_after())
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probing:
+                raise UpstreamUnavailableError(self.upstream, self.reset_timeout)
+            self._probing = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        if self.state != CLOSED:
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            self._set_state(OPEN)
+
+    def record_cancelled(self) -> None:
+        # A cancelled call says nothing about the upstream; free the probe slot.
+        self._probing = False
+
+
+class RetryBudget:
+    # Retries may add at most `ratio` extra load on top of regular requests,
+    # plus a small floor of `min_per_second`, so retries cannot amplify an
+    # outage. Shared by all upstreams.
+    def __init__(
+        self, ratio: float, min_per_second: float, clock=time.monotonic
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max(1.0, min_per_second * 10)
+        self._clock = clock
+        self._tokens = self.max_tokens
+        self._last = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.max_tokens, self._tokens + (now - self._last) * self.min_per_second
+        )
+        self._last = now
+
+    def deposit(self) -> None:
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    # "Full jitter": uniform in [0, min(cap, base * 2^attempt)].
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_budget: RetryBudget | None = None
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    breaker = _breakers.get(upstream)
+    if breaker is None:
+        breaker = _breakers[upstream] = CircuitBreaker(
+            upstream,
+            failure_threshold=_settings.breaker_failure_threshold,
+            reset_timeout=_settings.breaker_reset_timeout,
+        )
+    return breaker
+
+
+def get_retry_budget() -> RetryBudget:
+    global _budget
+    if _budget is None:
+        _budget = RetryBudget(
+            ratio=_settings.retry_budget_ratio,
+            min_per_second=_settings.retry_budget_min_per_second,
+        )
+    return _budget
+
+
+def reset_breakers() -> None:
+    global _budget
+    _breakers.clear()
+    _budget = None
+
+
+os.register_at_fork(after_in_child=reset_breakers)
+
+
+async def guarded_request(
+    upstream: str,
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    retry: bool = False,
+    **kwargs,
+) -> httpx.Response:
+    # Sends a request through the upstream's breaker. Transport errors and 5xx
+    # answers count as failures; idempotent requests (`retry=True`) are
+    # retried with jittered backoff while the global retry budget allows it.
+    breaker = get_breaker(upstream)
+    budget = get_retry_budget()
+    budget.deposit()
+    attempt = 0
+    while True:
+        breaker.before_call()
+        error, response = None, None
+        try:
+            response = await client.request(method, url, **kwargs)
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        except httpx.HTTPError as e:
+            error = e
+        if response is not None and response.status_code < 500:
+            breaker.record_success()
+            return response
+        breaker.record_failure()
+
+        retryable = error is not None or response.status_code in RETRYABLE_STATUSES
+        if not retry or not retryable or attempt >= _settings.upstream_get_retries:
+            break
+        if not budget.withdraw():
+            UPSTREAM_RETRIES_DENIED.inc(upstream)
+            break
+        UPSTREAM_RETRIES.inc(upstream)
+        await asyncio.sleep(
+            backoff_delay(
+                attempt,
+                _settings.upstream_retry_base_delay,
+                _settings.upstream_retry_max_delay,
+            )
+        )
+        attempt += 1
+    if error is not None:
+        raise error
+    return response
@@ -0,0 +1,75 @@
+import os
+import httpx
+from urllib.parse import urlsplit
+from src.app.config.config import get_settings
+
+_settings = get_settings()
+
+
+class HTTPClientPool:
+    # One keep-alive client per upstream host, so limits apply per host.
+    def __init__(
+        self,
+        timeout: float,
+        max_connections_per_host: int,
+        max_keepalive_per_host: int,
+        keepalive_expiry: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._timeout = httpx.Timeout(timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def for_url(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=self._limits,
+                transport=self._transport,
+            )
+            self._clients[host] = client
+        return client
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+_pool: HTTPClientPool | None = None
+
+
+def get_http_pool() -> HTTPClientPool:
+    global _pool
+    if _pool is None:
+        _pool = HTTPClientPool(
+            timeout=_settings.http_timeout,
+            max_connections_per_host=_settings.http_max_connections_per_host,
+            max_keepalive_per_host=_settings.http_max_keepalive_per_host,
+            keepalive_expiry=_settings.http_keepalive_expiry,
+        )
+    return _pool
+
+
+async def close_http_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
+
+
+def _reset_after_fork() -> None:
+    global _pool
+    _pool = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
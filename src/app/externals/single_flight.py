@@ -0,0 +1,61 @@
+import asyncio
+import functools
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+
+@dataclass
+class _Call:
+    task: asyncio.Future
+    waiters: int = 0
+
+
+class SingleFlight:
+    # Coalesces concurrent calls with the same key into one in-flight call;
+    # every caller awaits the same result (or exception). Results are shared,
+    # not copied, so callers must treat them as read-only. Nothing is cached
+    # once the call completes.
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn(*args, **kwargs)))
+            self._calls[key] = call
+            call.task.add_done_callback(functools.partial(self._forget, key))
+        call.waiters += 1
+        try:
+            # A caller that gives up (timeout, disconnect) must not cancel the
+            # call the other callers are still waiting on...
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # ...but once every caller has gone, nobody needs the result.
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+
+    def coalesce(self, key_fn: Callable[..., Hashable]):
+        def decorator(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                return await self.do(key_fn(*args, **kwargs), fn, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        call = self._calls.get(key)
+        if call is not None and call.task is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved when every caller has gone away.
+            future.exception()
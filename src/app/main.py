@@ -1,19 +1,59 @@
+import asyncio
+import logging
+import time
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from src.app.config.config import get_settings
-from src.app.routes import health, admin_router
+from src.app.routes import health, admin_router, stats, metrics
+from src.app.metrics.metrics import LoopLagMonitor, MetricsMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
 settings = get_settings()
+loop_lag_monitor = LoopLagMonitor(settings.metrics_loop_lag_interval)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    from src.app.db.db_client import get_client
+    from src.app.db.db_client import get_client, get_db, warm_pool
+    from src.app.db.indexes import prepare_indexes
+    from src.app.externals.http_client import get_http_pool, close_http_pool
+    from src.app.security.hashing import get_hashing_pool, shutdown_hashing_pool
+    from src.app.security.hash_policy import init_hash_policy
+    from src.app.repositories.log_writer import get_log_writer, close_log_writer
+    from src.app.metrics.blocking import get_blocking_detector, close_blocking_detector
+    from src.app.services.directory_sync import (
+        get_directory_sync,
+        close_directory_sync,
+    )
 
-    await get_client().admin.command("ping")
+    start = time.perf_counter()
+    detector = get_blocking_detector(app)
+    if detector is not None:
+        detector.start()
+
+    # Warming the pool doubles as the Mongo ping; index creation and the
+    # password hash calibration do not depend on it, so all run at once.
+    await asyncio.gather(
+        warm_pool(get_client(), settings.mongo_min_pool_size),
+        prepare_indexes(get_db()),
+        init_hash_policy(),
+    )
+    get_http_pool()
+    get_hashing_pool()
+    await get_log_writer()
+    directory_sync = get_directory_sync()
+    if directory_sync is not None:
+        directory_sync.start()
+    loop_lag_monitor.start()
+    logging.info(f"Startup completed in {time.perf_counter() - start:.3f}s")
     yield
 
+    await loop_lag_monitor.stop()
+    await close_blocking_detector()
+    await close_directory_sync()
+    await close_log_writer()
+    await close_http_pool()
+    shutdown_hashing_pool()
     get_client().close()
 
 
@@ -21,6 +61,8 @@ app = FastAPI(title="ClassConnect BackOffice", version="1.0.0", lifespan=lifespa
 
 app.include_router(health.router)
 app.include_router(admin_router.router, prefix="/admin", tags=["admin"])
+app.include_router(stats.router, prefix="/stats", tags=["stats"])
+app.include_router(metrics.router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,3 +71,4 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from dataclasses import dataclass
+from src.app.config.config import get_settings
+from src.app.metrics.registry import REGISTRY
+
+_settings = get_settings()
+
+EVENT_LOOP_BLOCKS = REGISTRY.counter(
+    "event_loop_blocks_total",
+    "Times the event loop was blocked longer than the detector threshold.",
+    ("route",),
+)
+
+UNKNOWN_ROUTE = "unknown"
+
+
+@dataclass
+class BlockingIncident:
+    route: str
+    duration: float
+    stack: str
+
+
+def route_map(app) -> dict:
+    # Endpoint code objects -> route path, used to attribute a blocked stack.
+    routes = {}
+    for route in getattr(app, "routes", []):
+        endpoint = getattr(route, "endpoint", None)
+        code = getattr(endpoint, "__code__", None)
+        if code is not None:
+            routes[code] = route.path
+    return routes
+
+
+class BlockingDetector:
+    # A heartbeat task on the loop and a watchdog thread outside it. When the
+    # heartbeat goes stale for longer than `threshold`, the watchdog grabs the
+    # loop thread's stack with sys._current_frames(), which shows the exact
+    # synchronous call holding the loop.
+    def __init__(self, threshold: float, routes: dict | None = None) -> None:
+        self.threshold = threshold
+        self.routes = routes or {}
+        self.incidents: list[BlockingIncident] = []
+        self.counts: Counter[str] = Counter()
+        self._beat = 0.0
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-blocking-detector", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._thread.join()
+        self._task = None
+        self._thread = None
+
+    async def __aenter__(self) -> "BlockingDetector":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def assert_no_blocking(self) -> None:
+        if self.incidents:
+            details = "\n".join(
+                f"{incident.route} blocked for {incident.duration:.3f}s\n{incident.stack}"
+                for incident in self.incidents
+            )
+            raise AssertionError(
+                f"Event loop blocked {len(self.incidents)} time(s):\n{details}"
+            )
+
+    async def _heartbeat(self) -> None:
+        interval = self.threshold / 4
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(interval)
+
+    def _watch(self) -> None:
+        interval = self.threshold / 4
+        current: BlockingIncident | None = None
+        reported_beat = None
+        while not self._stopped.wait(interval):
+            beat = self._beat
+            blocked_for = time.monotonic() - beat
+            if blocked_for < self.threshold:
+                current = None
+                continue
+            if beat == reported_beat:
+                current.duration = blocked_for
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            reported_beat = beat
+            current = self._record(frame, blocked_for)
+
+    def _record(self, frame, blocked_for: float) -> BlockingIncident:
+        stack = traceback.extract_stack(frame)
+        route = UNKNOWN_ROUTE
+        f = frame
+        while f is not None:
+            if f.f_code in self.routes:
+                route = self.routes[f.f_code]
+                break
+            f = f.f_back
+        incident = BlockingIncident(route, blocked_for, "".join(stack.format()))
+        self.incidents.append(incident)
+        self.counts[route] += 1
+        EVENT_LOOP_BLOCKS.inc(route)
+        logging.warning(
+            f"Event loop blocked for more than {self.threshold:.3f}s in {route}:\n"
+            f"{incident.stack}"
+        )
+        return incident
+
+
+_detector: BlockingDetector | None = None
+
+
+def get_blocking_detector(app=None) -> BlockingDetector | None:
+    global _detector
+    if not _settings.blocking_detector_enabled:
+        return None
+    if _detector is None:
+        _detector = BlockingDetector(
+            _settings.blocking_detector_threshold, route_map(app)
+        )
+    return _detector
+
+
+async def close_blocking_detector() -> None:
+    global _detector
+    if _detector is not None:
+        await _detector.stop()
+        _detector = None
+
+
+def _reset_after_fork() -> None:
+    global _detector
+    _detector = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,131 @@
+import asyncio
+import functools
+import time
+from pymongo import monitoring
+from src.app.metrics.registry import REGISTRY
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+UPSTREAM_REQUEST_DURATION = REGISTRY.histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to upstream services by external function.",
+    ("function",),
+)
+UPSTREAM_REQUEST_ERRORS = REGISTRY.counter(
+    "upstream_request_errors_total",
+    "Failed calls to upstream services by external function and error type.",
+    ("function", "error"),
+)
+MONGO_COMMAND_DURATION = REGISTRY.histogram(
+    "mongo_command_duration_seconds",
+    "Duration of MongoDB commands by command name.",
+    ("command",),
+)
+MONGO_COMMAND_FAILURES = REGISTRY.counter(
+    "mongo_command_failures_total",
+    "Failed MongoDB commands by command name.",
+    ("command",),
+)
+PASSWORD_HASH_DURATION = REGISTRY.histogram(
+    "password_hash_duration_seconds",
+    "Time to hash or verify a password, including the wait for a hashing worker.",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "event_loop_lag_seconds",
+    "Delay between when a loop callback was scheduled and when it ran.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+def observe_upstream(function: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                UPSTREAM_REQUEST_ERRORS.inc(function, type(e).__name__)
+                raise
+            finally:
+                UPSTREAM_REQUEST_DURATION.observe(
+                    function, value=time.perf_counter() - start
+                )
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware: it adds no extra task or body buffering per request.
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status),
+                value=time.perf_counter() - start,
+            )
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMAND_DURATION.observe(
+            event.command_name, value=event.duration_micros / 1e6
+        )
+
+    def failed(self, event):
+        MONGO_COMMAND_DURATION.observe(
+            event.command_name, value=event.duration_micros / 1e6
+        )
+        MONGO_COMMAND_FAILURES.inc(event.command_name)
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            EVENT_LOOP_LAG.observe(value=max(0.0, loop.time() - expected))
@@ -1,13 +1,22 @@
 from pydantic import EmailStr
 from datetime import datetime, timezone
 from src.app.entities.admin_entity import AdminDTA
+from src.app.exceptions.exceptions import AdminAlreadyExistsError
+from src.app.externals.single_flight import SingleFlight
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
 
 REPOSITORY = "admin"
 
+# Concurrent logins of the same account share one find_one.
+_email_lookups = SingleFlight()
+
 
 class AdminRepository:
+    INDEXES = [IndexModel([("email", ASCENDING)], unique=True, name="email_unique")]
+
     def __init__(self, db: AsyncIOMotorDatabase) -> None:
         self.collection: AsyncIOMotorCollection = db[REPOSITORY]
 
@@ -20,7 +29,10 @@ class AdminRepository:
             "signup_date": datetime.now(timezone.utc),
             "other_id": other_id,
         }
-        result = await self.collection.insert_one(admin_data)
+        try:
+            result = await self.collection.insert_one(admin_data)
+        except DuplicateKeyError:
+            raise AdminAlreadyExistsError(email)
         admin_data["_id"] = result.inserted_id
         return AdminDTA.from_mongo(admin_data)
 
@@ -35,7 +47,23 @@ class AdminRepository:
             return None
         return AdminDTA.from_mongo(admin_data)
 
+    async def update_password_hash(
+        self, admin_id: str, old_hash: str, new_hash: str
+    ) -> bool:
+        # Compare-and-set: only replaces the hash that was verified.
+        result = await self.collection.update_one(
+            {"_id": ObjectId(admin_id), "hashed_password": old_hash},
+            {"$set": {"hashed_password": new_hash}},
+        )
+        return result.modified_count == 1
+
     async def get_by_email(self, email: EmailStr) -> AdminDTA | None:
+        # Keyed by collection too: repositories on other databases (tenants,
+        # test overrides) must not share each other's lookups.
+        key = (self.collection.full_name, email)
+        return await _email_lookups.do(key, self._get_by_email, email)
+
+    async def _get_by_email(self, email: EmailStr) -> AdminDTA | None:
         admin_data = await self.collection.find_one({"email": email})
         if not admin_data:
             return None
@@ -0,0 +1,23 @@
+# Number of rows ever inserted into a collection, kept in one document per
+# collection. Unlike the newest row, it changes on every insert, even when a
+# buffered or concurrent write lands with an older timestamp, so readers can
+# use it as a validator.
+import logging
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+REPOSITORY = "collection_changes"
+
+
+async def record_inserts(collection: AsyncIOMotorCollection, count: int) -> None:
+    # Called once the rows are written; a failed bump must not fail the write.
+    try:
+        await collection.database[REPOSITORY].update_one(
+            {"_id": collection.name}, {"$inc": {"inserted": count}}, upsert=True
+        )
+    except Exception as e:
+        logging.error(f"Could not record {count} inserts into '{collection.name}': {e}")
+
+
+async def inserted_count(collection: AsyncIOMotorCollection) -> int:
+    doc = await collection.database[REPOSITORY].find_one({"_id": collection.name})
+    return 0 if doc is None else doc["inserted"]
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import os
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError
+from src.app.repositories.change_counter import record_inserts
+from src.app.config.config import get_settings
+
+_settings = get_settings()
+
+
+class LogWriter:
+    # Write-behind buffer for audit rows. Producers enqueue documents and a
+    # background task flushes them with insert_many when a batch fills up or
+    # flush_interval elapses. The bounded queue makes producers wait when
+    # Mongo falls behind. Rows are grouped by collection name, not by the
+    # collection object: repositories are built per request, and Motor hands
+    # out a new collection object on every access.
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_queue: int,
+        retries: int = 2,
+        retry_delay: float = 0.05,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: asyncio.Task | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self.loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._run())
+
+    async def write(
+        self, collection: AsyncIOMotorCollection, doc: dict, durable: bool = False
+    ) -> None:
+        await self.write_many(collection, [doc], durable)
+
+    async def write_many(
+        self,
+        collection: AsyncIOMotorCollection,
+        docs: list[dict],
+        durable: bool = False,
+    ) -> None:
+        futures = []
+        for doc in docs:
+            future = asyncio.get_running_loop().create_future() if durable else None
+            await self._queue.put((collection, doc, future))
+            if future is not None:
+                futures.append(future)
+        if futures:
+            await asyncio.gather(*futures)
+
+    async def stop(self, timeout: float) -> None:
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except TimeoutError:
+            logging.error(
+                f"Log writer shutdown timed out with {self._queue.qsize()} pending logs"
+            )
+        self._task = None
+
+    async def _run(self) -> None:
+        # A None entry is the shutdown sentinel: flush what is buffered and exit.
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            entry = await self._queue.get()
+            if entry is None:
+                return
+            batch = [entry]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+                if entry is None:
+                    closing = True
+                    break
+                batch.append(entry)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list) -> None:
+        grouped: dict[str, list] = {}
+        for entry in batch:
+            grouped.setdefault(entry[0].full_name, []).append(entry)
+        for entries in grouped.values():
+            collection = entries[0][0]
+            try:
+                await self._insert(collection, [doc for _, doc, _ in entries])
+                await record_inserts(collection, len(entries))
+                for _, _, future in entries:
+                    if future is not None and not future.done():
+                        future.set_result(None)
+            except Exception as e:
+                logging.error(f"Failed to flush {len(entries)} logs, dropped: {e}")
+                for _, _, future in entries:
+                    if future is not None and not future.done():
+                        future.set_exception(e)
+
+    async def _insert(self, collection: AsyncIOMotorCollection, docs: list) -> None:
+        # Ids are generated client side, so a retry after a partial insert
+        # only reports duplicates for the rows already written.
+        attempt = 0
+        while True:
+            try:
+                await collection.insert_many(docs, ordered=False)
+                return
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if errors and all(error.get("code") == 11000 for error in errors):
+                    return
+                if attempt >= self.retries:
+                    raise
+            except Exception:
+                if attempt >= self.retries:
+                    raise
+            attempt += 1
+            logging.warning(f"Retrying flush of {len(docs)} logs (attempt {attempt})")
+            await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+
+_writer: LogWriter | None = None
+
+
+async def get_log_writer() -> LogWriter | None:
+    # Async so that, as a FastAPI dependency, it runs on the event loop
+    # rather than in the threadpool, where there is no running loop.
+    global _writer
+    if not _settings.log_writer_enabled:
+        return None
+    if _writer is None or _writer.loop is not asyncio.get_running_loop():
+        _writer = LogWriter(
+            batch_size=_settings.log_batch_size,
+            flush_interval=_settings.log_flush_interval,
+            max_queue=_settings.log_queue_size,
+            retries=_settings.log_flush_retries,
+            retry_delay=_settings.log_flush_retry_delay,
+        )
+        _writer.start()
+    return _writer
+
+
+async def close_log_writer() -> None:
+    global _writer
+    if _writer is not None:
+        await _writer.stop(_settings.log_shutdown_timeout)
+        _writer = None
+
+
+def _reset_after_fork() -> None:
+    global _writer
+    _writer = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
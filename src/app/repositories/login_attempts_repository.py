@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import ASCENDING, IndexModel
+from bson import ObjectId
+
+REPOSITORY = "login_attempts"
+
+
+def _to_datetime(at: float) -> datetime:
+    return datetime.fromtimestamp(at, tz=timezone.utc)
+
+
+class LoginAttemptsRepository:
+    # Failed login attempts shared by every worker and kept across restarts.
+    # Each attempt carries its own expiry, so the TTL index does not depend on
+    # the configured window.
+    INDEXES = [
+        IndexModel([("key", ASCENDING), ("at", ASCENDING)], name="key_at"),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl"),
+    ]
+
+    def __init__(self, db: AsyncIOMotorDatabase, window: float) -> None:
+        self.collection: AsyncIOMotorCollection = db[REPOSITORY]
+        self.window = timedelta(seconds=window)
+
+    async def count(self, key: str, since: float) -> tuple[int, float | None]:
+        # Number of attempts after `since` and the timestamp of the oldest one.
+        cursor = self.collection.aggregate(
+            [
+                {"$match": {"key": key, "at": {"$gt": _to_datetime(since)}}},
+                {
+                    "$group": {
+                        "_id": None,
+                        "count": {"$sum": 1},
+                        "oldest": {"$min": "$at"},
+                    }
+                },
+            ]
+        )
+        async for row in cursor:
+            oldest = row["oldest"].replace(tzinfo=timezone.utc).timestamp()
+            return row["count"], oldest
+        return 0, None
+
+    async def add(self, key: str, at: float) -> ObjectId:
+        moment = _to_datetime(at)
+        result = await self.collection.insert_one(
+            {"key": key, "at": moment, "expires_at": moment + self.window}
+        )
+        return result.inserted_id
+
+    async def remove(self, key: str, token: ObjectId) -> None:
+        await self.collection.delete_one({"_id": token, "key": key})
+
+    async def clear(self, key: str) -> None:
+        await self.collection.delete_many({"key": key})
@@ -1,19 +1,135 @@
 from datetime import datetime, timezone
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from src.app.repositories.log_writer import LogWriter
+from src.app.repositories.change_counter import inserted_count, record_inserts
+from src.app.exceptions.exceptions import BadRequestError
 
 REPOSITORY = "logs"
+LOG_PROJECTION = {"user_id": 1, "action": 1, "timestamp": 1}
+LOG_ORDER = [("timestamp", DESCENDING), ("_id", DESCENDING)]
+
+
+def encode_log_cursor(log_info: dict) -> str:
+    millis = int(log_info["timestamp"].replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return f"{millis}_{log_info['_id']}"
+
+
+def decode_log_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        millis, _id = cursor.split("_", 1)
+        timestamp = datetime.fromtimestamp(int(millis) / 1000, tz=timezone.utc)
+        return timestamp, ObjectId(_id)
+    except Exception:
+        raise BadRequestError()
+
+
+def log_query(
+    user_id: str | None,
+    action: str | None,
+    since: datetime | None,
+    until: datetime | None,
+) -> dict:
+    query: dict = {}
+    if user_id is not None:
+        query["user_id"] = user_id
+    if action is not None:
+        query["action"] = action
+    if since is not None or until is not None:
+        query["timestamp"] = {}
+        if since is not None:
+            query["timestamp"]["$gte"] = since
+        if until is not None:
+            query["timestamp"]["$lt"] = until
+    return query
 
 
 class LogRepository:
-    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+    # Every query filters on at most one equality field and walks
+    # (timestamp, _id) backwards, so each index ends with that sort key.
+    INDEXES = [
+        IndexModel(
+            [("user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="user_id_timestamp_id",
+        ),
+        IndexModel(
+            [("action", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="action_timestamp_id",
+        ),
+        IndexModel(LOG_ORDER, name="timestamp_id"),
+    ]
+
+    def __init__(
+        self, db: AsyncIOMotorDatabase, writer: LogWriter | None = None
+    ) -> None:
         self.collection: AsyncIOMotorCollection = db[REPOSITORY]
+        self.writer = writer
 
-    async def create_log(self, user_id: str, action: str):
+    async def create_log(self, user_id: str, action: str, durable: bool = False):
         log_info = {
             "user_id": user_id,
             "action": action,
             "timestamp": datetime.now(timezone.utc),
         }
+        if self.writer is not None:
+            log_info["_id"] = ObjectId()
+            await self.writer.write(self.collection, log_info, durable)
+            return log_info
         result = await self.collection.insert_one(log_info)
+        await record_inserts(self.collection, 1)
         log_info["_id"] = result.inserted_id
         return log_info
+
+    async def create_logs(
+        self, user_ids: list[str], action: str, durable: bool = False
+    ):
+        now = datetime.now(timezone.utc)
+        logs = [
+            {"user_id": user_id, "action": action, "timestamp": now}
+            for user_id in user_ids
+        ]
+        if self.writer is not None:
+            for log_info in logs:
+                log_info["_id"] = ObjectId()
+            await self.writer.write_many(self.collection, logs, durable)
+            return logs
+        result = await self.collection.insert_many(logs)
+        await record_inserts(self.collection, len(logs))
+        for log_info, inserted_id in zip(logs, result.inserted_ids):
+            log_info["_id"] = inserted_id
+        return logs
+
+    async def find_logs(
+        self,
+        user_id: str | None = None,
+        action: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        after: str | None = None,
+        limit: int = 100,
+    ):
+        # Keyset pagination: `after` is the cursor of the last row already
+        # seen, so each page is an index range scan regardless of depth.
+        query = log_query(user_id, action, since, until)
+        if after is not None:
+            timestamp, _id = decode_log_cursor(after)
+            query["$or"] = [
+                {"timestamp": {"$lt": timestamp}},
+                {"timestamp": timestamp, "_id": {"$lt": _id}},
+            ]
+        cursor = (
+            self.collection.find(query, LOG_PROJECTION)
+            .sort(LOG_ORDER)
+            .limit(limit)
+            .batch_size(min(limit, 500))
+        )
+        async for log_info in cursor:
+            yield log_info
+
+    async def change_count(self) -> int:
+        # Bumped by every insert, direct or buffered, once the rows are
+        # written. The newest row would not do as a validator: buffered and
+        # multi-worker writes can land with an older timestamp than a row a
+        # client has already seen.
+        return await inserted_count(self.collection)
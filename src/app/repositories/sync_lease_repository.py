@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo.errors import DuplicateKeyError
+
+REPOSITORY = "sync_leases"
+
+
+class SyncLeaseRepository:
+    # One document per background job. Whoever holds the unexpired lease runs
+    # the job; everyone else only reads when it last completed.
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.collection: AsyncIOMotorCollection = db[REPOSITORY]
+
+    async def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        # Takes or renews the lease. When another owner holds an unexpired
+        # lease the filter does not match and the upsert collides on _id.
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.update_one(
+                {"_id": name, "$or": [{"owner": owner}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl)}},
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def record_success(self, name: str, owner: str, at: float) -> None:
+        await self.collection.update_one(
+            {"_id": name, "owner": owner},
+            {"$set": {"succeeded_at": datetime.fromtimestamp(at, tz=timezone.utc)}},
+        )
+
+    async def last_success(self, name: str) -> float | None:
+        doc = await self.collection.find_one({"_id": name}, {"succeeded_at": 1})
+        if not doc or "succeeded_at" not in doc:
+            return None
+        return doc["succeeded_at"].replace(tzinfo=timezone.utc).timestamp()
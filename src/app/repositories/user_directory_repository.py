@@ -0,0 +1,71 @@
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import ASCENDING, IndexModel, UpdateOne
+
+REPOSITORY = "user_directory"
+USER_FIELDS = ("name", "last_name", "email", "role")
+DIRECTORY_PROJECTION = {field: 1 for field in USER_FIELDS} | {"is_locked": 1}
+WRITE_BATCH = 1000
+
+# Each upstream owns some fields of a directory entry and stamps it when it
+# writes them; a full sync sweeps what the upstream no longer returns.
+SYNC_FIELDS = {"users": "users_synced_at", "auth": "auth_synced_at"}
+
+
+class UserDirectoryRepository:
+    # Local copy of the users (profile) and auth (is_locked) listings, keyed
+    # by user id, so users_info can be answered without calling upstreams.
+    INDEXES = [
+        IndexModel([("users_synced_at", ASCENDING)], name="users_synced_at"),
+        IndexModel([("auth_synced_at", ASCENDING)], name="auth_synced_at"),
+    ]
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.collection: AsyncIOMotorCollection = db[REPOSITORY]
+
+    async def upsert(self, upstream: str, rows: list[dict], synced_at: datetime):
+        stamp = SYNC_FIELDS[upstream]
+        fields = USER_FIELDS if upstream == "users" else ("is_locked",)
+        for start in range(0, len(rows), WRITE_BATCH):
+            operations = [
+                UpdateOne(
+                    {"_id": row["id"]},
+                    {
+                        "$set": {field: row[field] for field in fields if field in row}
+                        | {stamp: synced_at}
+                    },
+                    upsert=True,
+                )
+                for row in rows[start : start + WRITE_BATCH]
+            ]
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def sweep(self, upstream: str, synced_before: datetime) -> None:
+        stamp = SYNC_FIELDS[upstream]
+        stale = {stamp: {"$lt": synced_before}}
+        if upstream == "users":
+            await self.collection.delete_many(stale)
+        else:
+            await self.collection.update_many(
+                stale, {"$unset": {"is_locked": "", stamp: ""}}
+            )
+
+    async def patch(self, user_ids: list[str], **changes) -> None:
+        await self.collection.update_many({"_id": {"$in": user_ids}}, {"$set": changes})
+
+    async def find_users(self, skip: int, limit: int | None, left_join: bool):
+        # Users known to the users service, in id order; without auth data
+        # they are only returned for a left join.
+        query = {SYNC_FIELDS["users"]: {"$exists": True}}
+        if not left_join:
+            query["is_locked"] = {"$exists": True}
+        cursor = self.collection.find(query, DIRECTORY_PROJECTION).sort(
+            "_id", ASCENDING
+        )
+        cursor = cursor.skip(skip)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        async for doc in cursor:
+            doc["id"] = doc.pop("_id")
+            doc.setdefault("is_locked", None)
+            yield doc
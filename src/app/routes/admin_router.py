@@ -1,52 +1,132 @@
 from src.app.db.db_client import get_db
+from src.app.externals.http_client import HTTPClientPool, get_http_pool
 from src.app.repositories.admin_repository import AdminRepository
 from src.app.repositories.logs_repository import LogRepository
+from src.app.repositories.log_writer import LogWriter, get_log_writer
 from src.app.services.admin_service import AdminService
 from src.app.services.iam_service import IAMService
+from src.app.repositories.user_directory_repository import UserDirectoryRepository
+from src.app.services.directory_sync import get_user_directory
+from src.app.security.login_throttle import LoginThrottle, get_login_throttle
+from src.app.config.config import get_settings
 
-from fastapi import APIRouter, Depends, HTTPException
-from src.app.security.security import oauth2_scheme, create_access_token, decode_token
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from src.app.routes.responses import FastJSONResponse, models_response
+from src.app.routes.conditional import etag_matches, not_modified, variant_etag
+from src.app.routes.streaming import (
+    NDJSON_MEDIA_TYPE,
+    prime,
+    json_array,
+    json_page,
+    ndjson,
+)
+from src.app.models.log_model import ActionEnum
+from datetime import datetime
+import math
+from src.app.security.security import create_access_token, get_current_user
+from src.app.entities.admin_entity import User
 from src.app.schemas.admin_schemas import (
     RegisterRequest,
     LoginRequest,
     TokenResponse,
     BlockUserRequest,
     ChangeRoleRequest,
+    BulkBlockUserRequest,
+    BulkChangeRoleRequest,
+    BulkResponse,
+    GetUserInfoResponse,
 )
 
 from src.app.exceptions.exceptions import (
     AdminNotFoundError,
     AdminAlreadyExistsError,
-    GetDataFromTokenError,
     WrongPasswordError,
     UserNotFoundError,
     BadRequestError,
+    HashingPoolFullError,
+    UpstreamTimeoutError,
+    UpstreamUnavailableError,
+    UpstreamError,
+    LoginThrottledError,
 )
 
+_settings = get_settings()
+
 
-def get_admin_service(db=Depends(get_db)) -> AdminService:
+def get_admin_service(
+    db=Depends(get_db),
+    http: HTTPClientPool = Depends(get_http_pool),
+    directory: UserDirectoryRepository | None = Depends(get_user_directory),
+    throttle: LoginThrottle | None = Depends(get_login_throttle),
+) -> AdminService:
     repository = AdminRepository(db)
-    service = AdminService(repository)
+    service = AdminService(repository, http, directory=directory, throttle=throttle)
     return service
 
 
-def get_iam_service(db=Depends(get_db)) -> IAMService:
-    repository = LogRepository(db)
-    service = IAMService(repository)
+def get_iam_service(
+    db=Depends(get_db),
+    http: HTTPClientPool = Depends(get_http_pool),
+    writer: LogWriter | None = Depends(get_log_writer),
+    directory: UserDirectoryRepository | None = Depends(get_user_directory),
+) -> IAMService:
+    repository = LogRepository(db, writer)
+    service = IAMService(repository, http, directory=directory)
     return service
 
 
-router = APIRouter(tags=["admin"])
+router = APIRouter(tags=["admin"], default_response_class=FastJSONResponse)
+
+
+def server_timing(timings: dict[str, float]) -> dict[str, str]:
+    if not timings:
+        return {}
+    metrics = ", ".join(
+        f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()
+    )
+    return {"Server-Timing": metrics}
+
+
+def response_headers(service: AdminService, variant: str = "") -> dict[str, str]:
+    headers = server_timing(service.upstream_timings)
+    if service.data_age is not None:
+        headers["Age"] = str(int(service.data_age))
+    if service.etag is not None:
+        headers["ETag"] = variant_etag(service.etag, variant)
+    return headers
+
+
+def client_ip(request: Request) -> str | None:
+    # Behind a trusted proxy the client is the first X-Forwarded-For entry.
+    forwarded = request.headers.get("x-forwarded-for")
+    if _settings.login_trust_forwarded_for and forwarded:
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+def upstream_failed(e: UpstreamError) -> HTTPException:
+    return HTTPException(
+        status_code=502,
+        detail=f"Upstream '{e.upstream}' answered {e.status_code}, change not applied.",
+    )
+
+
+def upstream_unavailable(e: UpstreamUnavailableError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Upstream '{e.upstream}' is unavailable, please retry later.",
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+    )
 
 
 @router.post("/register")
 async def register_admin(
     data: RegisterRequest,
-    token: str = Depends(oauth2_scheme),
+    user: User = Depends(get_current_user),
     service: AdminService = Depends(get_admin_service),
 ):
     try:
-        user = decode_token(token)
         await service.create_admin(
             new_email=data.email,
             new_password=data.password,
@@ -61,8 +141,12 @@ async def register_admin(
         raise HTTPException(
             status_code=400, detail=f"Admin with email '{e.email}' already exists."
         )
-    except GetDataFromTokenError:
-        raise HTTPException(status_code=400, detail="Error getting data from token")
+    except HashingPoolFullError:
+        raise HTTPException(
+            status_code=503,
+            detail="Service busy, please retry later.",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"An unexpected error occurred: {str(e)}"
@@ -72,10 +156,11 @@ async def register_admin(
 @router.post("/login", response_model=TokenResponse)
 async def login_admin(
     body: LoginRequest,
+    request: Request,
     service: AdminService = Depends(get_admin_service),
 ):
     try:
-        admin = await service.login_admin(body.email, body.password)
+        admin = await service.login_admin(body.email, body.password, client_ip(request))
         token = create_access_token(id=admin.id, email=admin.email)
         return TokenResponse(access_token=token, token_type="bearer")
     except AdminNotFoundError as e:
@@ -86,6 +171,18 @@ async def login_admin(
         raise HTTPException(
             status_code=401, detail=f"Wrong password for admin with email '{e.email}'."
         )
+    except LoginThrottledError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many failed login attempts, please retry later.",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
+    except HashingPoolFullError:
+        raise HTTPException(
+            status_code=503,
+            detail="Service busy, please retry later.",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"An unexpected error occurred: {str(e)}"
@@ -96,19 +193,20 @@ async def login_admin(
 async def block_user(
     user_id: str,
     body: BlockUserRequest,
-    token: str = Depends(oauth2_scheme),
+    user: User = Depends(get_current_user),
     service: IAMService = Depends(get_iam_service),
 ):
     try:
-        user = decode_token(token)
         await service.block_user(user_id, body.to_block)
         return {"message": "User blocked" if body.to_block else "User unblocked"}
-    except GetDataFromTokenError:
-        raise HTTPException(status_code=400, detail="Error getting data from token")
     except UserNotFoundError as e:
         raise HTTPException(
             status_code=404, detail=f"User with id '{user_id}' not found."
         )
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
+    except UpstreamError as e:
+        raise upstream_failed(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"An unexpected error occurred: {str(e)}"
@@ -119,19 +217,55 @@ async def block_user(
 async def change_user_role(
     user_id: str,
     body: ChangeRoleRequest,
-    token: str = Depends(oauth2_scheme),
+    user: User = Depends(get_current_user),
     service: IAMService = Depends(get_iam_service),
 ):
     try:
-        user = decode_token(token)
         await service.change_role(user_id, body.rol)
         return {"message": "User role changed" if body else "User role reverted"}
-    except GetDataFromTokenError:
-        raise HTTPException(status_code=400, detail="Error getting data from token")
     except UserNotFoundError as e:
         raise HTTPException(
             status_code=404, detail=f"User with id '{user_id}' not found."
         )
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
+    except UpstreamError as e:
+        raise upstream_failed(e)
+    except BadRequestError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid role provided. Possible roles are 'student' or 'teacher'.",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"An unexpected error occurred: {str(e)}"
+        )
+
+
+@router.patch("/block", response_model=BulkResponse)
+async def block_users(
+    body: BulkBlockUserRequest,
+    user: User = Depends(get_current_user),
+    service: IAMService = Depends(get_iam_service),
+):
+    try:
+        results = await service.block_users(body.user_ids, body.to_block)
+        return BulkResponse(results=results)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"An unexpected error occurred: {str(e)}"
+        )
+
+
+@router.patch("/change_role", response_model=BulkResponse)
+async def change_users_role(
+    body: BulkChangeRoleRequest,
+    user: User = Depends(get_current_user),
+    service: IAMService = Depends(get_iam_service),
+):
+    try:
+        results = await service.change_roles(body.user_ids, body.rol)
+        return BulkResponse(results=results)
     except BadRequestError:
         raise HTTPException(
             status_code=400,
@@ -145,20 +279,83 @@ async def change_user_role(
 
 @router.get("/users_info")
 async def get_users_info(
-    token: str = Depends(oauth2_scheme),
+    request: Request,
+    cursor: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=1000),
+    user: User = Depends(get_current_user),
     service: AdminService = Depends(get_admin_service),
 ):
+    # NDJSON is a different representation of the same data, so it gets its
+    # own validator; 304s are answered before anything is fetched or encoded.
+    ndjson_requested = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    variant = "nd" if limit is None and ndjson_requested else ""
+    etag = variant_etag(service.current_etag(cursor, limit), variant)
+    if etag_matches(request, etag):
+        return not_modified(etag, {"Vary": "Accept"})
     try:
-        user = decode_token(token)
-        await service.get_users_info()
-        return await service.get_users_info()
-    except GetDataFromTokenError:
-        raise HTTPException(status_code=400, detail="Error getting data from token")
+        if limit is not None:
+            page = [item async for item in service.get_users_info(cursor, limit)]
+            headers = response_headers(service)
+            if service.next_cursor is not None:
+                headers["X-Next-Cursor"] = str(service.next_cursor)
+            return models_response(page, GetUserInfoResponse, headers=headers)
+        items = await prime(service.get_users_info(cursor))
     except AdminNotFoundError as e:
         raise HTTPException(
             status_code=404, detail=f"Admin with id '{e.creator_id}' not found."
         )
+    except UpstreamTimeoutError as e:
+        raise HTTPException(
+            status_code=504, detail=f"Upstream '{e.upstream}' did not answer in time."
+        )
+    except UpstreamUnavailableError as e:
+        raise upstream_unavailable(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"An unexpected error occurred: {str(e)}"
+        )
+    headers = response_headers(service, variant)
+    headers["Vary"] = "Accept"
+    if variant:
+        return StreamingResponse(
+            ndjson(items), media_type=NDJSON_MEDIA_TYPE, headers=headers
+        )
+    return StreamingResponse(
+        json_array(items), media_type="application/json", headers=headers
+    )
+
+
+@router.get("/logs")
+async def get_logs(
+    request: Request,
+    user_id: str | None = None,
+    action: ActionEnum | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    user: User = Depends(get_current_user),
+    service: IAMService = Depends(get_iam_service),
+):
+    filters = {
+        "user_id": user_id,
+        "action": action.value if action else None,
+        "since": since,
+        "until": until,
+    }
+    try:
+        etag = await service.logs_etag()
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        items = await prime(service.get_logs(filters, cursor, limit))
+    except BadRequestError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"An unexpected error occurred: {str(e)}"
         )
+    return StreamingResponse(
+        json_page(items, lambda: service.next_cursor),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
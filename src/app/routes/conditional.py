@@ -0,0 +1,27 @@
+from fastapi import Request, Response
+
+
+def _opaque(tag: str) -> str:
+    # If-None-Match uses the weak comparison: W/"x" matches "x".
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str | None) -> bool:
+    header = request.headers.get("if-none-match")
+    if etag is None or not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def variant_etag(etag: str | None, variant: str) -> str | None:
+    # Distinct validator per representation (e.g. JSON vs NDJSON) of the same data.
+    if etag is None or not variant:
+        return etag
+    return f'{etag[:-1]}-{variant}"'
+
+
+def not_modified(etag: str, headers: dict[str, str] | None = None) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, **(headers or {})})
@@ -0,0 +1,45 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.app.cache.user_info_cache import get_user_info_cache
+from src.app.db.db_client import pool_stats
+from src.app.metrics.registry import REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+USERS_INFO_CACHE_EVENTS = REGISTRY.counter(
+    "users_info_cache_events_total",
+    "users_info cache lookups and evictions.",
+    ("event",),
+)
+MONGO_POOL_CONNECTIONS = REGISTRY.gauge(
+    "mongo_pool_connections",
+    "Mongo connections across all servers by state.",
+    ("state",),
+)
+
+
+def collect_cache_stats() -> None:
+    stats = get_user_info_cache().stats()
+    for event in ("hits", "misses", "evictions"):
+        USERS_INFO_CACHE_EVENTS.set(event, value=stats[event])
+
+
+def collect_pool_stats() -> None:
+    # Summed over servers: /metrics is unauthenticated, and server addresses
+    # are internal (the per-server breakdown is on the authenticated
+    # /stats/db_pool).
+    servers = pool_stats.stats().values()
+    for state in ("open", "in_use", "waiting"):
+        total = sum(counters.get(state, 0) for counters in servers)
+        MONGO_POOL_CONNECTIONS.set(state, value=total)
+
+
+REGISTRY.add_collector(collect_cache_stats)
+REGISTRY.add_collector(collect_pool_stats)
+
+
+@router.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,49 @@
+import json
+from functools import lru_cache
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+@lru_cache
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+class FastJSONResponse(JSONResponse):
+    # Renders plain dicts/lists with orjson (stdlib json when it is missing)
+    # and lists of models in one pydantic-core pass via `adapter`, skipping
+    # FastAPI's jsonable_encoder round trip.
+    def __init__(
+        self, content: Any, adapter: TypeAdapter | None = None, **kwargs
+    ) -> None:
+        self.adapter = adapter
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.adapter is not None:
+            return self.adapter.dump_json(content)
+        return dumps(content)
+
+
+def models_response(items: list[BaseModel], model: type[BaseModel], **kwargs):
+    return FastJSONResponse(items, adapter=list_adapter(model), **kwargs)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from src.app.cache.user_info_cache import get_user_info_cache
+from src.app.db.db_client import get_db, pool_stats
+from src.app.db.indexes import diff_indexes
+from src.app.security.security import get_current_user
+
+# Pool addresses and the index layout are internal, so every stats route
+# requires the same admin token as /admin.
+router = APIRouter(tags=["stats"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/users_info_cache", summary="users_info cache counters")
+async def users_info_cache_stats() -> dict[str, int]:
+    return get_user_info_cache().stats()
+
+
+@router.get("/indexes", summary="Missing and unregistered indexes")
+async def index_report(db=Depends(get_db)) -> dict[str, dict[str, list[str]]]:
+    return await diff_indexes(db)
+
+
+@router.get("/db_pool", summary="Mongo connection pool counters per server")
+async def db_pool_stats() -> dict[str, dict[str, int]]:
+    return pool_stats.stats()
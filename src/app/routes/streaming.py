@@ -0,0 +1,69 @@
+import json
+from typing import AsyncIterator, Callable
+from pydantic import BaseModel
+from src.app.routes.responses import list_adapter
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CHUNK_SIZE = 256
+
+
+async def prime(items: AsyncIterator) -> AsyncIterator:
+    # Pulls the first item before the response starts, so upstream failures
+    # still map to a proper HTTP error instead of a truncated body.
+    try:
+        first = await anext(items)
+    except StopAsyncIteration:
+        first = None
+        items = None
+
+    async def chained():
+        if items is None:
+            return
+        yield first
+        async for item in items:
+            yield item
+
+    return chained()
+
+
+async def chunks(
+    items: AsyncIterator[BaseModel], size: int = CHUNK_SIZE
+) -> AsyncIterator[list[BaseModel]]:
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def dump_chunk(chunk: list[BaseModel]) -> bytes:
+    # One pydantic-core call per chunk instead of one per item.
+    return list_adapter(type(chunk[0])).dump_json(chunk)
+
+
+async def json_array(items: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    yield b"["
+    separator = b""
+    async for chunk in chunks(items):
+        yield separator + dump_chunk(chunk)[1:-1]
+        separator = b","
+    yield b"]"
+
+
+async def ndjson(items: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    async for chunk in chunks(items):
+        yield b"".join(item.model_dump_json().encode() + b"\n" for item in chunk)
+
+
+async def json_page(
+    items: AsyncIterator[BaseModel], next_cursor: Callable[[], str | None]
+) -> AsyncIterator[str]:
+    # {"items": [...], "next_cursor": ...}; the cursor is only known once the
+    # items have been consumed, so it is written last.
+    yield b'{"items":'
+    async for chunk in json_array(items):
+        yield chunk
+    yield f',"next_cursor":{json.dumps(next_cursor())}}}'.encode()
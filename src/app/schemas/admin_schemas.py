@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field
 
 
 class RegisterRequest(BaseModel):
@@ -24,10 +25,38 @@ class ChangeRoleRequest(BaseModel):
     rol: str
 
 
+class BulkBlockUserRequest(BaseModel):
+    user_ids: list[str] = Field(min_length=1, max_length=1000)
+    to_block: bool
+
+
+class BulkChangeRoleRequest(BaseModel):
+    user_ids: list[str] = Field(min_length=1, max_length=1000)
+    rol: str
+
+
+class BulkUserResult(BaseModel):
+    user_id: str
+    status: str
+    detail: str | None = None
+
+
+class BulkResponse(BaseModel):
+    results: list[BulkUserResult]
+
+
 class GetUserInfoResponse(BaseModel):
     id: str
     name: str
     last_name: str
     email: EmailStr
     role: str
-    is_locked: bool
+    # None when the users_info join mode is "left" and auth has no entry.
+    is_locked: bool | None
+
+
+class LogEntryResponse(BaseModel):
+    id: str
+    user_id: str
+    action: str
+    timestamp: datetime
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from src.app.config.config import get_settings
+from src.app.metrics.registry import REGISTRY
+
+_settings = get_settings()
+
+SCHEMES = ("bcrypt", "argon2")
+BCRYPT_MAX_ROUNDS = 31
+CALIBRATION_PASSWORD = "calibration-password"
+
+PASSWORD_HASH_COST = REGISTRY.gauge(
+    "password_hash_cost",
+    "Cost of new password hashes: bcrypt rounds or argon2 time cost.",
+    ("scheme",),
+)
+PASSWORD_HASH_ESTIMATE = REGISTRY.gauge(
+    "password_hash_estimated_seconds",
+    "Estimated time to hash one password at the current cost on this host.",
+    ("scheme",),
+)
+PASSWORD_REHASHES = REGISTRY.counter(
+    "password_rehashes_total",
+    "Outdated password hashes rehashed after a successful login, by outcome.",
+    ("outcome",),
+)
+
+
+@dataclass(frozen=True)
+class HashPolicy:
+    # What new hashes are created with. Hashes made with the other scheme or
+    # with a lower cost still verify, but are reported as needing an update.
+    # Frozen and picklable, so it can be handed to process-pool workers.
+    scheme: str
+    cost: int
+    memory_cost: int = 65536
+    parallelism: int = 1
+
+    def context(self):
+        return build_context(self)
+
+    def needs_update(self, hashed: str) -> bool:
+        try:
+            return self.context().needs_update(hashed)
+        except ValueError:
+            # Not a hash any configured scheme recognises.
+            return False
+
+
+@lru_cache
+def build_context(policy: HashPolicy):
+    # passlib is imported here so that importing the app does not load it.
+    from passlib.context import CryptContext
+
+    if policy.scheme not in SCHEMES:
+        raise ValueError(f"Unknown password hash scheme '{policy.scheme}'")
+    schemes = [policy.scheme] + [s for s in SCHEMES if s != policy.scheme]
+    options = {
+        f"{policy.scheme}__default_rounds": policy.cost,
+        f"{policy.scheme}__min_rounds": policy.cost,
+    }
+    if policy.scheme == "argon2":
+        options["argon2__memory_cost"] = policy.memory_cost
+        options["argon2__parallelism"] = policy.parallelism
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+
+def measure(policy: HashPolicy, samples: int = 2) -> float:
+    # Best of a few runs, so a scheduling hiccup does not skew the result.
+    context = policy.context()
+    best = math.inf
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash(CALIBRATION_PASSWORD)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate(
+    base: HashPolicy, budget: float, timer=measure
+) -> tuple[HashPolicy, float]:
+    # Returns the policy and its estimated hashing time. `base.cost` is the
+    # floor: the policy never goes below it, even when one hash at that cost
+    # already exceeds the budget. bcrypt time doubles with each round; argon2
+    # time grows linearly with its time cost.
+    elapsed = timer(base)
+    if elapsed >= budget:
+        logging.warning(
+            f"{base.scheme} at cost {base.cost} takes {elapsed:.3f}s, "
+            f"over the {budget:.3f}s hashing budget"
+        )
+        return base, elapsed
+    if base.scheme == "bcrypt":
+        cost = min(base.cost + int(math.log2(budget / elapsed)), BCRYPT_MAX_ROUNDS)
+        estimate = elapsed * 2 ** (cost - base.cost)
+    else:
+        cost = int(base.cost * budget / elapsed)
+        estimate = elapsed * cost / base.cost
+    policy = HashPolicy(base.scheme, cost, base.memory_cost, base.parallelism)
+    return policy, estimate
+
+
+def configured_policy() -> HashPolicy:
+    return HashPolicy(
+        scheme=_settings.hash_scheme,
+        cost=(
+            _settings.hash_bcrypt_rounds
+            if _settings.hash_scheme == "bcrypt"
+            else _settings.hash_argon2_time_cost
+        ),
+        memory_cost=_settings.hash_argon2_memory_cost,
+        parallelism=_settings.hash_argon2_parallelism,
+    )
+
+
+_policy: HashPolicy | None = None
+
+
+def get_hash_policy() -> HashPolicy:
+    global _policy
+    if _policy is None:
+        _policy = configured_policy()
+    return _policy
+
+
+async def init_hash_policy() -> HashPolicy:
+    # Picks the cost for this host at startup, off the event loop. The
+    # configured cost is the floor: calibration only ever raises it.
+    global _policy
+    if not _settings.hash_calibrate:
+        _policy = configured_policy()
+        PASSWORD_HASH_COST.set(_policy.scheme, value=_policy.cost)
+        return _policy
+    _policy, estimate = await asyncio.to_thread(
+        calibrate, configured_policy(), _settings.hash_latency_budget
+    )
+    PASSWORD_HASH_COST.set(_policy.scheme, value=_policy.cost)
+    PASSWORD_HASH_ESTIMATE.set(_policy.scheme, value=estimate)
+    logging.info(
+        f"Password hashing: {_policy.scheme} cost {_policy.cost}, ~{estimate:.3f}s"
+    )
+    return _policy
@@ -0,0 +1,70 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from src.app.config.config import get_settings
+from src.app.exceptions.exceptions import HashingPoolFullError
+
+_settings = get_settings()
+
+
+class HashingPool:
+    # Runs CPU-bound hashing off the event loop. At most `workers` calls run at
+    # once and `max_queue` more may wait; anything beyond that is rejected.
+    def __init__(self, kind: str, workers: int, max_queue: int) -> None:
+        if kind == "process":
+            self._executor: Executor = ProcessPoolExecutor(max_workers=workers)
+        elif kind == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="hashing"
+            )
+        else:
+            raise ValueError(f"Unknown hashing pool kind '{kind}'")
+        self._capacity = workers + max_queue
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn, *args):
+        if self._pending >= self._capacity:
+            raise HashingPoolFullError()
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: HashingPool | None = None
+
+
+def get_hashing_pool() -> HashingPool:
+    global _pool
+    if _pool is None:
+        _pool = HashingPool(
+            kind=_settings.hash_pool_kind,
+            workers=_settings.hash_pool_workers,
+            max_queue=_settings.hash_pool_max_queue,
+        )
+    return _pool
+
+
+def shutdown_hashing_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def _reset_after_fork() -> None:
+    # The parent's executor threads or processes do not exist in the child.
+    global _pool
+    _pool = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
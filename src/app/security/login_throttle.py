@@ -0,0 +1,149 @@
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from src.app.config.config import get_settings
+from src.app.db.db_client import get_db
+from src.app.exceptions.exceptions import LoginThrottledError
+from src.app.metrics.registry import REGISTRY
+from src.app.repositories.login_attempts_repository import LoginAttemptsRepository
+
+_settings = get_settings()
+
+LOGIN_ATTEMPTS = REGISTRY.counter(
+    "login_attempts_total",
+    "Login attempts by outcome (success, failure, throttled).",
+    ("outcome",),
+)
+LOGIN_THROTTLED = REGISTRY.counter(
+    "login_throttled_total",
+    "Logins rejected by the throttle before any password hashing, by scope.",
+    ("scope",),
+)
+
+
+class InMemoryAttemptStore:
+    # Timestamps of recent failed attempts per key. The number of keys is
+    # bounded so a flood of distinct emails cannot grow it without limit;
+    # least recently touched keys are evicted first.
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._attempts: OrderedDict[str, deque[float]] = OrderedDict()
+
+    async def count(self, key: str, since: float) -> tuple[int, float | None]:
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            return 0, None
+        while attempts and attempts[0] <= since:
+            attempts.popleft()
+        if not attempts:
+            del self._attempts[key]
+            return 0, None
+        return len(attempts), attempts[0]
+
+    async def add(self, key: str, at: float) -> float:
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            attempts = self._attempts[key] = deque()
+            while len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+        self._attempts.move_to_end(key)
+        attempts.append(at)
+        return at
+
+    async def remove(self, key: str, token: float) -> None:
+        attempts = self._attempts.get(key)
+        if attempts is not None and token in attempts:
+            attempts.remove(token)
+
+    async def clear(self, key: str) -> None:
+        self._attempts.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._attempts)
+
+
+@dataclass
+class LoginAttempt:
+    # Store key -> token of the failure recorded for it.
+    tokens: dict[str, object]
+
+
+class LoginThrottle:
+    # Sliding-window limit on failed logins per email and per client IP.
+    # An attempt is counted as failed when it is admitted and only taken back
+    # when it succeeds (or fails for a reason unrelated to the credentials),
+    # so concurrent guesses cannot all slip through before the first failure
+    # is recorded.
+    def __init__(
+        self,
+        store,
+        window: float,
+        max_per_email: int,
+        max_per_ip: int,
+        clock=time.time,
+    ) -> None:
+        self.store = store
+        self.window = window
+        self.limits = {"email": max_per_email, "ip": max_per_ip}
+        self._clock = clock
+
+    async def acquire(self, email: str, ip: str | None) -> LoginAttempt:
+        now = self._clock()
+        keys = {"email": f"email:{email.lower()}"}
+        if ip:
+            keys["ip"] = f"ip:{ip}"
+        for scope, key in keys.items():
+            count, oldest = await self.store.count(key, now - self.window)
+            if count >= self.limits[scope]:
+                LOGIN_ATTEMPTS.inc("throttled")
+                LOGIN_THROTTLED.inc(scope)
+                raise LoginThrottledError(scope, oldest + self.window - now)
+        tokens = {key: await self.store.add(key, now) for key in keys.values()}
+        return LoginAttempt(tokens)
+
+    async def failed(self, attempt: LoginAttempt) -> None:
+        LOGIN_ATTEMPTS.inc("failure")
+
+    async def succeeded(self, attempt: LoginAttempt) -> None:
+        # A successful login forgives the account's earlier failures; the
+        # client IP only gets this attempt back.
+        LOGIN_ATTEMPTS.inc("success")
+        for key, token in attempt.tokens.items():
+            if key.startswith("email:"):
+                await self.store.clear(key)
+            else:
+                await self.store.remove(key, token)
+
+    async def release(self, attempt: LoginAttempt) -> None:
+        for key, token in attempt.tokens.items():
+            await self.store.remove(key, token)
+
+
+_throttle: LoginThrottle | None = None
+
+
+def get_login_throttle() -> LoginThrottle | None:
+    global _throttle
+    if not _settings.login_throttle_enabled:
+        return None
+    if _throttle is None:
+        if _settings.login_throttle_backend == "mongo":
+            store = LoginAttemptsRepository(get_db(), _settings.login_throttle_window)
+        else:
+            store = InMemoryAttemptStore(_settings.login_throttle_max_keys)
+        _throttle = LoginThrottle(
+            store,
+            window=_settings.login_throttle_window,
+            max_per_email=_settings.login_max_failures_per_email,
+            max_per_ip=_settings.login_max_failures_per_ip,
+        )
+    return _throttle
+
+
+def _reset_after_fork() -> None:
+    global _throttle
+    _throttle = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,25 +1,51 @@
-from passlib.context import CryptContext
 import os
-from fastapi import Depends
+import time
+from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from src.app.exceptions.exceptions import GetDataFromTokenError
 from src.app.entities.admin_entity import User
+from src.app.security.hashing import get_hashing_pool
+from src.app.security.hash_policy import HashPolicy, get_hash_policy
+from src.app.security.token_cache import get_token_cache
+from src.app.metrics.metrics import PASSWORD_HASH_DURATION
 
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
 ALGORITHM = "HS256"
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# The policy is passed explicitly to the hashing pool so that process workers
+# hash with the cost calibrated in the parent.
+def hash_password(password: str, policy: HashPolicy | None = None) -> str:
+    return (policy or get_hash_policy()).context().hash(password)
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
 
+def verify_password(plain: str, hashed: str, policy: HashPolicy | None = None) -> bool:
+    return (policy or get_hash_policy()).context().verify(plain, hashed)
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+
+async def hash_password_async(password: str, operation: str = "hash") -> str:
+    start = time.perf_counter()
+    try:
+        return await get_hashing_pool().run(hash_password, password, get_hash_policy())
+    finally:
+        PASSWORD_HASH_DURATION.observe(operation, value=time.perf_counter() - start)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    start = time.perf_counter()
+    try:
+        return await get_hashing_pool().run(
+            verify_password, plain, hashed, get_hash_policy()
+        )
+    finally:
+        PASSWORD_HASH_DURATION.observe("verify", value=time.perf_counter() - start)
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    return get_hash_policy().needs_update(hashed)
 
 
 def create_access_token(id: str, email: str) -> str:
@@ -29,12 +55,33 @@ def create_access_token(id: str, email: str) -> str:
 
 
 def decode_token(token: str) -> User:
+    return _decode_token(token)[0]
+
+
+def decode_token_cached(token: str) -> User:
+    cache = get_token_cache()
+    user = cache.get(token)
+    if user is None:
+        user, exp = _decode_token(token)
+        cache.put(token, user, exp)
+    return user
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    try:
+        return decode_token_cached(token)
+    except GetDataFromTokenError:
+        raise HTTPException(status_code=400, detail="Error getting data from token")
+
+
+def _decode_token(token: str) -> tuple[User, float | None]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         id = payload.get("id")
         email = payload.get("email")
         if id is None or email is None:
             raise GetDataFromTokenError()
-        return User(id=str(id), email=str(email))
+        exp = payload.get("exp")
+        return User(id=str(id), email=str(email)), exp
     except JWTError:
         raise GetDataFromTokenError()
@@ -0,0 +1,68 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from src.app.config.config import get_settings
+from src.app.entities.admin_entity import User
+
+_settings = get_settings()
+
+
+class TokenCache:
+    # LRU of already verified tokens keyed by their SHA-256 digest. An entry
+    # never outlives the token's own `exp` claim.
+    def __init__(self, max_size: int, ttl: float, clock=time.time) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[bytes, tuple[User, float]] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> User | None:
+        key = self.key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user
+
+    def put(self, token: str, user: User, exp: float | None = None) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = self._clock() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        self._entries[self.key(token)] = (user, expires_at)
+        self._entries.move_to_end(self.key(token))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: TokenCache | None = None
+
+
+def get_token_cache() -> TokenCache:
+    global _cache
+    if _cache is None:
+        _cache = TokenCache(
+            max_size=_settings.token_cache_size, ttl=_settings.token_cache_ttl
+        )
+    return _cache
+
+
+def _reset_after_fork() -> None:
+    global _cache
+    _cache = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,83 @@
+import argparse
+import os
+import tempfile
+from src.app.config.config import Settings, get_settings
+
+APP = "src.app.main:app"
+
+
+def worker_count(workers: int) -> int:
+    # WORKERS=0 means one worker per CPU core.
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def share_cache_generation(workers: int) -> None:
+    # Workers read settings from the environment, so a default shared cache
+    # generation file set here is picked up by every worker.
+    if workers > 1 and not get_settings().users_info_cache_shared_path:
+        path = os.path.join(tempfile.gettempdir(), f"backoffice-{os.getpid()}.gen")
+        os.environ["USERS_INFO_CACHE_SHARED_PATH"] = path
+        get_settings.cache_clear()
+
+
+def uvicorn_options(settings: Settings, workers: int) -> dict:
+    return {
+        "host": settings.host,
+        "port": settings.port,
+        "workers": workers,
+        "log_level": settings.log_level.lower(),
+        "timeout_graceful_shutdown": settings.worker_timeout,
+    }
+
+
+def gunicorn_options(settings: Settings, workers: int) -> dict:
+    return {
+        "bind": f"{settings.host}:{settings.port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "graceful_timeout": settings.worker_timeout,
+        "loglevel": settings.log_level.lower(),
+    }
+
+
+def run_uvicorn(app: str, settings: Settings, workers: int) -> None:
+    import uvicorn
+
+    uvicorn.run(app, **uvicorn_options(settings, workers))
+
+
+def run_gunicorn(app: str, settings: Settings, workers: int) -> None:
+    # gunicorn is optional; it forks workers from a master process, which is
+    # why every singleton resets itself in os.register_at_fork hooks.
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in gunicorn_options(settings, workers).items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from gunicorn.util import import_app
+
+            return import_app(app)
+
+    Application().run()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the BackOffice API.")
+    parser.add_argument("--app", default=APP)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    workers = worker_count(settings.workers if args.workers is None else args.workers)
+    share_cache_generation(workers)
+    if settings.worker_backend == "gunicorn":
+        run_gunicorn(args.app, settings, workers)
+    else:
+        run_uvicorn(args.app, settings, workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,243 @@
+import asyncio
+import logging
+import time
 from src.app.repositories.admin_repository import AdminRepository
 from src.app.exceptions.exceptions import (
     AdminNotFoundError,
-    AdminAlreadyExistsError,
     WrongPasswordError,
+    UpstreamTimeoutError,
 )
-from src.app.security.security import hash_password, verify_password
-from src.app.externals.auth_external import get_user_info_auth, get_user_info_users
+from src.app.security.security import (
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from src.app.security.hash_policy import PASSWORD_REHASHES
+from src.app.externals.auth_external import (
+    get_user_info_auth,
+    get_user_info_users,
+    iter_pages,
+)
+from src.app.externals.http_client import HTTPClientPool, get_http_pool
 from src.app.schemas.admin_schemas import GetUserInfoResponse
+from src.app.cache.user_info_cache import UserInfoCache, get_user_info_cache
+from src.app.services.user_join import LockIndex, join_users, LEFT
+from src.app.repositories.user_directory_repository import UserDirectoryRepository
+from src.app.security.login_throttle import LoginThrottle
+from src.app.config.config import get_settings
+
+_settings = get_settings()
+
+# Background rehashes in flight, by admin id. Holding the tasks here also keeps
+# them from being garbage collected before they finish.
+_rehashes: dict[str, asyncio.Task] = {}
+
+
+async def gather_or_cancel(*coros):
+    # Like asyncio.gather, but the first failure cancels the sibling tasks.
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def schedule_rehash(repository: AdminRepository, admin, password: str) -> None:
+    if admin.id in _rehashes:
+        return
+    task = asyncio.create_task(rehash_password(repository, admin, password))
+    _rehashes[admin.id] = task
+    task.add_done_callback(lambda _: _rehashes.pop(admin.id, None))
+
+
+async def rehash_password(repository: AdminRepository, admin, password: str) -> None:
+    # The update only applies if the stored hash is still the one verified,
+    # so a concurrent password change is never overwritten.
+    try:
+        new_hash = await hash_password_async(password, operation="rehash")
+        updated = await repository.update_password_hash(
+            admin.id, admin.hashed_password, new_hash
+        )
+    except Exception as e:
+        PASSWORD_REHASHES.inc("failed")
+        logging.warning(f"Could not rehash password of admin '{admin.id}': {e!r}")
+        return
+    PASSWORD_REHASHES.inc("updated" if updated else "conflict")
 
 
 class AdminService:
-    def __init__(self, repository: AdminRepository) -> None:
+    def __init__(
+        self,
+        repository: AdminRepository,
+        http: HTTPClientPool | None = None,
+        cache: UserInfoCache | None = None,
+        directory: UserDirectoryRepository | None = None,
+        throttle: LoginThrottle | None = None,
+    ) -> None:
         self.repository = repository
+        self.http = http or get_http_pool()
+        self.cache = cache or get_user_info_cache()
+        self.directory = directory
+        self.throttle = throttle
+        self.next_cursor: int | None = None
+        self.upstream_timings: dict[str, float] = {}
+        self.data_age: float | None = None
+        self.etag: str | None = None
 
     async def create_admin(self, new_email: str, new_password: str, creator_id: str):
+        # The unique index on admin.email rejects duplicates atomically on insert.
         await self.assertAdminIDExist(creator_id)
-        await self.assertAdminEmailNotExist(new_email)
-        password_hashed = hash_password(new_password)
+        password_hashed = await hash_password_async(new_password)
         return await self.repository.create(new_email, password_hashed, creator_id)
         # return await self.repository.create(new_email, new_password, creator_id)
 
-    async def login_admin(self, email: str, password: str):
+    async def login_admin(
+        self, email: str, password: str, client_ip: str | None = None
+    ):
+        if self.throttle is None:
+            return await self.authenticate(email, password)
+        # Throttled attempts are rejected before the lookup and the hashing.
+        attempt = await self.throttle.acquire(email, client_ip)
+        try:
+            admin = await self.authenticate(email, password)
+        except (AdminNotFoundError, WrongPasswordError):
+            await self.throttle.failed(attempt)
+            raise
+        except BaseException:
+            await self.throttle.release(attempt)
+            raise
+        await self.throttle.succeeded(attempt)
+        return admin
+
+    async def authenticate(self, email: str, password: str):
         admin = await self.repository.get_by_email(email)
         if not admin:
             raise AdminNotFoundError(email)
         await self.assertCorrectPassword(email, password, admin)
+        # Hashes made with an older scheme or cost are upgraded after the
+        # response, while the plain password is still at hand.
+        if password_needs_rehash(admin.hashed_password):
+            schedule_rehash(self.repository, admin, password)
         return admin
 
     async def assertCorrectPassword(self, email, password, admin):
-        if not verify_password(password, admin.hashed_password):
+        if not await verify_password_async(password, admin.hashed_password):
             # if not password == admin.hashed_password:
             raise WrongPasswordError(email)
 
-    async def assertAdminEmailNotExist(self, email):
-        if await self.repository.get_by_email(email):
-            raise AdminAlreadyExistsError(email)
-
     async def assertAdminIDExist(self, other_id):
         if not await self.repository.get_by_id(other_id):
             raise AdminNotFoundError(other_id)
 
-    async def get_users_info(self):
-        auth_list = await get_user_info_auth()
-        user_list = await get_user_info_users()
-        auth_dict = {entry["id"]: entry["is_locked"] for entry in auth_list}
-        responses = [
-            GetUserInfoResponse(**user, is_locked=auth_dict[user["id"]])
-            for user in user_list
-            if user["id"] in auth_dict
-        ]
-        return responses
+    async def get_users_info(self, cursor: int = 0, limit: int | None = None):
+        key = (cursor, limit)
+        view = self.cache.get(key)
+        if view is None:
+            view = self.cache.get_stale(key)
+            if view is not None:
+                self.cache.refresh(key, lambda: self.refetch(cursor, limit))
+        if view is not None:
+            self.next_cursor = view.next_cursor
+            self.data_age = self.cache.age(view)
+            self.etag = self.cache.etag(view)
+            for item in view.items:
+                yield item
+            return
+
+        generation = self.cache.generation
+        collected = [] if self.cache.enabled else None
+        async for item in self.fetch_users_info(cursor, limit):
+            if collected is not None:
+                collected.append(item)
+                if len(collected) > self.cache.max_items:
+                    collected = None
+            yield item
+        if collected is not None:
+            self.cache.put(key, collected, self.next_cursor, generation)
+            self.etag = self.current_etag(cursor, limit)
+
+    def current_etag(self, cursor: int = 0, limit: int | None = None) -> str | None:
+        view = self.cache.peek((cursor, limit))
+        return None if view is None else self.cache.etag(view)
+
+    async def refetch(self, cursor: int, limit: int | None):
+        # Runs on its own service so it never touches this request's cursor.
+        service = AdminService(self.repository, self.http, self.cache, self.directory)
+        items = [item async for item in service.fetch_users_info(cursor, limit)]
+        return items, service.next_cursor
+
+    def build_user_info(self):
+        # Upstream rows are validated unless they are configured as trusted.
+        if _settings.users_info_trust_upstream:
+            return GetUserInfoResponse.model_construct
+        return GetUserInfoResponse
+
+    async def fetch_users_info(self, cursor: int = 0, limit: int | None = None):
+        if self.directory is not None:
+            async for item in self.read_directory(cursor, limit):
+                yield item
+            return
+        # Only the columnar id -> is_locked index is held in memory; users are
+        # fetched page by page and joined as they arrive. The auth index and
+        # the first users page are fetched concurrently.
+        page_size = _settings.upstream_page_size
+        users_pages = iter_pages(
+            get_user_info_users, self.http, page_size, offset=cursor, limit=limit
+        )
+        locked, page = await gather_or_cancel(
+            self.timed("auth", self.load_lock_index(), _settings.auth_fetch_timeout),
+            self.timed(
+                "users", anext(users_pages, None), _settings.users_fetch_timeout
+            ),
+        )
+
+        build = self.build_user_info()
+        join_mode = _settings.users_info_join_mode
+        consumed = 0
+        self.next_cursor = None
+        while page is not None:
+            consumed += len(page)
+            for user, is_locked in join_users(page, locked, join_mode):
+                yield build(**user, is_locked=is_locked)
+            page = await self.timed(
+                "users", anext(users_pages, None), _settings.users_fetch_timeout
+            )
+        if limit is not None and consumed == limit:
+            self.next_cursor = cursor + consumed
+        logging.debug(f"users_info upstream timings: {self.upstream_timings}")
+
+    async def read_directory(self, cursor: int, limit: int | None):
+        # Indexed local query over the synced user directory.
+        build = self.build_user_info()
+        left_join = _settings.users_info_join_mode == LEFT
+        count = 0
+        self.next_cursor = None
+        async for user in self.directory.find_users(cursor, limit, left_join):
+            count += 1
+            yield build(**user)
+        if limit is not None and count == limit:
+            self.next_cursor = cursor + count
+
+    async def load_lock_index(self) -> LockIndex:
+        locked = LockIndex()
+        async for page in iter_pages(
+            get_user_info_auth, self.http, _settings.upstream_page_size
+        ):
+            locked.add_page(page)
+        return locked.freeze()
+
+    async def timed(self, upstream: str, awaitable, timeout: float):
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                return await awaitable
+        except TimeoutError:
+            raise UpstreamTimeoutError(upstream)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.upstream_timings[upstream] = (
+                self.upstream_timings.get(upstream, 0.0) + elapsed
+            )
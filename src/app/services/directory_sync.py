@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from src.app.config.config import get_settings
+from src.app.externals.auth_external import fetch_listing_changes
+from src.app.db.db_client import get_db
+from src.app.externals.http_client import HTTPClientPool, get_http_pool
+from src.app.metrics.registry import REGISTRY
+from src.app.repositories.user_directory_repository import UserDirectoryRepository
+from src.app.repositories.sync_lease_repository import SyncLeaseRepository
+
+_settings = get_settings()
+
+UPSTREAMS = ("auth", "users")
+LEASE = "user_directory"
+
+USER_DIRECTORY_SYNC_DURATION = REGISTRY.histogram(
+    "user_directory_sync_duration_seconds",
+    "Time to sync one upstream listing into the user directory.",
+    ("upstream", "kind"),
+)
+USER_DIRECTORY_SYNC_ROWS = REGISTRY.counter(
+    "user_directory_sync_rows_total",
+    "Rows received from upstream listings by the directory sync.",
+    ("upstream",),
+)
+USER_DIRECTORY_SYNC_BYTES = REGISTRY.counter(
+    "user_directory_sync_bytes_total",
+    "Response bytes received from upstream listings by the directory sync.",
+    ("upstream",),
+)
+USER_DIRECTORY_SYNC_NOT_MODIFIED = REGISTRY.counter(
+    "user_directory_sync_not_modified_total",
+    "Directory syncs answered with 304 Not Modified.",
+    ("upstream",),
+)
+USER_DIRECTORY_SYNC_FAILURES = REGISTRY.counter(
+    "user_directory_sync_failures_total",
+    "Failed directory syncs.",
+    ("upstream",),
+)
+USER_DIRECTORY_SYNC_LAG = REGISTRY.gauge(
+    "user_directory_sync_lag_seconds",
+    "Seconds since the user directory last completed a sync of both upstreams.",
+)
+USER_DIRECTORY_SYNC_LEADER = REGISTRY.gauge(
+    "user_directory_sync_leader",
+    "1 when this process holds the directory sync lease, else 0.",
+)
+
+
+@dataclass
+class UpstreamSyncState:
+    etag: str | None = None
+    watermark: datetime | None = None
+
+
+class DirectorySync:
+    # Keeps the local user directory fresh. Every `interval` seconds each
+    # upstream is asked only for rows updated since the previous sync (minus
+    # `overlap` for clock skew) with If-None-Match; every `full_every` cycles,
+    # and on the first one, the whole listing is fetched and entries the
+    # upstream no longer returns are swept.
+    #
+    # With a `lease`, only the process holding it syncs, so several workers
+    # (or hosts) do not all hit the upstreams and write the same collection.
+    # The others follow: they take the leader's last success as their own, so
+    # they serve reads from the directory too, and take over when the leader
+    # stops renewing the lease.
+    def __init__(
+        self,
+        repository: UserDirectoryRepository,
+        http: HTTPClientPool,
+        interval: float,
+        full_every: int,
+        overlap: float,
+        lease: SyncLeaseRepository | None = None,
+        lease_ttl: float = 0.0,
+    ) -> None:
+        self.repository = repository
+        self.http = http
+        self.interval = interval
+        self.full_every = full_every
+        self.overlap = timedelta(seconds=overlap)
+        self.lease = lease
+        self.lease_ttl = lease_ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.leader = lease is None
+        self.states = {upstream: UpstreamSyncState() for upstream in UPSTREAMS}
+        self.cycles = 0
+        self.last_success: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.last_success is not None
+
+    def lag(self) -> float | None:
+        return None if self.last_success is None else time.time() - self.last_success
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logging.error(f"User directory sync failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def run_cycle(self) -> None:
+        if self.lease is None:
+            await self.sync_once()
+            return
+        leader = await self.lease.acquire(LEASE, self.owner, self.lease_ttl)
+        if leader and not self.leader:
+            # Another process may have synced meanwhile: start over with a
+            # full sync rather than trusting this process's old watermarks.
+            logging.info("Acquired the user directory sync lease")
+            self.states = {upstream: UpstreamSyncState() for upstream in UPSTREAMS}
+            self.cycles = 0
+        self.leader = leader
+        USER_DIRECTORY_SYNC_LEADER.set(value=int(leader))
+        if leader:
+            await self.sync_once()
+            await self.lease.record_success(LEASE, self.owner, self.last_success)
+        else:
+            self.last_success = await self.lease.last_success(LEASE)
+
+    async def sync_once(self) -> None:
+        full = self.cycles % self.full_every == 0
+        await asyncio.gather(
+            *(self.sync_upstream(upstream, full) for upstream in UPSTREAMS)
+        )
+        self.cycles += 1
+        self.last_success = time.time()
+
+    async def sync_upstream(self, upstream: str, full: bool) -> None:
+        state = self.states[upstream]
+        started = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        try:
+            changes = await fetch_listing_changes(
+                upstream,
+                self.http,
+                etag=None if full else state.etag,
+                updated_since=None if full else state.watermark,
+            )
+            if changes.rows is None:
+                USER_DIRECTORY_SYNC_NOT_MODIFIED.inc(upstream)
+            else:
+                await self.repository.upsert(upstream, changes.rows, started)
+                if full:
+                    await self.repository.sweep(upstream, started)
+                USER_DIRECTORY_SYNC_ROWS.inc(upstream, amount=len(changes.rows))
+                USER_DIRECTORY_SYNC_BYTES.inc(upstream, amount=changes.size)
+        except Exception:
+            USER_DIRECTORY_SYNC_FAILURES.inc(upstream)
+            raise
+        finally:
+            USER_DIRECTORY_SYNC_DURATION.observe(
+                upstream,
+                "full" if full else "incremental",
+                value=time.perf_counter() - start,
+            )
+        state.etag = changes.etag
+        state.watermark = started - self.overlap
+
+
+_sync: DirectorySync | None = None
+
+
+def get_directory_sync() -> DirectorySync | None:
+    global _sync
+    if not _settings.user_directory_enabled:
+        return None
+    if _sync is None:
+        _sync = DirectorySync(
+            UserDirectoryRepository(get_db()),
+            get_http_pool(),
+            interval=_settings.user_directory_sync_interval,
+            full_every=_settings.user_directory_full_sync_every,
+            overlap=_settings.user_directory_sync_overlap,
+            lease=SyncLeaseRepository(get_db()),
+            lease_ttl=_settings.user_directory_lease_ttl,
+        )
+    return _sync
+
+
+def get_user_directory() -> UserDirectoryRepository | None:
+    # The directory only answers reads once it has completed a sync.
+    sync = get_directory_sync()
+    if sync is None or not sync.ready:
+        return None
+    return sync.repository
+
+
+async def close_directory_sync() -> None:
+    global _sync
+    if _sync is not None:
+        await _sync.stop()
+        _sync = None
+
+
+def collect_sync_lag() -> None:
+    lag = _sync.lag() if _sync is not None else None
+    if lag is not None:
+        USER_DIRECTORY_SYNC_LAG.set(value=lag)
+
+
+REGISTRY.add_collector(collect_sync_lag)
+
+
+def _reset_after_fork() -> None:
+    global _sync
+    _sync = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,23 +1,119 @@
+import asyncio
 from src.app.externals.auth_external import block_user_auth, change_rol_auth
-from src.app.repositories.logs_repository import LogRepository
-from src.app.exceptions.exceptions import BadRequestError
+from src.app.repositories.logs_repository import LogRepository, encode_log_cursor
+from src.app.exceptions.exceptions import BadRequestError, UserNotFoundError
+from src.app.schemas.admin_schemas import BulkUserResult, LogEntryResponse
+from src.app.config.config import get_settings
+from src.app.externals.http_client import HTTPClientPool, get_http_pool
+from src.app.cache.user_info_cache import UserInfoCache, get_user_info_cache
+from src.app.repositories.user_directory_repository import UserDirectoryRepository
+
+_settings = get_settings()
 
 
 class IAMService:
-    def __init__(self, repository: LogRepository) -> None:
+    def __init__(
+        self,
+        repository: LogRepository,
+        http: HTTPClientPool | None = None,
+        cache: UserInfoCache | None = None,
+        directory: UserDirectoryRepository | None = None,
+    ) -> None:
         self.repository = repository
+        self.http = http or get_http_pool()
+        self.cache = cache or get_user_info_cache()
+        self.directory = directory
+        self.next_cursor: str | None = None
 
     async def block_user(self, user_id: str, to_block: bool):
-        await block_user_auth(user_id, to_block)
+        await block_user_auth(user_id, to_block, self.http)
+        await self.apply_changes([user_id], is_locked=to_block)
         return await self.repository.create_log(
             user_id, "block" if to_block else "unblock"
         )
 
     async def change_role(self, user_id: str, rol: str):
         await self.assertIsAPossibleRole(rol)
-        await change_rol_auth(user_id, rol)
+        await change_rol_auth(user_id, rol, self.http)
+        await self.apply_changes([user_id], role=rol)
         return await self.repository.create_log(user_id, rol)
 
+    async def apply_changes(self, user_ids: list[str], **changes) -> None:
+        # Local copies are updated right away instead of waiting for the next
+        # cache refresh or directory sync. Callers only get here once the
+        # upstream confirmed the change with a 2xx.
+        for user_id in user_ids:
+            self.cache.patch(user_id, **changes)
+        if self.directory is not None and user_ids:
+            await self.directory.patch(user_ids, **changes)
+
+    async def block_users(self, user_ids: list[str], to_block: bool):
+        return await self.apply_bulk(
+            user_ids,
+            "block" if to_block else "unblock",
+            lambda user_id: block_user_auth(user_id, to_block, self.http),
+            {"is_locked": to_block},
+        )
+
+    async def change_roles(self, user_ids: list[str], rol: str):
+        await self.assertIsAPossibleRole(rol)
+        return await self.apply_bulk(
+            user_ids,
+            rol,
+            lambda user_id: change_rol_auth(user_id, rol, self.http),
+            {"role": rol},
+        )
+
+    async def apply_bulk(self, user_ids, action, call, changes: dict):
+        # Upstream PATCHes run concurrently up to bulk_concurrency; the audit
+        # rows of the successful ones are written with a single insert_many.
+        semaphore = asyncio.Semaphore(_settings.bulk_concurrency)
+
+        async def apply(user_id: str) -> BulkUserResult:
+            async with semaphore:
+                try:
+                    await call(user_id)
+                except UserNotFoundError:
+                    return BulkUserResult(user_id=user_id, status="not_found")
+                except BadRequestError:
+                    return BulkUserResult(user_id=user_id, status="bad_request")
+                except Exception as e:
+                    return BulkUserResult(
+                        user_id=user_id, status="error", detail=str(e)
+                    )
+            return BulkUserResult(user_id=user_id, status="ok")
+
+        results = await asyncio.gather(*(apply(id) for id in dict.fromkeys(user_ids)))
+        succeeded = [result.user_id for result in results if result.status == "ok"]
+        await self.apply_changes(succeeded, **changes)
+        if succeeded:
+            await self.repository.create_logs(succeeded, action)
+        return results
+
+    async def logs_etag(self) -> str:
+        # One validator for every filter: any new log invalidates them all.
+        return f'W/"{await self.repository.change_count()}"'
+
+    async def get_logs(self, filters: dict, cursor: str | None, limit: int):
+        # One extra row is requested to know whether another page follows.
+        self.next_cursor = None
+        emitted = 0
+        last = None
+        async for log_info in self.repository.find_logs(
+            **filters, after=cursor, limit=limit + 1
+        ):
+            if emitted == limit:
+                self.next_cursor = encode_log_cursor(last)
+                return
+            emitted += 1
+            last = log_info
+            yield LogEntryResponse(
+                id=str(log_info["_id"]),
+                user_id=log_info["user_id"],
+                action=log_info["action"],
+                timestamp=log_info["timestamp"],
+            )
+
     async def assertIsAPossibleRole(self, role: str):
         possible_roles = ["student", "teacher"]
         if role not in possible_roles:
@@ -0,0 +1,53 @@
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+INNER = "inner"
+LEFT = "left"
+JOIN_MODES = (INNER, LEFT)
+
+
+class LockIndex:
+    # Columnar id -> is_locked index over the auth listing: one sorted list of
+    # ids and one byte per user, built once. Compared to a dict it holds no
+    # per-entry hash slots and is not tracked by the garbage collector.
+    __slots__ = ("_ids", "_locked", "_pending")
+
+    def __init__(self) -> None:
+        self._ids: list[str] = []
+        self._locked = bytearray()
+        self._pending: list[tuple[str, bool]] | None = []
+
+    def add_page(self, page: Iterable[dict]) -> None:
+        self._pending.extend((entry["id"], entry["is_locked"]) for entry in page)
+
+    def freeze(self) -> "LockIndex":
+        pending = self._pending
+        if pending is None:
+            return self
+        pending.sort(key=lambda pair: pair[0])
+        self._ids = [id for id, _ in pending]
+        self._locked = bytearray(locked for _, locked in pending)
+        self._pending = None
+        return self
+
+    def get(self, user_id: str) -> bool | None:
+        index = bisect_left(self._ids, user_id)
+        if index < len(self._ids) and self._ids[index] == user_id:
+            return bool(self._locked[index])
+        return None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def join_users(
+    users: Iterable[dict], index: LockIndex, mode: str = INNER
+) -> Iterator[tuple[dict, bool | None]]:
+    # Lazily pairs each users row with its lock flag. Inner mode drops users
+    # the auth service does not know; left mode keeps them with None.
+    keep_missing = mode == LEFT
+    get = index.get
+    for user in users:
+        is_locked = get(user["id"])
+        if is_locked is not None or keep_missing:
+            yield user, is_locked
@@ -0,0 +1,84 @@
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+APP_MODULE = "src.app.main"
+
+
+@dataclass
+class ImportTime:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    # Lines look like "import time:   self |  cumulative | <indent>module",
+    # where the indentation of the module name is its nesting depth.
+    times = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        stripped = name.lstrip()
+        times.append(
+            ImportTime(
+                name=stripped,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return times
+
+
+def import_times(module: str = APP_MODULE) -> list[ImportTime]:
+    # A fresh interpreter, so nothing is already imported.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def total_seconds(times: list[ImportTime], module: str = APP_MODULE) -> float:
+    return next(t.cumulative_us for t in times if t.name == module) / 1e6
+
+
+def by_package(times: list[ImportTime]) -> dict[str, int]:
+    # First-party modules are grouped one level deeper (src.app.<layer>).
+    packages: dict[str, int] = defaultdict(int)
+    for t in times:
+        parts = t.name.split(".")
+        packages[".".join(parts[:3] if parts[0] == "src" else parts[:1])] += t.self_us
+    return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Import-time profile of the app.")
+    parser.add_argument("--module", default=APP_MODULE)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    times = import_times(args.module)
+    print(f"import {args.module}: {total_seconds(times, args.module) * 1000:.1f} ms")
+
+    print("\nslowest modules (cumulative, self in ms):")
+    slowest = sorted(times, key=lambda t: t.cumulative_us, reverse=True)
+    for t in slowest[: args.top]:
+        print(f"{t.cumulative_us / 1000:9.1f} {t.self_us / 1000:9.1f}  {t.name}")
+
+    print("\nself time by top-level package (ms):")
+    for package, self_us in list(by_package(times).items())[: args.top]:
+        print(f"{self_us / 1000:9.1f}  {package}")
+
+
+if __name__ == "__main__":
+    main()
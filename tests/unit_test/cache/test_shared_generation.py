@@ -0,0 +1,31 @@
+import threading
+from src.app.cache.shared_generation import SharedGeneration
+
+
+def test_bumps_are_visible_to_every_handle_on_the_file(tmp_path):
+    path = str(tmp_path / "cache.gen")
+    first = SharedGeneration(path)
+    second = SharedGeneration(path)
+
+    assert first.value() == 0
+    assert second.bump() == 1
+    assert first.value() == 1
+    first.close()
+    second.close()
+
+
+def test_concurrent_bumps_are_not_lost(tmp_path):
+    path = str(tmp_path / "cache.gen")
+    handles = [SharedGeneration(path) for _ in range(4)]
+
+    def bump(handle):
+        for _ in range(250):
+            handle.bump()
+
+    threads = [threading.Thread(target=bump, args=(h,)) for h in handles]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert handles[0].value() == 1000
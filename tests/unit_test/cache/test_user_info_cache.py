@@ -0,0 +1,194 @@
+import asyncio
+import pytest
+from src.app.cache.user_info_cache import UserInfoCache
+from src.app.cache.shared_generation import SharedGeneration
+from src.app.schemas.admin_schemas import GetUserInfoResponse
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_user(id, is_locked=False):
+    return GetUserInfoResponse(
+        id=id,
+        name="Name",
+        last_name="Last",
+        email=f"user{id}@example.com",
+        role="student",
+        is_locked=is_locked,
+    )
+
+
+def test_get_returns_stored_view_until_ttl_expires():
+    clock = FakeClock()
+    cache = UserInfoCache(ttl=10, max_items=10, clock=clock)
+    cache.put((0, None), [make_user("1")], None, cache.generation)
+
+    assert cache.get((0, None)).items[0].id == "1"
+    clock.now = 10
+    assert cache.get((0, None)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["items"] == 0
+
+
+def test_put_evicts_least_recently_used_views():
+    cache = UserInfoCache(ttl=10, max_items=3)
+    cache.put((0, 2), [make_user("1"), make_user("2")], 2, cache.generation)
+    cache.put((2, 2), [make_user("3")], None, cache.generation)
+    cache.get((0, 2))
+    cache.put((5, 2), [make_user("6"), make_user("7")], None, cache.generation)
+
+    assert cache.get((2, 2)) is None
+    assert cache.get((0, 2)) is None
+    assert cache.get((5, 2)) is not None
+    assert cache.stats()["evictions"] == 2
+
+
+def test_put_skips_views_larger_than_bound():
+    cache = UserInfoCache(ttl=10, max_items=1)
+    cache.put((0, None), [make_user("1"), make_user("2")], None, cache.generation)
+    assert cache.stats()["views"] == 0
+
+
+def test_empty_views_count_towards_the_bound():
+    cache = UserInfoCache(ttl=10, max_items=10)
+    for i in range(1000):
+        cache.put((10**6 + i, None), [], None, cache.generation)
+
+    assert cache.stats()["views"] == 10
+
+
+def test_put_purges_expired_views():
+    clock = FakeClock()
+    cache = UserInfoCache(ttl=10, max_items=10, stale_ttl=5, clock=clock)
+    cache.put((0, None), [make_user("1")], None, cache.generation)
+    cache.put((1, None), [], None, cache.generation)
+
+    clock.now = 15
+    cache.put((2, None), [make_user("2")], None, cache.generation)
+
+    assert cache.stats()["views"] == 1
+    assert cache.stats()["evictions"] == 0
+
+
+def test_put_skips_views_fetched_before_a_write():
+    cache = UserInfoCache(ttl=10, max_items=10)
+    generation = cache.generation
+    cache.patch("1", is_locked=True)
+    cache.put((0, None), [make_user("1")], None, generation)
+    assert cache.get((0, None)) is None
+
+
+def test_patch_updates_only_the_affected_user():
+    cache = UserInfoCache(ttl=10, max_items=10)
+    cache.put((0, None), [make_user("1"), make_user("2")], None, cache.generation)
+    cache.put((1, 1), [make_user("2")], None, cache.generation)
+
+    cache.patch("2", is_locked=True)
+
+    assert [u.is_locked for u in cache.get((0, None)).items] == [False, True]
+    assert cache.get((1, 1)).items[0].is_locked is True
+
+
+def test_invalidate_drops_views_containing_user():
+    cache = UserInfoCache(ttl=10, max_items=10)
+    cache.put((0, 1), [make_user("1")], 1, cache.generation)
+    cache.put((1, 1), [make_user("2")], None, cache.generation)
+
+    cache.invalidate("1")
+
+    assert cache.get((0, 1)) is None
+    assert cache.get((1, 1)) is not None
+    cache.invalidate()
+    assert cache.stats()["views"] == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = UserInfoCache(ttl=0, max_items=10)
+    assert cache.enabled is False
+    cache.put((0, None), [make_user("1")], None, cache.generation)
+    assert cache.get((0, None)) is None
+
+
+def test_expired_view_is_kept_as_stale_snapshot():
+    clock = FakeClock()
+    cache = UserInfoCache(ttl=10, max_items=10, stale_ttl=50, clock=clock)
+    cache.put((0, None), [make_user("1")], None, cache.generation)
+
+    clock.now = 30
+    assert cache.get((0, None)) is None
+    view = cache.get_stale((0, None))
+    assert view.items[0].id == "1"
+    assert cache.age(view) == 30
+
+    clock.now = 60
+    assert cache.get_stale((0, None)) is None
+    assert cache.stats()["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_single_flight():
+    cache = UserInfoCache(ttl=10, max_items=10, stale_ttl=50)
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await release.wait()
+        return [make_user("2")], None
+
+    for _ in range(5):
+        cache.refresh((0, None), fetch)
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.sleep(0.01)
+
+    assert calls == [1]
+    assert cache.get((0, None)).items[0].id == "2"
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_snapshot():
+    clock = FakeClock()
+    cache = UserInfoCache(ttl=10, max_items=10, stale_ttl=50, clock=clock)
+    cache.put((0, None), [make_user("1")], None, cache.generation)
+    clock.now = 20
+
+    async def fetch():
+        raise RuntimeError("upstream down")
+
+    cache.refresh((0, None), fetch)
+    await asyncio.sleep(0.01)
+
+    assert cache.get_stale((0, None)).items[0].id == "1"
+
+
+def test_shared_generation_drops_views_cached_by_other_workers(tmp_path):
+    path = str(tmp_path / "cache.gen")
+    worker_a = UserInfoCache(ttl=10, max_items=10, shared=SharedGeneration(path))
+    worker_b = UserInfoCache(ttl=10, max_items=10, shared=SharedGeneration(path))
+    worker_a.put((0, None), [make_user("1")], None, worker_a.generation)
+    worker_b.put((0, None), [make_user("1")], None, worker_b.generation)
+
+    worker_a.patch("1", is_locked=True)
+
+    assert worker_a.get((0, None)).items[0].is_locked is True
+    assert worker_b.get((0, None)) is None
+
+
+def test_shared_generation_rejects_views_fetched_before_a_remote_write(tmp_path):
+    path = str(tmp_path / "cache.gen")
+    worker_a = UserInfoCache(ttl=10, max_items=10, shared=SharedGeneration(path))
+    worker_b = UserInfoCache(ttl=10, max_items=10, shared=SharedGeneration(path))
+    generation = worker_b.generation
+
+    worker_a.invalidate("1")
+    worker_b.put((0, None), [make_user("1")], None, generation)
+
+    assert worker_b.get((0, None)) is None
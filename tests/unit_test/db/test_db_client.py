@@ -0,0 +1,72 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+import src.app.db.db_client as db_client
+from src.app.db.pool_monitor import PoolStatsListener
+from src.app.metrics.metrics import MongoCommandMetrics
+
+
+def test_client_options_use_settings(monkeypatch):
+    monkeypatch.setattr(db_client._settings, "mongo_max_pool_size", 50)
+    monkeypatch.setattr(db_client._settings, "mongo_min_pool_size", 5)
+    monkeypatch.setattr(db_client._settings, "mongo_max_idle_time_ms", 60_000)
+    monkeypatch.setattr(db_client._settings, "mongo_compressors", "zstd,zlib")
+    monkeypatch.setattr(
+        db_client._settings, "mongo_read_preference", "secondaryPreferred"
+    )
+
+    options = db_client.client_options()
+
+    assert options["maxPoolSize"] == 50
+    assert options["minPoolSize"] == 5
+    assert options["maxIdleTimeMS"] == 60_000
+    assert options["compressors"] == "zstd,zlib"
+    assert options["readPreference"] == "secondaryPreferred"
+    assert options["event_listeners"][0] is db_client.pool_stats
+    assert isinstance(options["event_listeners"][1], MongoCommandMetrics)
+
+
+def test_client_options_omit_unset_values(monkeypatch):
+    monkeypatch.setattr(db_client._settings, "mongo_max_idle_time_ms", None)
+    monkeypatch.setattr(db_client._settings, "mongo_compressors", "")
+
+    options = db_client.client_options()
+
+    assert "maxIdleTimeMS" not in options
+    assert "compressors" not in options
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_issues_concurrent_pings():
+    client = MagicMock()
+    client.admin.command = AsyncMock()
+
+    await db_client.warm_pool(client, 4)
+
+    assert client.admin.command.await_count == 4
+
+
+def event(address=("localhost", 27017)):
+    return SimpleNamespace(address=address)
+
+
+def test_pool_stats_listener_tracks_connections():
+    listener = PoolStatsListener()
+    listener.pool_created(event())
+    for _ in range(2):
+        listener.connection_created(event())
+        listener.connection_check_out_started(event())
+        listener.connection_checked_out(event())
+    listener.connection_checked_in(event())
+    listener.connection_check_out_started(event())
+    listener.connection_check_out_failed(event())
+    listener.connection_closed(event())
+
+    stats = listener.stats()["localhost:27017"]
+
+    assert stats["pools_created"] == 1
+    assert stats["connections_created"] == 2
+    assert stats["open"] == 1
+    assert stats["in_use"] == 1
+    assert stats["waiting"] == 0
+    assert stats["check_out_failures"] == 1
@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+from src.app.db.indexes import (
+    INDEX_REGISTRY,
+    ensure_indexes,
+    diff_indexes,
+    prepare_indexes,
+)
+from src.app.exceptions.exceptions import MissingUniqueIndexError
+
+REGISTRY = {
+    "admin": [IndexModel([("email", 1)], unique=True, name="email_unique")],
+    "logs": [IndexModel([("user_id", 1), ("timestamp", -1)], name="user_id_timestamp")],
+}
+
+
+def make_db(collections):
+    db = MagicMock()
+    db.__getitem__.side_effect = lambda name: collections[name]
+    return db
+
+
+def test_registry_declares_expected_indexes():
+    admin = [index.document for index in INDEX_REGISTRY["admin"]]
+    logs = [index.document for index in INDEX_REGISTRY["logs"]]
+    assert {"key": {"email": 1}, "unique": True, "name": "email_unique"} in [
+        {k: doc[k] for k in ("key", "unique", "name")} for doc in admin
+    ]
+    assert any(
+        list(doc["key"].items())[:2] == [("user_id", 1), ("timestamp", -1)]
+        for doc in logs
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_creates_every_registered_index():
+    collections = {"admin": AsyncMock(), "logs": AsyncMock()}
+
+    await ensure_indexes(make_db(collections), REGISTRY)
+
+    collections["admin"].create_indexes.assert_awaited_once_with(REGISTRY["admin"])
+    collections["logs"].create_indexes.assert_awaited_once_with(REGISTRY["logs"])
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_continues_after_failure():
+    collections = {"admin": AsyncMock(), "logs": AsyncMock()}
+    collections["admin"].create_indexes.side_effect = OperationFailure("duplicates")
+
+    await ensure_indexes(make_db(collections), REGISTRY)
+
+    collections["logs"].create_indexes.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_diff_indexes_reports_missing_and_extra():
+    collections = {"admin": AsyncMock(), "logs": AsyncMock()}
+    collections["admin"].index_information.return_value = {
+        "_id_": {},
+        "email_unique": {},
+    }
+    collections["logs"].index_information.return_value = {"_id_": {}, "old_index": {}}
+
+    report = await diff_indexes(make_db(collections), REGISTRY)
+
+    assert report == {
+        "admin": {"missing": [], "extra": []},
+        "logs": {"missing": ["user_id_timestamp"], "extra": ["old_index"]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_prepare_indexes_fails_without_unique_index():
+    collections = {"admin": AsyncMock(), "logs": AsyncMock()}
+    collections["admin"].create_indexes.side_effect = OperationFailure("duplicates")
+    collections["admin"].index_information.return_value = {"_id_": {}}
+    collections["logs"].index_information.return_value = {"_id_": {}}
+
+    with pytest.raises(MissingUniqueIndexError) as excinfo:
+        await prepare_indexes(make_db(collections), REGISTRY)
+
+    assert excinfo.value.missing == {"admin": ["email_unique"]}
+
+
+@pytest.mark.asyncio
+async def test_prepare_indexes_tolerates_missing_non_unique_index():
+    collections = {"admin": AsyncMock(), "logs": AsyncMock()}
+    collections["admin"].index_information.return_value = {
+        "_id_": {},
+        "email_unique": {},
+    }
+    collections["logs"].index_information.return_value = {"_id_": {}}
+
+    await prepare_indexes(make_db(collections), REGISTRY)
@@ -1,14 +1,31 @@
+import asyncio
 import pytest
 import os
 import sys
+import httpx
 from unittest.mock import patch, MagicMock, AsyncMock
-from requests.exceptions import RequestException
-from src.app.exceptions.exceptions import UserNotFoundError, BadRequestError
+from src.app.exceptions.exceptions import (
+    UserNotFoundError,
+    BadRequestError,
+    UpstreamError,
+)
+from src.app.externals.http_client import HTTPClientPool
+from src.app.externals.circuit_breaker import reset_breakers
 import types
 
 import src.app.externals.auth_external as auth_external
 
 
+def make_pool(handler):
+    return HTTPClientPool(
+        timeout=5,
+        max_connections_per_host=10,
+        max_keepalive_per_host=5,
+        keepalive_expiry=5,
+        transport=httpx.MockTransport(handler),
+    )
+
+
 async def fake_get_auth_url():
     return "http://fake-auth-service"
 
@@ -16,6 +33,7 @@ async def fake_get_auth_url():
 @pytest.fixture(autouse=True)
 def set_env(monkeypatch):
     monkeypatch.setenv("URL_AUTH", "http://fake-auth-service")
+    reset_breakers()
     yield
 
 
@@ -34,57 +52,86 @@ async def test_get_auth_url_missing(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_send_patch_request_success():
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.text = "OK"
-    with patch(
-        "src.app.externals.auth_external.requests.patch", return_value=mock_response
-    ):
-        result = await auth_external.send_patch_request(
-            "user1", "http://fake/block/user1", {"block": True}
-        )
-        assert result is None
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return httpx.Response(200, text="OK")
+
+    result = await auth_external.send_patch_request(
+        "user1", "http://fake/block/user1", {"block": True}, make_pool(handler)
+    )
+    assert result is None
+    assert requests_seen[0].method == "PATCH"
+    assert requests_seen[0].content == b'{"block":true}'
 
 
 @pytest.mark.asyncio
 async def test_send_patch_request_404():
-    mock_response = MagicMock()
-    mock_response.status_code = 404
-    mock_response.text = "Not found"
-    with patch(
-        "src.app.externals.auth_external.requests.patch", return_value=mock_response
-    ):
-        with pytest.raises(UserNotFoundError):
-            await auth_external.send_patch_request(
-                "user2", "http://fake/block/user2", {"block": True}
-            )
+    pool = make_pool(lambda request: httpx.Response(404, text="Not found"))
+    with pytest.raises(UserNotFoundError):
+        await auth_external.send_patch_request(
+            "user2", "http://fake/block/user2", {"block": True}, pool
+        )
 
 
 @pytest.mark.asyncio
 async def test_send_patch_request_400():
-    mock_response = MagicMock()
-    mock_response.status_code = 400
-    mock_response.text = "Bad request"
-    with patch(
-        "src.app.externals.auth_external.requests.patch", return_value=mock_response
-    ):
-        with pytest.raises(BadRequestError):
-            await auth_external.send_patch_request(
-                "user3", "http://fake/block/user3", {"block": True}
-            )
+    pool = make_pool(lambda request: httpx.Response(400, text="Bad request"))
+    with pytest.raises(BadRequestError):
+        await auth_external.send_patch_request(
+            "user3", "http://fake/block/user3", {"block": True}, pool
+        )
+
+
+@pytest.mark.asyncio
+async def test_send_patch_request_accepts_any_2xx():
+    pool = make_pool(lambda request: httpx.Response(204))
+    assert (
+        await auth_external.send_patch_request(
+            "user1", "http://fake/block/user1", {"block": True}, pool
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [500, 503, 409])
+async def test_send_patch_request_raises_on_other_statuses(status):
+    pool = make_pool(lambda request: httpx.Response(status))
+    with pytest.raises(UpstreamError) as excinfo:
+        await auth_external.send_patch_request(
+            "user5", "http://fake/block/user5", {"block": True}, pool
+        )
+    assert excinfo.value.status_code == status
 
 
 @pytest.mark.asyncio
 async def test_send_patch_request_exception():
-    with patch(
-        "src.app.externals.auth_external.requests.patch",
-        side_effect=RequestException("Network error"),
-    ):
-        with pytest.raises(Exception) as excinfo:
-            await auth_external.send_patch_request(
-                "user4", "http://fake/block/user4", {"block": True}
-            )
-        assert "Auth service request failed" in str(excinfo.value)
+    def handler(request):
+        raise httpx.ConnectError("Network error")
+
+    with pytest.raises(Exception) as excinfo:
+        await auth_external.send_patch_request(
+            "user4", "http://fake/block/user4", {"block": True}, make_pool(handler)
+        )
+    assert "Auth service request failed" in str(excinfo.value)
+
+
+@pytest.mark.asyncio
+async def test_get_user_info_auth_returns_json():
+    pool = make_pool(lambda request: httpx.Response(200, json=[{"id": "1"}]))
+    result = await auth_external.get_user_info_auth(pool)
+    assert result == [{"id": "1"}]
+
+
+@pytest.mark.asyncio
+async def test_get_user_info_users_unexpected_status(monkeypatch):
+    monkeypatch.setenv("URL_USERS", "http://fake-users-service")
+    pool = make_pool(lambda request: httpx.Response(500))
+    with pytest.raises(Exception) as excinfo:
+        await auth_external.get_user_info_users(pool)
+    assert "Unexpected error" in str(excinfo.value)
 
 
 @pytest.mark.asyncio
@@ -96,9 +143,10 @@ async def test_block_user_auth_calls_send_patch(monkeypatch):
     )
     send_patch_mock = AsyncMock(return_value=None)
     monkeypatch.setattr(auth_external, "send_patch_request", send_patch_mock)
-    result = await auth_external.block_user_auth("user5", True)
+    pool = MagicMock()
+    result = await auth_external.block_user_auth("user5", True, pool)
     send_patch_mock.assert_awaited_with(
-        "user5", "http://fake-auth-service/auth/block/user5", {"block": True}
+        "user5", "http://fake-auth-service/auth/block/user5", {"block": True}, pool
     )
     assert result is None
 
@@ -112,8 +160,115 @@ async def test_change_rol_auth_calls_send_patch(monkeypatch):
     )
     send_patch_mock = AsyncMock(return_value=None)
     monkeypatch.setattr(auth_external, "send_patch_request", send_patch_mock)
-    result = await auth_external.change_rol_auth("user6", "admin")
+    pool = MagicMock()
+    result = await auth_external.change_rol_auth("user6", "admin", pool)
     send_patch_mock.assert_awaited_with(
-        "user6", "http://fake-auth-service/auth/rol/user6", {"role": "admin"}
+        "user6", "http://fake-auth-service/auth/rol/user6", {"role": "admin"}, pool
     )
     assert result is None
+
+
+def make_listing(total):
+    items = [{"id": str(i)} for i in range(total)]
+
+    async def fetch(http, offset=0, limit=None):
+        fetch.calls.append((offset, limit))
+        return items[offset : offset + limit]
+
+    fetch.calls = []
+    return fetch
+
+
+async def collect(pages):
+    return [page async for page in pages]
+
+
+@pytest.mark.asyncio
+async def test_get_user_info_auth_sends_page_params():
+    seen = []
+
+    def handler(request):
+        seen.append(dict(request.url.params))
+        return httpx.Response(200, json=[])
+
+    await auth_external.get_user_info_auth(make_pool(handler), offset=20, limit=10)
+    assert seen == [{"offset": "20", "limit": "10"}]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_walks_all_pages():
+    fetch = make_listing(5)
+    pages = await collect(auth_external.iter_pages(fetch, None, page_size=2))
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert fetch.calls == [(0, 2), (2, 2), (4, 2)]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_honours_offset_and_limit():
+    fetch = make_listing(10)
+    pages = await collect(
+        auth_external.iter_pages(fetch, None, page_size=2, offset=3, limit=3)
+    )
+    assert [item["id"] for page in pages for item in page] == ["3", "4", "5"]
+    # The head of the listing is checked once, alongside the first page.
+    assert fetch.calls == [(3, 2), (0, 1), (5, 1)]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_handles_upstream_without_pagination():
+    items = [{"id": str(i)} for i in range(5)]
+
+    async def fetch(http, offset=0, limit=None):
+        return items
+
+    pages = await collect(
+        auth_external.iter_pages(fetch, None, page_size=2, offset=1, limit=3)
+    )
+    assert pages == [items[1:4]]
+
+    pages = await collect(auth_external.iter_pages(fetch, None, page_size=5))
+    assert pages == [items]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_windows_short_listing_when_upstream_ignores_offset():
+    # The whole listing fits in one page, so only the head check reveals that
+    # the upstream ignored the offset.
+    items = [{"id": str(i)} for i in range(5)]
+
+    async def fetch(http, offset=0, limit=None):
+        return items
+
+    pages = await collect(auth_external.iter_pages(fetch, None, page_size=10, offset=3))
+    assert pages == [items[3:]]
+
+    pages = await collect(
+        auth_external.iter_pages(fetch, None, page_size=10, offset=3, limit=10)
+    )
+    assert pages == [items[3:]]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_trusts_short_page_from_paging_upstream():
+    fetch = make_listing(5)
+    pages = await collect(auth_external.iter_pages(fetch, None, page_size=10, offset=3))
+    assert [item["id"] for page in pages for item in page] == ["3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_request():
+    seen = []
+
+    async def handler(request):
+        seen.append(dict(request.url.params))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[{"id": "1"}])
+
+    pool = make_pool(handler)
+    results = await asyncio.gather(
+        *(auth_external.get_user_info_auth(pool, offset=0, limit=10) for _ in range(5)),
+        auth_external.get_user_info_auth(pool, offset=10, limit=10),
+    )
+
+    assert len(seen) == 2
+    assert results[0] == [{"id": "1"}]
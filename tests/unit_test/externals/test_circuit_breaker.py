@@ -0,0 +1,148 @@
+import httpx
+import pytest
+import src.app.externals.circuit_breaker as circuit_breaker
+from src.app.externals.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    UPSTREAM_CIRCUIT_STATE,
+    CircuitBreaker,
+    RetryBudget,
+    get_breaker,
+    guarded_request,
+    reset_breakers,
+)
+from src.app.exceptions.exceptions import UpstreamUnavailableError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    reset_breakers()
+    monkeypatch.setattr(circuit_breaker._settings, "upstream_retry_base_delay", 0)
+    yield
+    reset_breakers()
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    clock = FakeClock()
+    breaker = CircuitBreaker("svc", failure_threshold=3, reset_timeout=10, clock=clock)
+
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert UPSTREAM_CIRCUIT_STATE.value("svc") == 2
+    clock.now = 4
+    with pytest.raises(UpstreamUnavailableError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after == 6
+
+
+def test_half_open_allows_single_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker("svc", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker("svc", failure_threshold=5, reset_timeout=10, clock=clock)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now = 10
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+
+
+def test_retry_budget_limits_retries():
+    clock = FakeClock()
+    budget = RetryBudget(ratio=0.5, min_per_second=0.1, clock=clock)
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+    clock.now = 10
+    assert budget.withdraw()
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_on_transient_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json=[])
+
+    async with make_client(handler) as client:
+        response = await guarded_request(
+            "users", client, "GET", "http://users/users", retry=True
+        )
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert get_breaker("users").state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_patch_is_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("down")
+
+    async with make_client(handler) as client:
+        with pytest.raises(httpx.ConnectError):
+            await guarded_request("auth", client, "PATCH", "http://auth/auth/block/1")
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_the_network(monkeypatch):
+    monkeypatch.setattr(circuit_breaker._settings, "breaker_failure_threshold", 2)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    async with make_client(handler) as client:
+        for _ in range(2):
+            await guarded_request("auth", client, "PATCH", "http://auth/x")
+        with pytest.raises(UpstreamUnavailableError):
+            await guarded_request("auth", client, "PATCH", "http://auth/x")
+
+    assert len(calls) == 2
@@ -0,0 +1,44 @@
+import pytest
+import httpx
+import src.app.externals.http_client as http_client
+from src.app.externals.http_client import HTTPClientPool
+
+
+def make_pool():
+    return HTTPClientPool(
+        timeout=1,
+        max_connections_per_host=4,
+        max_keepalive_per_host=2,
+        keepalive_expiry=5,
+        transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_for_url_reuses_client_per_host():
+    pool = make_pool()
+    first = pool.for_url("http://auth:8000/auth/block/1")
+    second = pool.for_url("http://auth:8000/auth")
+    other = pool.for_url("http://users:8001/users")
+    assert first is second
+    assert first is not other
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_all_clients():
+    pool = make_pool()
+    client = pool.for_url("http://auth:8000/auth")
+    await pool.aclose()
+    assert client.is_closed
+    assert pool.for_url("http://auth:8000/auth") is not client
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_and_close_http_pool_singleton():
+    pool = http_client.get_http_pool()
+    assert http_client.get_http_pool() is pool
+    await http_client.close_http_pool()
+    assert http_client.get_http_pool() is not pool
+    await http_client.close_http_pool()
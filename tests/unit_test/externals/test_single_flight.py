@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from src.app.externals.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return {"value": value}
+
+    results = await asyncio.gather(*(flight.do("k", fetch, 1) for _ in range(10)))
+
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    assert await asyncio.gather(flight.do("a", fetch, 1), flight.do("b", fetch, 2)) == [
+        1,
+        2,
+    ]
+    assert sorted(calls) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared_and_not_cached():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("down")
+
+    results = await asyncio.gather(
+        flight.do("k", fetch), flight.do("k", fetch), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(calls) == 1
+
+    with pytest.raises(RuntimeError):
+        await flight.do("k", fetch)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    impatient = asyncio.create_task(flight.do("k", fetch))
+    patient = asyncio.create_task(flight.do("k", fetch))
+    await asyncio.sleep(0.01)
+    impatient.cancel()
+
+    assert await patient == "done"
+
+
+@pytest.mark.asyncio
+async def test_shared_call_is_cancelled_when_every_caller_has_gone():
+    flight = SingleFlight()
+    cancelled = []
+
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    first = asyncio.create_task(flight.do("k", fetch))
+    second = asyncio.create_task(flight.do("k", fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0.01)
+    assert cancelled == []
+
+    second.cancel()
+    await asyncio.gather(first, second, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert cancelled == [True]
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesce_decorator_keys_by_arguments():
+    flight = SingleFlight()
+    calls = []
+
+    @flight.coalesce(lambda offset, limit: (offset, limit))
+    async def page(offset, limit):
+        calls.append((offset, limit))
+        await asyncio.sleep(0.01)
+        return list(range(offset, offset + limit))
+
+    await asyncio.gather(page(0, 2), page(0, 2), page(2, 2))
+
+    assert sorted(calls) == [(0, 2), (2, 2)]
@@ -0,0 +1,61 @@
+import asyncio
+import time
+import httpx
+import pytest
+from fastapi import FastAPI
+from src.app.metrics.blocking import BlockingDetector, UNKNOWN_ROUTE, route_map
+
+
+def make_app():
+    app = FastAPI()
+
+    @app.get("/sync-sleep/{n}")
+    async def sync_sleep(n: int):
+        time.sleep(0.15)
+        return {"n": n}
+
+    @app.get("/async-sleep")
+    async def async_sleep():
+        await asyncio.sleep(0.15)
+        return {}
+
+    return app
+
+
+async def call(app, path):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        return await c.get(path)
+
+
+@pytest.mark.asyncio
+async def test_detects_blocking_route_with_stack():
+    app = make_app()
+
+    async with BlockingDetector(0.05, route_map(app)) as detector:
+        await call(app, "/sync-sleep/1")
+
+    assert detector.counts == {"/sync-sleep/{n}": 1}
+    incident = detector.incidents[0]
+    assert incident.duration >= 0.05
+    assert "time.sleep(0.15)" in incident.stack
+    with pytest.raises(AssertionError, match="sync-sleep"):
+        detector.assert_no_blocking()
+
+
+@pytest.mark.asyncio
+async def test_awaiting_route_does_not_trigger():
+    app = make_app()
+
+    async with BlockingDetector(0.05, route_map(app)) as detector:
+        await call(app, "/async-sleep")
+
+    detector.assert_no_blocking()
+
+
+@pytest.mark.asyncio
+async def test_blocking_outside_routes_is_unknown():
+    async with BlockingDetector(0.05) as detector:
+        time.sleep(0.15)
+
+    assert detector.counts == {UNKNOWN_ROUTE: 1}
@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.app.metrics.metrics import (
+    EVENT_LOOP_LAG,
+    HTTP_REQUEST_DURATION,
+    MONGO_COMMAND_FAILURES,
+    UPSTREAM_REQUEST_DURATION,
+    UPSTREAM_REQUEST_ERRORS,
+    LoopLagMonitor,
+    MetricsMiddleware,
+    MongoCommandMetrics,
+    observe_upstream,
+)
+
+
+@pytest.mark.asyncio
+async def test_observe_upstream_records_latency_and_errors():
+    @observe_upstream("test_fetch")
+    async def fetch(fail: bool):
+        if fail:
+            raise ValueError("boom")
+        return "ok"
+
+    before = UPSTREAM_REQUEST_DURATION.count("test_fetch")
+    assert await fetch(False) == "ok"
+    with pytest.raises(ValueError):
+        await fetch(True)
+
+    assert UPSTREAM_REQUEST_DURATION.count("test_fetch") == before + 2
+    assert UPSTREAM_REQUEST_ERRORS.value("test_fetch", "ValueError") >= 1
+
+
+def test_middleware_labels_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    before = HTTP_REQUEST_DURATION.count("GET", "/items/{item_id}", "200")
+    unmatched = HTTP_REQUEST_DURATION.count("GET", "unmatched", "404")
+
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+
+    assert HTTP_REQUEST_DURATION.count("GET", "/items/{item_id}", "200") == before + 2
+    assert HTTP_REQUEST_DURATION.count("GET", "unmatched", "404") == unmatched + 1
+
+
+def test_mongo_command_listener_counts_failures():
+    listener = MongoCommandMetrics()
+    before = MONGO_COMMAND_FAILURES.value("insert")
+
+    listener.failed(SimpleNamespace(command_name="insert", duration_micros=1500))
+
+    assert MONGO_COMMAND_FAILURES.value("insert") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_observes_samples():
+    monitor = LoopLagMonitor(interval=0.01)
+    before = EVENT_LOOP_LAG.count()
+
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert EVENT_LOOP_LAG.count() > before
+
+
+def test_pool_metrics_do_not_expose_server_addresses(monkeypatch):
+    from src.app.metrics.registry import REGISTRY
+    from src.app.routes import metrics as metrics_route
+
+    monkeypatch.setattr(
+        metrics_route.pool_stats,
+        "stats",
+        lambda: {
+            "10.0.0.1:27017": {"open": 2, "in_use": 1},
+            "10.0.0.2:27017": {"open": 3, "waiting": 1},
+        },
+    )
+
+    metrics_route.collect_pool_stats()
+
+    assert metrics_route.MONGO_POOL_CONNECTIONS.value("open") == 5
+    assert metrics_route.MONGO_POOL_CONNECTIONS.value("in_use") == 1
+    assert metrics_route.MONGO_POOL_CONNECTIONS.value("waiting") == 1
+    assert "10.0.0" not in REGISTRY.render()
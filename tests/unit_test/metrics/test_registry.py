@@ -0,0 +1,48 @@
+from src.app.metrics.registry import Registry
+
+
+def test_counter_renders_labelled_series():
+    registry = Registry()
+    counter = registry.counter("jobs_total", "Jobs run.", ("status",))
+
+    counter.inc("ok")
+    counter.inc("ok")
+    counter.inc("error", amount=3)
+
+    text = registry.render()
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{status="ok"} 2' in text
+    assert 'jobs_total{status="error"} 3' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value=value)
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_count 4" in text
+    assert "latency_seconds_sum 6.05" in text
+    assert histogram.count() == 4
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    gauge = registry.gauge("things", "Things.", ("name",))
+
+    gauge.set('a"b', value=1)
+
+    assert 'things{name="a\\"b"} 1' in registry.render()
+
+
+def test_collectors_run_before_render():
+    registry = Registry()
+    gauge = registry.gauge("queue_depth", "Depth.")
+    registry.add_collector(lambda: gauge.set(value=7))
+
+    assert "queue_depth 7" in registry.render()
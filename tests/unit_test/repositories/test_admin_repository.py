@@ -1,9 +1,12 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone
 from bson import ObjectId
 from src.app.repositories.admin_repository import AdminRepository
 from src.app.entities.admin_entity import AdminDTA
+from src.app.exceptions.exceptions import AdminAlreadyExistsError
+from pymongo.errors import DuplicateKeyError
 
 
 @pytest.fixture
@@ -124,3 +127,76 @@ async def test_get_by_email_not_found(repo, mock_collection):
 
     assert result is None
     mock_collection.find_one.assert_called_once_with({"email": email})
+
+
+@pytest.mark.asyncio
+async def test_create_admin_duplicate_email_raises(repo, mock_collection):
+    mock_collection.insert_one.side_effect = DuplicateKeyError("E11000 duplicate key")
+
+    with pytest.raises(AdminAlreadyExistsError):
+        await repo.create("admin@example.com", "hashed_pw", "other123")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_by_email_share_one_query(repo, mock_collection):
+    async def find_one(query):
+        await asyncio.sleep(0.01)
+        return {
+            "_id": ObjectId(),
+            "email": query["email"],
+            "hashed_password": "hashed_pw",
+            "signup_date": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "other_id": "other123",
+        }
+
+    mock_collection.find_one.side_effect = find_one
+
+    results = await asyncio.gather(
+        *(repo.get_by_email("admin@example.com") for _ in range(5))
+    )
+
+    assert mock_collection.find_one.await_count == 1
+    assert all(result.email == "admin@example.com" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_get_by_email_is_not_shared_across_databases():
+    def make_repo(database):
+        async def find_one(query):
+            await asyncio.sleep(0.01)
+            return {
+                "_id": ObjectId(),
+                "email": query["email"],
+                "hashed_password": f"{database}_pw",
+                "signup_date": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                "other_id": None,
+            }
+
+        collection = AsyncMock(full_name=f"{database}.admin")
+        collection.find_one.side_effect = find_one
+        db = MagicMock()
+        db.__getitem__.return_value = collection
+        return AdminRepository(db)
+
+    first, second = await asyncio.gather(
+        make_repo("tenant_a").get_by_email("admin@example.com"),
+        make_repo("tenant_b").get_by_email("admin@example.com"),
+    )
+
+    assert first.hashed_password == "tenant_a_pw"
+    assert second.hashed_password == "tenant_b_pw"
+
+
+@pytest.mark.asyncio
+async def test_update_password_hash_only_replaces_verified_hash(repo, mock_collection):
+    admin_id = str(ObjectId())
+    mock_collection.update_one.return_value = MagicMock(modified_count=1)
+
+    assert await repo.update_password_hash(admin_id, "old", "new") is True
+
+    mock_collection.update_one.assert_awaited_once_with(
+        {"_id": ObjectId(admin_id), "hashed_password": "old"},
+        {"$set": {"hashed_password": "new"}},
+    )
+    mock_collection.update_one.return_value = MagicMock(modified_count=0)
+    assert await repo.update_password_hash(admin_id, "old", "new") is False
@@ -0,0 +1,184 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import BulkWriteError
+from src.app.repositories.log_writer import LogWriter
+from src.app.repositories.logs_repository import LogRepository
+
+
+def make_collection(full_name="db.logs"):
+    collection = AsyncMock(full_name=full_name)
+    collection.batches = []
+
+    async def insert_many(docs, ordered=True):
+        collection.batches.append(list(docs))
+
+    collection.insert_many.side_effect = insert_many
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full():
+    collection = make_collection()
+    writer = LogWriter(batch_size=3, flush_interval=60, max_queue=10)
+    writer.start()
+
+    for i in range(3):
+        await writer.write(collection, {"n": i})
+    await asyncio.sleep(0.01)
+
+    assert collection.batches == [[{"n": 0}, {"n": 1}, {"n": 2}]]
+    await writer.stop(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_flushes_partial_batch_after_interval():
+    collection = make_collection()
+    writer = LogWriter(batch_size=100, flush_interval=0.02, max_queue=10)
+    writer.start()
+
+    await writer.write(collection, {"n": 1})
+    assert collection.batches == []
+    await asyncio.sleep(0.05)
+
+    assert collection.batches == [[{"n": 1}]]
+    await writer.stop(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_durable_write_waits_for_flush():
+    collection = make_collection()
+    writer = LogWriter(batch_size=100, flush_interval=0.01, max_queue=10)
+    writer.start()
+
+    await writer.write_many(collection, [{"n": 1}, {"n": 2}], durable=True)
+
+    assert collection.batches == [[{"n": 1}, {"n": 2}]]
+    await writer.stop(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_flush_bumps_change_counter_before_releasing_writers():
+    collection = make_collection()
+    collection.name = "logs"
+    counters = AsyncMock()
+    collection.database.__getitem__.return_value = counters
+    writer = LogWriter(batch_size=100, flush_interval=0.01, max_queue=10)
+    writer.start()
+
+    await writer.write_many(collection, [{"n": 1}, {"n": 2}], durable=True)
+
+    counters.update_one.assert_awaited_once_with(
+        {"_id": "logs"}, {"$inc": {"inserted": 2}}, upsert=True
+    )
+    await writer.stop(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_durable_write_surfaces_flush_errors():
+    collection = AsyncMock()
+    collection.insert_many.side_effect = RuntimeError("mongo down")
+    writer = LogWriter(
+        batch_size=1, flush_interval=0.01, max_queue=10, retries=2, retry_delay=0
+    )
+    writer.start()
+
+    with pytest.raises(RuntimeError):
+        await writer.write(collection, {"n": 1}, durable=True)
+    await writer.stop(timeout=1)
+    assert collection.insert_many.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried():
+    collection = make_collection()
+    insert = collection.insert_many.side_effect
+    failures = [RuntimeError("primary stepped down")]
+
+    async def flaky_insert(docs, ordered=True):
+        if failures:
+            raise failures.pop()
+        await insert(docs, ordered)
+
+    collection.insert_many.side_effect = flaky_insert
+    writer = LogWriter(batch_size=1, flush_interval=0.01, max_queue=10, retry_delay=0)
+    writer.start()
+
+    await writer.write(collection, {"n": 1})
+    await writer.stop(timeout=1)
+
+    assert collection.batches == [[{"n": 1}]]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_partial_insert_ignores_duplicates():
+    collection = AsyncMock(full_name="db.logs")
+    collection.insert_many.side_effect = BulkWriteError(
+        {"writeErrors": [{"index": 0, "code": 11000}]}
+    )
+    writer = LogWriter(batch_size=1, flush_interval=0.01, max_queue=10)
+    writer.start()
+
+    await writer.write(collection, {"n": 1}, durable=True)
+    await writer.stop(timeout=1)
+    assert collection.insert_many.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rows_from_separate_repositories_share_a_batch():
+    # Every request builds its own LogRepository, and Motor returns a new
+    # collection object on each access: batching must not depend on identity.
+    batches = []
+
+    def make_db():
+        db = MagicMock()
+        collection = make_collection()
+        collection.batches = batches
+        db.__getitem__.return_value = collection
+        return db
+
+    writer = LogWriter(batch_size=100, flush_interval=0.02, max_queue=100)
+    writer.start()
+
+    for i in range(20):
+        await LogRepository(make_db(), writer).create_log(f"user{i}", "block")
+    await writer.stop(timeout=1)
+
+    assert [len(batch) for batch in batches] == [20]
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_logs():
+    collection = make_collection()
+    writer = LogWriter(batch_size=100, flush_interval=60, max_queue=10)
+    writer.start()
+
+    await writer.write(collection, {"n": 1})
+    await writer.stop(timeout=1)
+
+    assert collection.batches == [[{"n": 1}]]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure():
+    release = asyncio.Event()
+    collection = AsyncMock()
+
+    async def slow_insert(docs, ordered=True):
+        await release.wait()
+
+    collection.insert_many.side_effect = slow_insert
+    writer = LogWriter(batch_size=1, flush_interval=0.01, max_queue=1)
+    writer.start()
+
+    await writer.write(collection, {"n": 1})
+    await asyncio.sleep(0.01)
+    await writer.write(collection, {"n": 2})
+    blocked = asyncio.create_task(writer.write(collection, {"n": 3}))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, 1)
+    await writer.stop(timeout=1)
+    assert collection.insert_many.await_count == 3
@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from bson import ObjectId
+from src.app.repositories.login_attempts_repository import LoginAttemptsRepository
+
+AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def __aiter__(self):
+        for row in self.rows:
+            yield row
+
+
+@pytest.fixture
+def collection():
+    collection = AsyncMock()
+    collection.aggregate = MagicMock()
+    return collection
+
+
+@pytest.fixture
+def repo(collection):
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return LoginAttemptsRepository(db, window=60)
+
+
+@pytest.mark.asyncio
+async def test_add_stores_attempt_with_its_expiry(repo, collection):
+    token = ObjectId()
+    collection.insert_one.return_value = MagicMock(inserted_id=token)
+
+    assert await repo.add("email:a@example.com", AT.timestamp()) == token
+
+    doc = collection.insert_one.await_args.args[0]
+    assert doc == {
+        "key": "email:a@example.com",
+        "at": AT,
+        "expires_at": AT + timedelta(seconds=60),
+    }
+
+
+@pytest.mark.asyncio
+async def test_count_returns_attempts_in_window_and_oldest(repo, collection):
+    collection.aggregate.return_value = FakeCursor(
+        [{"count": 2, "oldest": AT.replace(tzinfo=None)}]
+    )
+
+    assert await repo.count("ip:10.0.0.1", AT.timestamp() - 60) == (
+        2,
+        AT.timestamp(),
+    )
+    match = collection.aggregate.call_args.args[0][0]["$match"]
+    assert match == {
+        "key": "ip:10.0.0.1",
+        "at": {"$gt": AT - timedelta(seconds=60)},
+    }
+
+
+@pytest.mark.asyncio
+async def test_count_without_attempts(repo, collection):
+    collection.aggregate.return_value = FakeCursor([])
+
+    assert await repo.count("ip:10.0.0.1", 0) == (0, None)
+
+
+@pytest.mark.asyncio
+async def test_remove_and_clear(repo, collection):
+    token = ObjectId()
+    await repo.remove("ip:10.0.0.1", token)
+    await repo.clear("email:a@example.com")
+
+    collection.delete_one.assert_awaited_once_with({"_id": token, "key": "ip:10.0.0.1"})
+    collection.delete_many.assert_awaited_once_with({"key": "email:a@example.com"})
@@ -2,7 +2,12 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from bson import ObjectId
 from datetime import datetime, timezone
-from src.app.repositories.logs_repository import LogRepository
+from src.app.repositories.logs_repository import (
+    LogRepository,
+    encode_log_cursor,
+    decode_log_cursor,
+)
+from src.app.exceptions.exceptions import BadRequestError
 
 
 @pytest.mark.asyncio
@@ -32,3 +37,183 @@ async def test_create_inserts_log_and_returns_log_info():
     assert result["user_id"] == user_id
     assert result["action"] == action
     assert isinstance(result["timestamp"], datetime)
+
+
+@pytest.mark.asyncio
+async def test_create_logs_inserts_batch_in_one_call():
+    fake_db = MagicMock()
+    fake_collection = AsyncMock()
+    fake_db.__getitem__.return_value = fake_collection
+    repo = LogRepository(fake_db)
+    inserted_ids = [ObjectId(), ObjectId()]
+    fake_collection.insert_many.return_value = MagicMock(inserted_ids=inserted_ids)
+
+    result = await repo.create_logs(["u1", "u2"], "block")
+
+    fake_collection.insert_many.assert_awaited_once()
+    fake_collection.insert_one.assert_not_awaited()
+    docs = fake_collection.insert_many.call_args[0][0]
+    assert [doc["user_id"] for doc in docs] == ["u1", "u2"]
+    assert all(doc["action"] == "block" for doc in docs)
+    assert [log["_id"] for log in result] == inserted_ids
+
+
+@pytest.mark.asyncio
+async def test_create_log_goes_through_writer():
+    fake_db = MagicMock()
+    fake_collection = AsyncMock()
+    fake_db.__getitem__.return_value = fake_collection
+    writer = AsyncMock()
+    repo = LogRepository(fake_db, writer)
+
+    result = await repo.create_log("u1", "block")
+
+    fake_collection.insert_one.assert_not_awaited()
+    writer.write.assert_awaited_once_with(fake_collection, result, False)
+    assert isinstance(result["_id"], ObjectId)
+
+
+@pytest.mark.asyncio
+async def test_create_logs_durable_goes_through_writer():
+    fake_db = MagicMock()
+    fake_collection = AsyncMock()
+    fake_db.__getitem__.return_value = fake_collection
+    writer = AsyncMock()
+    repo = LogRepository(fake_db, writer)
+
+    result = await repo.create_logs(["u1", "u2"], "unblock", durable=True)
+
+    fake_collection.insert_many.assert_not_awaited()
+    writer.write_many.assert_awaited_once_with(fake_collection, result, True)
+    assert all(isinstance(log["_id"], ObjectId) for log in result)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = {}
+
+    def sort(self, order):
+        self.calls["sort"] = order
+        return self
+
+    def limit(self, limit):
+        self.calls["limit"] = limit
+        return self
+
+    def batch_size(self, size):
+        self.calls["batch_size"] = size
+        return self
+
+    async def __aiter__(self):
+        for doc in self.docs[: self.calls["limit"]]:
+            yield doc
+
+
+def make_logs(count):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "u1",
+            "action": "block",
+            "timestamp": base.replace(minute=59 - i),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_find_logs_builds_keyset_query():
+    fake_db = MagicMock()
+    fake_collection = MagicMock()
+    fake_db.__getitem__.return_value = fake_collection
+    cursor = FakeCursor(make_logs(3))
+    fake_collection.find.return_value = cursor
+    repo = LogRepository(fake_db)
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    after = cursor.docs[0]
+
+    result = [
+        log
+        async for log in repo.find_logs(
+            user_id="u1",
+            action="block",
+            since=since,
+            after=encode_log_cursor(after),
+            limit=2,
+        )
+    ]
+
+    query, projection = fake_collection.find.call_args[0]
+    assert query["user_id"] == "u1"
+    assert query["action"] == "block"
+    assert query["timestamp"] == {"$gte": since}
+    assert query["$or"] == [
+        {"timestamp": {"$lt": after["timestamp"]}},
+        {"timestamp": after["timestamp"], "_id": {"$lt": after["_id"]}},
+    ]
+    assert projection == {"user_id": 1, "action": 1, "timestamp": 1}
+    assert cursor.calls["sort"] == [("timestamp", -1), ("_id", -1)]
+    assert len(result) == 2
+
+
+@pytest.mark.asyncio
+async def test_find_logs_rejects_malformed_cursor():
+    repo = LogRepository(MagicMock())
+    with pytest.raises(BadRequestError):
+        [log async for log in repo.find_logs(after="not-a-cursor")]
+
+
+def test_log_cursor_round_trip():
+    log = make_logs(1)[0]
+    assert decode_log_cursor(encode_log_cursor(log)) == (log["timestamp"], log["_id"])
+
+
+def make_counted_db():
+    fake_db = MagicMock()
+    fake_collection = AsyncMock()
+    fake_collection.name = "logs"
+    counters = AsyncMock()
+    fake_collection.database.__getitem__.return_value = counters
+    fake_db.__getitem__.return_value = fake_collection
+    return fake_db, fake_collection, counters
+
+
+@pytest.mark.asyncio
+async def test_inserts_bump_the_change_counter():
+    fake_db, fake_collection, counters = make_counted_db()
+    repo = LogRepository(fake_db)
+
+    await repo.create_log("u1", "block")
+    await repo.create_logs(["u1", "u2"], "unblock")
+
+    fake_collection.database.__getitem__.assert_called_with("collection_changes")
+    assert counters.update_one.await_args_list == [
+        (({"_id": "logs"}, {"$inc": {"inserted": 1}}), {"upsert": True}),
+        (({"_id": "logs"}, {"$inc": {"inserted": 2}}), {"upsert": True}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_counter_bump_does_not_fail_the_insert():
+    fake_db, fake_collection, counters = make_counted_db()
+    counters.update_one.side_effect = RuntimeError("down")
+    fake_collection.insert_one.return_value = AsyncMock(inserted_id="id")
+    repo = LogRepository(fake_db)
+
+    result = await repo.create_log("u1", "block")
+
+    assert result["_id"] == "id"
+
+
+@pytest.mark.asyncio
+async def test_change_count_reads_the_counter():
+    fake_db, _, counters = make_counted_db()
+    repo = LogRepository(fake_db)
+
+    counters.find_one.return_value = None
+    assert await repo.change_count() == 0
+    counters.find_one.return_value = {"_id": "logs", "inserted": 7}
+    assert await repo.change_count() == 7
+    counters.find_one.assert_awaited_with({"_id": "logs"})
@@ -0,0 +1,51 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import DuplicateKeyError
+from src.app.repositories.sync_lease_repository import SyncLeaseRepository
+
+AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def collection():
+    return AsyncMock()
+
+
+@pytest.fixture
+def repo(collection):
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return SyncLeaseRepository(db)
+
+
+@pytest.mark.asyncio
+async def test_acquire_takes_a_free_or_own_lease(repo, collection):
+    assert await repo.acquire("job", "worker-1", ttl=30) is True
+
+    query, update = collection.update_one.await_args.args
+    assert query["_id"] == "job"
+    assert query["$or"][0] == {"owner": "worker-1"}
+    assert update["$set"]["owner"] == "worker-1"
+    assert collection.update_one.await_args.kwargs == {"upsert": True}
+
+
+@pytest.mark.asyncio
+async def test_acquire_fails_while_another_owner_holds_it(repo, collection):
+    collection.update_one.side_effect = DuplicateKeyError("duplicate _id")
+
+    assert await repo.acquire("job", "worker-2", ttl=30) is False
+
+
+@pytest.mark.asyncio
+async def test_last_success_round_trip(repo, collection):
+    await repo.record_success("job", "worker-1", AT.timestamp())
+    collection.update_one.assert_awaited_once_with(
+        {"_id": "job", "owner": "worker-1"}, {"$set": {"succeeded_at": AT}}
+    )
+
+    collection.find_one.return_value = {"succeeded_at": AT.replace(tzinfo=None)}
+    assert await repo.last_success("job") == AT.timestamp()
+
+    collection.find_one.return_value = None
+    assert await repo.last_success("job") is None
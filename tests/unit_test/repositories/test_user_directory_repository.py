@@ -0,0 +1,116 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from src.app.repositories import user_directory_repository
+from src.app.repositories.user_directory_repository import UserDirectoryRepository
+
+SYNCED_AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = {}
+
+    def sort(self, key, direction):
+        self.calls["sort"] = (key, direction)
+        return self
+
+    def skip(self, skip):
+        self.calls["skip"] = skip
+        return self
+
+    def limit(self, limit):
+        self.calls["limit"] = limit
+        return self
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+@pytest.fixture
+def collection():
+    return AsyncMock()
+
+
+@pytest.fixture
+def repo(collection):
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return UserDirectoryRepository(db)
+
+
+@pytest.mark.asyncio
+async def test_upsert_users_sets_profile_fields_in_batches(
+    repo, collection, monkeypatch
+):
+    monkeypatch.setattr(user_directory_repository, "WRITE_BATCH", 2)
+    rows = [
+        {"id": str(i), "name": "N", "last_name": "L", "email": "e", "role": "r"}
+        for i in range(3)
+    ]
+
+    await repo.upsert("users", rows, SYNCED_AT)
+
+    assert collection.bulk_write.await_count == 2
+    first = collection.bulk_write.await_args_list[0].args[0][0]
+    assert first._filter == {"_id": "0"}
+    assert first._doc == {
+        "$set": {
+            "name": "N",
+            "last_name": "L",
+            "email": "e",
+            "role": "r",
+            "users_synced_at": SYNCED_AT,
+        }
+    }
+    assert first._upsert is True
+
+
+@pytest.mark.asyncio
+async def test_upsert_auth_only_sets_lock_flag(repo, collection):
+    await repo.upsert("auth", [{"id": "1", "is_locked": True}], SYNCED_AT)
+
+    operation = collection.bulk_write.await_args.args[0][0]
+    assert operation._doc == {"$set": {"is_locked": True, "auth_synced_at": SYNCED_AT}}
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_users_and_clears_auth(repo, collection):
+    await repo.sweep("users", SYNCED_AT)
+    collection.delete_many.assert_awaited_once_with(
+        {"users_synced_at": {"$lt": SYNCED_AT}}
+    )
+
+    await repo.sweep("auth", SYNCED_AT)
+    collection.update_many.assert_awaited_once_with(
+        {"auth_synced_at": {"$lt": SYNCED_AT}},
+        {"$unset": {"is_locked": "", "auth_synced_at": ""}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_users_inner_join_requires_auth_data(repo, collection):
+    cursor = FakeCursor([{"_id": "1", "name": "N", "is_locked": False}])
+    collection.find = MagicMock(return_value=cursor)
+
+    users = [user async for user in repo.find_users(10, 5, left_join=False)]
+
+    query = collection.find.call_args.args[0]
+    assert query == {
+        "users_synced_at": {"$exists": True},
+        "is_locked": {"$exists": True},
+    }
+    assert cursor.calls == {"sort": ("_id", 1), "skip": 10, "limit": 5}
+    assert users == [{"id": "1", "name": "N", "is_locked": False}]
+
+
+@pytest.mark.asyncio
+async def test_find_users_left_join_fills_missing_lock(repo, collection):
+    collection.find = MagicMock(return_value=FakeCursor([{"_id": "1"}]))
+
+    users = [user async for user in repo.find_users(0, None, left_join=True)]
+
+    assert collection.find.call_args.args[0] == {"users_synced_at": {"$exists": True}}
+    assert users == [{"id": "1", "is_locked": None}]
@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from httpx import ASGITransport, AsyncClient
+from src.app.main import app
+from src.app.db.db_client import get_db
+from src.app.externals.http_client import get_http_pool
+from src.app.repositories.log_writer import close_log_writer
+from src.app.security.security import create_access_token
+from src.app.services.iam_service import IAMService
+from src.app.exceptions.exceptions import UpstreamError
+
+
+@pytest.fixture
+def overrides():
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    app.dependency_overrides[get_http_pool] = lambda: MagicMock()
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_block_route_resolves_iam_service_with_log_writer(overrides, monkeypatch):
+    # get_log_writer is left in place: it has to run on the event loop.
+    block_user = AsyncMock()
+    monkeypatch.setattr(IAMService, "block_user", block_user)
+    token = create_access_token(id="admin1", email="admin@example.com")
+
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.patch(
+                "/admin/block/0",
+                json={"to_block": True},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+    finally:
+        await close_log_writer()
+
+    assert response.status_code == 200
+    block_user.assert_awaited_once_with("0", True)
+
+
+@pytest.mark.asyncio
+async def test_block_route_reports_failed_upstream_write(overrides, monkeypatch):
+    monkeypatch.setattr(
+        IAMService, "block_user", AsyncMock(side_effect=UpstreamError("auth", 503))
+    )
+    token = create_access_token(id="admin1", email="admin@example.com")
+
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.patch(
+                "/admin/block/0",
+                json={"to_block": True},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+    finally:
+        await close_log_writer()
+
+    assert response.status_code == 502
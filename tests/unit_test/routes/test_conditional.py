@@ -0,0 +1,128 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.app.cache.user_info_cache import UserInfoCache
+from src.app.entities.admin_entity import User
+from src.app.routes import admin_router
+from src.app.routes.conditional import etag_matches, variant_etag
+from src.app.security.security import get_current_user
+from src.app.services.admin_service import AdminService
+from src.app.services.iam_service import IAMService
+
+USERS = [
+    {
+        "id": str(i),
+        "name": "Name",
+        "last_name": "Last",
+        "email": f"user{i}@example.com",
+        "role": "student",
+    }
+    for i in range(3)
+]
+
+
+def request_with(header):
+    request = MagicMock()
+    request.headers = {"if-none-match": header} if header else {}
+    return request
+
+
+def test_etag_matches_uses_weak_comparison():
+    assert etag_matches(request_with('W/"1", W/"2"'), 'W/"2"')
+    assert etag_matches(request_with('"2"'), 'W/"2"')
+    assert etag_matches(request_with("*"), 'W/"2"')
+    assert not etag_matches(request_with('W/"1"'), 'W/"2"')
+    assert not etag_matches(request_with(None), 'W/"2"')
+    assert not etag_matches(request_with('W/"1"'), None)
+
+
+def test_variant_etag():
+    assert variant_etag('W/"a-1"', "nd") == 'W/"a-1-nd"'
+    assert variant_etag('W/"a-1"', "") == 'W/"a-1"'
+    assert variant_etag(None, "nd") is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fetch(http, offset=0, limit=None):
+        fetch.calls += 1
+        return USERS[offset : offset + limit]
+
+    async def fetch_auth(http, offset=0, limit=None):
+        return [{"id": user["id"], "is_locked": False} for user in USERS][
+            offset : offset + limit
+        ]
+
+    fetch.calls = 0
+    monkeypatch.setattr("src.app.services.admin_service.get_user_info_users", fetch)
+    monkeypatch.setattr("src.app.services.admin_service.get_user_info_auth", fetch_auth)
+    cache = UserInfoCache(ttl=60, max_items=100)
+    logs = MagicMock()
+    logs.change_count = AsyncMock(return_value=42)
+    logs.find_logs = MagicMock(side_effect=lambda **kwargs: empty())
+
+    app = FastAPI()
+    app.include_router(admin_router.router, prefix="/admin")
+    app.dependency_overrides[get_current_user] = lambda: User(id="1", email="a@b.c")
+    app.dependency_overrides[admin_router.get_admin_service] = lambda: AdminService(
+        MagicMock(), http=MagicMock(), cache=cache
+    )
+    app.dependency_overrides[admin_router.get_iam_service] = lambda: IAMService(
+        logs, http=MagicMock(), cache=cache
+    )
+    client = TestClient(app)
+    client.fetch = fetch
+    client.cache = cache
+    return client
+
+
+async def empty():
+    return
+    yield
+
+
+def test_users_info_returns_304_for_current_etag(client):
+    first = client.get("/admin/users_info?limit=10")
+    etag = first.headers["ETag"]
+
+    second = client.get("/admin/users_info?limit=10", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert client.fetch.calls == 1
+
+
+def test_users_info_etag_changes_after_write(client):
+    etag = client.get("/admin/users_info?limit=10").headers["ETag"]
+    client.cache.patch("1", is_locked=True)
+
+    response = client.get("/admin/users_info?limit=10", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[1]["is_locked"] is True
+
+
+def test_users_info_ndjson_has_its_own_etag(client):
+    client.get("/admin/users_info")
+    json_etag = client.get("/admin/users_info").headers["ETag"]
+
+    response = client.get(
+        "/admin/users_info",
+        headers={"Accept": "application/x-ndjson", "If-None-Match": json_etag},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == variant_etag(json_etag, "nd")
+
+
+def test_logs_return_304_while_no_new_log(client):
+    first = client.get("/admin/logs")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag == 'W/"42"'
+
+    second = client.get("/admin/logs", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
@@ -0,0 +1,54 @@
+import json
+import pytest
+import src.app.routes.responses as responses
+from src.app.routes.responses import FastJSONResponse, dumps, models_response
+from src.app.schemas.admin_schemas import GetUserInfoResponse
+
+
+def make_user(id):
+    return GetUserInfoResponse(
+        id=id,
+        name="Ñandú",
+        last_name="Last",
+        email=f"user{id}@example.com",
+        role="student",
+        is_locked=False,
+    )
+
+
+def test_models_response_renders_list_of_models():
+    users = [make_user("1"), make_user("2")]
+    response = models_response(users, GetUserInfoResponse, headers={"X-A": "1"})
+
+    assert json.loads(response.body) == [user.model_dump() for user in users]
+    assert response.headers["X-A"] == "1"
+    assert response.media_type == "application/json"
+
+
+def test_constructed_models_skip_validation_but_render_the_same():
+    data = make_user("1").model_dump()
+    constructed = GetUserInfoResponse.model_construct(**data)
+
+    response = models_response([constructed], GetUserInfoResponse)
+
+    assert json.loads(response.body) == [data]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_handles_dicts_and_models(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    content = {"user": make_user("1"), "count": 1, "name": "Ñandú"}
+
+    body = dumps(content)
+
+    assert json.loads(body) == {
+        "user": make_user("1").model_dump(),
+        "count": 1,
+        "name": "Ñandú",
+    }
+
+
+def test_plain_content_response():
+    response = FastJSONResponse({"message": "User blocked"})
+    assert response.body == b'{"message":"User blocked"}'
@@ -0,0 +1,27 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from src.app.main import app
+from src.app.security.security import create_access_token
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/stats/users_info_cache", "/stats/db_pool"])
+async def test_stats_require_a_token(path):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(path)
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_stats_answer_authenticated_admins():
+    token = create_access_token(id="admin1", email="admin@example.com")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/stats/db_pool", headers={"Authorization": f"Bearer {token}"}
+        )
+
+    assert response.status_code == 200
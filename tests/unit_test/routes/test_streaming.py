@@ -0,0 +1,85 @@
+import json
+import pytest
+from pydantic import BaseModel
+from src.app.routes.streaming import (
+    CHUNK_SIZE,
+    prime,
+    json_array,
+    json_page,
+    ndjson,
+)
+
+
+class Item(BaseModel):
+    id: str
+
+
+async def items(*ids):
+    for id in ids:
+        yield Item(id=id)
+
+
+async def failing():
+    raise RuntimeError("upstream down")
+    yield
+
+
+async def join(chunks):
+    return b"".join([chunk async for chunk in chunks]).decode()
+
+
+@pytest.mark.asyncio
+async def test_prime_keeps_all_items():
+    primed = await prime(items("a", "b"))
+    assert [item.id async for item in primed] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_prime_empty_iterator():
+    primed = await prime(items())
+    assert [item async for item in primed] == []
+
+
+@pytest.mark.asyncio
+async def test_prime_raises_before_streaming():
+    with pytest.raises(RuntimeError):
+        await prime(failing())
+
+
+@pytest.mark.asyncio
+async def test_json_array_is_valid_json():
+    assert json.loads(await join(json_array(items("a", "b")))) == [
+        {"id": "a"},
+        {"id": "b"},
+    ]
+    assert json.loads(await join(json_array(items()))) == []
+
+
+@pytest.mark.asyncio
+async def test_ndjson_one_object_per_line():
+    body = await join(ndjson(items("a", "b")))
+    assert [json.loads(line) for line in body.splitlines()] == [
+        {"id": "a"},
+        {"id": "b"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_json_page_writes_cursor_after_items():
+    state = {"cursor": None}
+
+    async def tracked():
+        async for item in items("a"):
+            yield item
+        state["cursor"] = "next"
+
+    body = await join(json_page(tracked(), lambda: state["cursor"]))
+    assert json.loads(body) == {"items": [{"id": "a"}], "next_cursor": "next"}
+
+
+@pytest.mark.asyncio
+async def test_json_array_spans_chunks():
+    ids = [str(i) for i in range(CHUNK_SIZE * 2 + 3)]
+    assert json.loads(await join(json_array(items(*ids)))) == [{"id": id} for id in ids]
+    body = await join(ndjson(items(*ids)))
+    assert [json.loads(line)["id"] for line in body.splitlines()] == ids
@@ -0,0 +1,88 @@
+import pytest
+from src.app.security import hash_policy
+from src.app.security.hash_policy import (
+    PASSWORD_HASH_COST,
+    HashPolicy,
+    build_context,
+    calibrate,
+)
+
+
+def test_calibrate_bcrypt_doubles_cost_per_round_within_budget():
+    policy, estimate = calibrate(
+        HashPolicy("bcrypt", 10), budget=0.25, timer=lambda p: 0.03
+    )
+
+    assert policy == HashPolicy("bcrypt", 13)
+    assert estimate == pytest.approx(0.24)
+
+
+def test_calibrate_argon2_scales_time_cost_linearly():
+    policy, estimate = calibrate(
+        HashPolicy("argon2", 2), budget=0.25, timer=lambda p: 0.05
+    )
+
+    assert policy.cost == 10
+    assert estimate == pytest.approx(0.25)
+
+
+def test_calibrate_never_goes_below_the_floor():
+    policy, estimate = calibrate(
+        HashPolicy("bcrypt", 10), budget=0.05, timer=lambda p: 0.09
+    )
+
+    assert policy == HashPolicy("bcrypt", 10)
+    assert estimate == 0.09
+
+
+def test_needs_update_for_lower_cost_only():
+    old = HashPolicy("bcrypt", 4).context().hash("secret")
+    strong = HashPolicy("bcrypt", 6).context().hash("secret")
+    policy = HashPolicy("bcrypt", 5)
+
+    assert policy.needs_update(old) is True
+    assert policy.needs_update(strong) is False
+    assert policy.needs_update(policy.context().hash("secret")) is False
+    assert policy.needs_update("not-a-hash") is False
+
+
+def test_older_hashes_still_verify():
+    old = HashPolicy("bcrypt", 4).context().hash("secret")
+
+    assert HashPolicy("bcrypt", 5).context().verify("secret", old) is True
+
+
+def test_unknown_scheme_is_rejected():
+    with pytest.raises(ValueError):
+        build_context(HashPolicy("md5", 1))
+
+
+def test_argon2_policy_migrates_bcrypt_hashes():
+    pytest.importorskip("argon2")
+    bcrypt_hash = HashPolicy("bcrypt", 4).context().hash("secret")
+    policy = HashPolicy("argon2", 2, memory_cost=1024)
+
+    assert policy.context().verify("secret", bcrypt_hash) is True
+    assert policy.needs_update(bcrypt_hash) is True
+    assert policy.context().hash("secret").startswith("$argon2")
+
+
+@pytest.mark.asyncio
+async def test_init_hash_policy_installs_calibrated_policy(monkeypatch):
+    monkeypatch.setattr(hash_policy, "_policy", None)
+    bases = []
+
+    def fake_calibrate(base, budget):
+        bases.append(base)
+        return HashPolicy("bcrypt", 13), 0.2
+
+    monkeypatch.setattr(hash_policy, "calibrate", fake_calibrate)
+
+    policy = await hash_policy.init_hash_policy()
+
+    assert policy == HashPolicy("bcrypt", 13)
+    assert hash_policy.get_hash_policy() == policy
+    assert PASSWORD_HASH_COST.value("bcrypt") == 13
+    # Calibration starts from the configured rounds, never below them.
+    assert bases == [hash_policy.configured_policy()]
+    assert bases[0].cost == hash_policy._settings.hash_bcrypt_rounds
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import pytest
+from src.app.exceptions.exceptions import HashingPoolFullError
+from src.app.security.hashing import HashingPool
+from src.app.security.security import (
+    hash_password_async,
+    verify_password_async,
+)
+
+
+@pytest.mark.asyncio
+async def test_run_executes_in_worker_thread():
+    pool = HashingPool(kind="thread", workers=1, max_queue=0)
+    name = await pool.run(lambda: threading.current_thread().name)
+    assert name.startswith("hashing")
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_when_queue_is_full():
+    pool = HashingPool(kind="thread", workers=1, max_queue=1)
+    release = threading.Event()
+    running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(HashingPoolFullError):
+        await pool.run(release.wait)
+    release.set()
+    assert await asyncio.gather(*running) == [True, True]
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+def test_unknown_kind_raises():
+    with pytest.raises(ValueError):
+        HashingPool(kind="fiber", workers=1, max_queue=1)
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify_round_trip():
+    hashed = await hash_password_async("asyncpassword")
+    assert await verify_password_async("asyncpassword", hashed) is True
+    assert await verify_password_async("wrongpassword", hashed) is False
@@ -0,0 +1,110 @@
+import pytest
+from src.app.exceptions.exceptions import LoginThrottledError
+from src.app.security.login_throttle import (
+    LOGIN_ATTEMPTS,
+    LOGIN_THROTTLED,
+    InMemoryAttemptStore,
+    LoginThrottle,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_throttle(clock, max_per_email=3, max_per_ip=10, max_keys=100):
+    return LoginThrottle(
+        InMemoryAttemptStore(max_keys),
+        window=60,
+        max_per_email=max_per_email,
+        max_per_ip=max_per_ip,
+        clock=clock,
+    )
+
+
+async def fail(throttle, email, ip="10.0.0.1"):
+    attempt = await throttle.acquire(email, ip)
+    await throttle.failed(attempt)
+
+
+@pytest.mark.asyncio
+async def test_email_is_throttled_after_max_failures_until_window_slides():
+    clock = FakeClock()
+    throttle = make_throttle(clock)
+    throttled = LOGIN_THROTTLED.value("email")
+    for _ in range(3):
+        await fail(throttle, "Admin@example.com")
+        clock.now += 10
+
+    with pytest.raises(LoginThrottledError) as exc:
+        await throttle.acquire("admin@example.com", "10.0.0.2")
+    assert exc.value.scope == "email"
+    assert exc.value.retry_after == pytest.approx(30)
+    assert LOGIN_THROTTLED.value("email") == throttled + 1
+
+    clock.now += 30
+    await throttle.acquire("admin@example.com", "10.0.0.2")
+
+
+@pytest.mark.asyncio
+async def test_ip_is_throttled_across_emails():
+    clock = FakeClock()
+    throttle = make_throttle(clock, max_per_ip=2)
+    await fail(throttle, "a@example.com")
+    await fail(throttle, "b@example.com")
+
+    with pytest.raises(LoginThrottledError) as exc:
+        await throttle.acquire("c@example.com", "10.0.0.1")
+    assert exc.value.scope == "ip"
+    await throttle.acquire("c@example.com", "10.0.0.2")
+
+
+@pytest.mark.asyncio
+async def test_in_flight_attempts_count_before_they_fail():
+    throttle = make_throttle(FakeClock())
+    for _ in range(3):
+        await throttle.acquire("admin@example.com", None)
+
+    with pytest.raises(LoginThrottledError):
+        await throttle.acquire("admin@example.com", None)
+
+
+@pytest.mark.asyncio
+async def test_success_clears_email_failures():
+    throttle = make_throttle(FakeClock())
+    successes = LOGIN_ATTEMPTS.value("success")
+    await fail(throttle, "admin@example.com")
+    await fail(throttle, "admin@example.com")
+
+    attempt = await throttle.acquire("admin@example.com", "10.0.0.1")
+    await throttle.succeeded(attempt)
+
+    assert await throttle.store.count("email:admin@example.com", 0) == (0, None)
+    assert (await throttle.store.count("ip:10.0.0.1", 0))[0] == 2
+    assert LOGIN_ATTEMPTS.value("success") == successes + 1
+
+
+@pytest.mark.asyncio
+async def test_released_attempt_does_not_count():
+    throttle = make_throttle(FakeClock(), max_per_email=1)
+    attempt = await throttle.acquire("admin@example.com", "10.0.0.1")
+    await throttle.release(attempt)
+
+    await throttle.acquire("admin@example.com", "10.0.0.1")
+
+
+@pytest.mark.asyncio
+async def test_store_evicts_least_recently_used_keys():
+    store = InMemoryAttemptStore(max_keys=2)
+    await store.add("a", 1.0)
+    await store.add("b", 1.0)
+    await store.add("a", 2.0)
+    await store.add("c", 2.0)
+
+    assert len(store) == 2
+    assert await store.count("b", 0) == (0, None)
+    assert await store.count("a", 0) == (2, 1.0)
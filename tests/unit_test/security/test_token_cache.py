@@ -0,0 +1,92 @@
+import time
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from src.app.entities.admin_entity import User
+from src.app.security.token_cache import TokenCache
+import src.app.security.security as security
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_user(id="1"):
+    return User(id=id, email=f"user{id}@example.com")
+
+
+def test_get_returns_cached_user_until_ttl():
+    clock = FakeClock()
+    cache = TokenCache(max_size=10, ttl=60, clock=clock)
+    cache.put("token", make_user())
+
+    assert cache.get("token") == make_user()
+    clock.now += 60
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_entry_never_outlives_token_exp():
+    clock = FakeClock()
+    cache = TokenCache(max_size=10, ttl=600, clock=clock)
+    cache.put("token", make_user(), exp=clock.now + 5)
+
+    clock.now += 5
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TokenCache(max_size=2, ttl=60)
+    cache.put("a", make_user("a"))
+    cache.put("b", make_user("b"))
+    cache.get("a")
+    cache.put("c", make_user("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_keys_are_digests():
+    cache = TokenCache(max_size=2, ttl=60)
+    cache.put("secret-token", make_user())
+    assert TokenCache.key("secret-token") in cache._entries
+    assert "secret-token" not in cache._entries
+
+
+def test_decode_token_cached_skips_verification_on_hit(monkeypatch):
+    cache = TokenCache(max_size=10, ttl=60)
+    monkeypatch.setattr(security, "get_token_cache", lambda: cache)
+    token = security.create_access_token("42", "cached@example.com")
+
+    first = security.decode_token_cached(token)
+    monkeypatch.setattr(
+        security, "_decode_token", lambda token: pytest.fail("decoded twice")
+    )
+    second = security.decode_token_cached(token)
+
+    assert first == second == User(id="42", email="cached@example.com")
+
+
+def test_decode_token_cached_uses_exp_claim(monkeypatch):
+    cache = TokenCache(max_size=10, ttl=600)
+    monkeypatch.setattr(security, "get_token_cache", lambda: cache)
+    exp = int(time.time()) + 30
+    token = jwt.encode(
+        {"id": "7", "email": "exp@example.com", "exp": exp}, "supersecret", "HS256"
+    )
+
+    security.decode_token_cached(token)
+
+    assert cache._entries[TokenCache.key(token)][1] == exp
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_maps_invalid_token_to_400():
+    with pytest.raises(HTTPException) as excinfo:
+        await security.get_current_user("invalid.token.value")
+    assert excinfo.value.status_code == 400
@@ -1,11 +1,23 @@
+import asyncio
+import time
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+from src.app.services import admin_service
 from src.app.services.admin_service import AdminService
+from src.app.cache.user_info_cache import UserInfoCache
 from src.app.exceptions.exceptions import (
     AdminNotFoundError,
     AdminAlreadyExistsError,
     WrongPasswordError,
+    UpstreamTimeoutError,
+    LoginThrottledError,
+    HashingPoolFullError,
+    UserNotFoundError,
 )
+from src.app.externals.auth_external import upstream_reads
+from src.app.externals.circuit_breaker import reset_breakers
+from src.app.externals.http_client import HTTPClientPool
 
 
 @pytest.fixture
@@ -18,7 +30,11 @@ def mock_repository():
 
 
 @pytest.mark.asyncio
-@patch("src.app.services.admin_service.hash_password", return_value="hashed_pw")
+@patch(
+    "src.app.services.admin_service.hash_password_async",
+    new_callable=AsyncMock,
+    return_value="hashed_pw",
+)
 async def test_create_admin_success(mock_hash, mock_repository):
     mock_repository.get_by_id.return_value = {"id": "creator_id"}
     mock_repository.get_by_email.return_value = None
@@ -28,8 +44,8 @@ async def test_create_admin_success(mock_hash, mock_repository):
     result = await service.create_admin("admin@example.com", "password", "creator_id")
 
     mock_repository.get_by_id.assert_called_once_with("creator_id")
-    mock_repository.get_by_email.assert_called_once_with("admin@example.com")
-    mock_hash.assert_called_once_with("password")
+    mock_repository.get_by_email.assert_not_called()
+    mock_hash.assert_awaited_once_with("password")
     mock_repository.create.assert_awaited_once_with(
         "admin@example.com", "hashed_pw", "creator_id"
     )
@@ -37,7 +53,11 @@ async def test_create_admin_success(mock_hash, mock_repository):
 
 
 @pytest.mark.asyncio
-@patch("src.app.services.admin_service.hash_password", return_value="hashed_pw")
+@patch(
+    "src.app.services.admin_service.hash_password_async",
+    new_callable=AsyncMock,
+    return_value="hashed_pw",
+)
 async def test_create_admin_creator_not_found(mock_hash, mock_repository):
     mock_repository.get_by_id.return_value = None
     service = AdminService(mock_repository)
@@ -47,31 +67,20 @@ async def test_create_admin_creator_not_found(mock_hash, mock_repository):
 
 
 @pytest.mark.asyncio
-@patch("src.app.services.admin_service.hash_password", return_value="hashed_pw")
+@patch(
+    "src.app.services.admin_service.hash_password_async",
+    new_callable=AsyncMock,
+    return_value="hashed_pw",
+)
 async def test_create_admin_email_already_exists(mock_hash, mock_repository):
     mock_repository.get_by_id.return_value = {"id": "creator_id"}
-    mock_repository.get_by_email.return_value = {"email": "admin@example.com"}
+    mock_repository.create.side_effect = AdminAlreadyExistsError("admin@example.com")
     service = AdminService(mock_repository)
 
     with pytest.raises(AdminAlreadyExistsError):
         await service.create_admin("admin@example.com", "password", "creator_id")
 
 
-@pytest.mark.asyncio
-async def test_assert_admin_email_not_exist_raises(mock_repository):
-    mock_repository.get_by_email.return_value = {"email": "admin@example.com"}
-    service = AdminService(mock_repository)
-    with pytest.raises(AdminAlreadyExistsError):
-        await service.assertAdminEmailNotExist("admin@example.com")
-
-
-@pytest.mark.asyncio
-async def test_assert_admin_email_not_exist_ok(mock_repository):
-    mock_repository.get_by_email.return_value = None
-    service = AdminService(mock_repository)
-    await service.assertAdminEmailNotExist("admin@example.com")
-
-
 @pytest.mark.asyncio
 async def test_assert_admin_id_exist_raises(mock_repository):
     mock_repository.get_by_id.return_value = None
@@ -88,7 +97,7 @@ async def test_assert_admin_id_exist_ok(mock_repository):
 
 
 @pytest.mark.asyncio
-@patch("src.app.services.admin_service.verify_password")
+@patch("src.app.services.admin_service.verify_password_async", new_callable=AsyncMock)
 async def test_login_admin_success(mock_verify, mock_repository):
     # Setup
     admin_obj = MagicMock()
@@ -100,12 +109,12 @@ async def test_login_admin_success(mock_verify, mock_repository):
     result = await service.login_admin("admin@example.com", "password")
 
     mock_repository.get_by_email.assert_awaited_once_with("admin@example.com")
-    mock_verify.assert_called_once_with("password", "hashed_pw")
+    mock_verify.assert_awaited_once_with("password", "hashed_pw")
     assert result == admin_obj
 
 
 @pytest.mark.asyncio
-@patch("src.app.services.admin_service.verify_password")
+@patch("src.app.services.admin_service.verify_password_async", new_callable=AsyncMock)
 async def test_login_admin_not_found(mock_verify, mock_repository):
     mock_repository.get_by_email = AsyncMock(return_value=None)
     service = AdminService(mock_repository)
@@ -113,11 +122,11 @@ async def test_login_admin_not_found(mock_verify, mock_repository):
     with pytest.raises(AdminNotFoundError):
         await service.login_admin("admin@example.com", "password")
     mock_repository.get_by_email.assert_awaited_once_with("admin@example.com")
-    mock_verify.assert_not_called()
+    mock_verify.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-@patch("src.app.services.admin_service.verify_password")
+@patch("src.app.services.admin_service.verify_password_async", new_callable=AsyncMock)
 async def test_login_admin_wrong_password(mock_verify, mock_repository):
     admin_obj = MagicMock()
     admin_obj.hashed_password = "hashed_pw"
@@ -128,4 +137,424 @@ async def test_login_admin_wrong_password(mock_verify, mock_repository):
     with pytest.raises(WrongPasswordError):
         await service.login_admin("admin@example.com", "wrongpassword")
     mock_repository.get_by_email.assert_awaited_once_with("admin@example.com")
-    mock_verify.assert_called_once_with("wrongpassword", "hashed_pw")
+    mock_verify.assert_awaited_once_with("wrongpassword", "hashed_pw")
+
+
+def make_fetch(items):
+    async def fetch(http, offset=0, limit=None):
+        return items[offset : offset + limit]
+
+    return fetch
+
+
+USERS = [
+    {
+        "id": str(i),
+        "name": f"Name{i}",
+        "last_name": f"Last{i}",
+        "email": f"user{i}@example.com",
+        "role": "student",
+    }
+    for i in range(5)
+]
+AUTH = [{"id": str(i), "is_locked": i == 1} for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_joins_pages(mock_repository, monkeypatch):
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_auth", make_fetch(AUTH)
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_users", make_fetch(USERS)
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service._settings.upstream_page_size", 2
+    )
+    service = AdminService(
+        mock_repository, http=MagicMock(), cache=UserInfoCache(ttl=0, max_items=0)
+    )
+
+    result = [item async for item in service.get_users_info()]
+
+    assert [item.id for item in result] == ["0", "1", "2", "3"]
+    assert [item.is_locked for item in result] == [False, True, False, False]
+    assert service.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_window_sets_next_cursor(mock_repository, monkeypatch):
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_auth", make_fetch(AUTH)
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_users", make_fetch(USERS)
+    )
+    service = AdminService(
+        mock_repository, http=MagicMock(), cache=UserInfoCache(ttl=0, max_items=0)
+    )
+
+    result = [item async for item in service.get_users_info(cursor=1, limit=2)]
+    assert [item.id for item in result] == ["1", "2"]
+    assert service.next_cursor == 3
+
+    result = [item async for item in service.get_users_info(cursor=3, limit=2)]
+    assert [item.id for item in result] == ["3"]
+    assert service.next_cursor == 5
+
+    result = [item async for item in service.get_users_info(cursor=5, limit=2)]
+    assert result == []
+    assert service.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_served_from_cache(mock_repository, monkeypatch):
+    fetch_users = AsyncMock(side_effect=make_fetch(USERS))
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_auth", make_fetch(AUTH)
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_users", fetch_users
+    )
+    cache = UserInfoCache(ttl=60, max_items=100)
+    service = AdminService(mock_repository, http=MagicMock(), cache=cache)
+
+    first = [item async for item in service.get_users_info(cursor=0, limit=2)]
+    second = [item async for item in service.get_users_info(cursor=0, limit=2)]
+
+    assert first == second
+    assert service.next_cursor == 2
+    assert fetch_users.await_count == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def make_slow_fetch(items, delay, started=None):
+    async def fetch(http, offset=0, limit=None):
+        if started is not None:
+            started.append(fetch)
+        await asyncio.sleep(delay)
+        return items[offset : offset + limit]
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_fetches_upstreams_concurrently(
+    mock_repository, monkeypatch
+):
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_auth",
+        make_slow_fetch(AUTH, 0.1),
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_users",
+        make_slow_fetch(USERS, 0.1),
+    )
+    service = AdminService(
+        mock_repository, http=MagicMock(), cache=UserInfoCache(ttl=0, max_items=0)
+    )
+
+    start = time.perf_counter()
+    result = [item async for item in service.get_users_info(limit=10)]
+    elapsed = time.perf_counter() - start
+
+    assert len(result) == 4
+    assert elapsed < 0.18
+    assert set(service.upstream_timings) == {"auth", "users"}
+    assert service.upstream_timings["auth"] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_failure_cancels_sibling(mock_repository, monkeypatch):
+    cancelled = []
+
+    async def failing_auth(http, offset=0, limit=None):
+        raise RuntimeError("auth down")
+
+    async def slow_users(http, offset=0, limit=None):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_auth", failing_auth
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_users", slow_users
+    )
+    service = AdminService(
+        mock_repository, http=MagicMock(), cache=UserInfoCache(ttl=0, max_items=0)
+    )
+
+    with pytest.raises(RuntimeError):
+        [item async for item in service.get_users_info()]
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_failure_cancels_coalesced_sibling(
+    mock_repository, monkeypatch
+):
+    # Goes through the real, SingleFlight-decorated upstream reads.
+    monkeypatch.setenv("URL_AUTH", "http://auth")
+    monkeypatch.setenv("URL_USERS", "http://users")
+    reset_breakers()
+    cancelled = []
+
+    async def handler(request):
+        if request.url.host == "auth":
+            return httpx.Response(404)
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return httpx.Response(200, json=[])
+
+    http = HTTPClientPool(
+        timeout=5,
+        max_connections_per_host=10,
+        max_keepalive_per_host=5,
+        keepalive_expiry=5,
+        transport=httpx.MockTransport(handler),
+    )
+    service = AdminService(
+        mock_repository, http=http, cache=UserInfoCache(ttl=0, max_items=0)
+    )
+
+    start = time.perf_counter()
+    with pytest.raises(UserNotFoundError):
+        [item async for item in service.get_users_info()]
+    await asyncio.sleep(0)
+
+    assert cancelled == [True]
+    assert time.perf_counter() - start < 0.5
+    assert upstream_reads.in_flight() == 0
+    reset_breakers()
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_upstream_timeout(mock_repository, monkeypatch):
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_auth",
+        make_slow_fetch(AUTH, 1),
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_users", make_fetch(USERS)
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service._settings.auth_fetch_timeout", 0.05
+    )
+    service = AdminService(
+        mock_repository, http=MagicMock(), cache=UserInfoCache(ttl=0, max_items=0)
+    )
+
+    with pytest.raises(UpstreamTimeoutError) as excinfo:
+        [item async for item in service.get_users_info()]
+    assert excinfo.value.upstream == "auth"
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_serves_stale_snapshot_and_refreshes(
+    mock_repository, monkeypatch
+):
+    clock = [0.0]
+    cache = UserInfoCache(ttl=10, max_items=100, stale_ttl=100, clock=lambda: clock[0])
+    users = list(USERS)
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_auth", make_fetch(AUTH)
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_users", make_fetch(users)
+    )
+    first = [
+        item.id
+        async for item in AdminService(
+            mock_repository, http=MagicMock(), cache=cache
+        ).get_users_info()
+    ]
+
+    clock[0] = 40
+    users[0] = {**users[0], "name": "Renamed"}
+    service = AdminService(mock_repository, http=MagicMock(), cache=cache)
+    stale = [item async for item in service.get_users_info()]
+
+    assert [item.id for item in stale] == first
+    assert stale[0].name == "Name0"
+    assert service.data_age == 40
+    await asyncio.sleep(0.01)
+    assert cache.get((0, None)).items[0].name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_serves_snapshot_while_upstream_is_down(
+    mock_repository, monkeypatch
+):
+    clock = [0.0]
+    cache = UserInfoCache(ttl=10, max_items=100, stale_ttl=100, clock=lambda: clock[0])
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_auth", make_fetch(AUTH)
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_users", make_fetch(USERS)
+    )
+    service = AdminService(mock_repository, http=MagicMock(), cache=cache)
+    [item async for item in service.get_users_info()]
+
+    failing = AsyncMock(side_effect=RuntimeError("auth down"))
+    monkeypatch.setattr("src.app.services.admin_service.get_user_info_auth", failing)
+    clock[0] = 20
+    results = []
+    for _ in range(3):
+        service = AdminService(mock_repository, http=MagicMock(), cache=cache)
+        results.append([item.id async for item in service.get_users_info()])
+    await asyncio.sleep(0.01)
+
+    assert results == [["0", "1", "2", "3"]] * 3
+    assert failing.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_left_join_keeps_unknown_users(
+    mock_repository, monkeypatch
+):
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_auth", make_fetch(AUTH)
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service.get_user_info_users", make_fetch(USERS)
+    )
+    monkeypatch.setattr(
+        "src.app.services.admin_service._settings.users_info_join_mode", "left"
+    )
+    service = AdminService(
+        mock_repository, http=MagicMock(), cache=UserInfoCache(ttl=0, max_items=0)
+    )
+
+    result = [item async for item in service.get_users_info()]
+
+    assert [item.id for item in result] == ["0", "1", "2", "3", "4"]
+    assert result[4].is_locked is None
+
+
+@pytest.mark.asyncio
+async def test_get_users_info_reads_synced_directory(mock_repository, monkeypatch):
+    upstream = AsyncMock()
+    monkeypatch.setattr("src.app.services.admin_service.get_user_info_auth", upstream)
+    monkeypatch.setattr("src.app.services.admin_service.get_user_info_users", upstream)
+    seen = []
+
+    async def find_users(skip, limit, left_join):
+        seen.append((skip, limit, left_join))
+        for user in USERS[skip : skip + limit]:
+            yield {**user, "is_locked": False}
+
+    directory = MagicMock()
+    directory.find_users = find_users
+    service = AdminService(
+        mock_repository,
+        http=MagicMock(),
+        cache=UserInfoCache(ttl=0, max_items=0),
+        directory=directory,
+    )
+
+    result = [item async for item in service.get_users_info(cursor=1, limit=2)]
+
+    assert [item.id for item in result] == ["1", "2"]
+    assert service.next_cursor == 3
+    assert seen == [(1, 2, False)]
+    upstream.assert_not_awaited()
+
+
+def make_throttle():
+    throttle = MagicMock()
+    throttle.acquire = AsyncMock(return_value="attempt")
+    throttle.failed = AsyncMock()
+    throttle.succeeded = AsyncMock()
+    throttle.release = AsyncMock()
+    return throttle
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.admin_service.verify_password_async", new_callable=AsyncMock)
+async def test_login_admin_throttled_before_lookup_and_hashing(
+    mock_verify, mock_repository
+):
+    throttle = make_throttle()
+    throttle.acquire.side_effect = LoginThrottledError("email", 30)
+    service = AdminService(mock_repository, throttle=throttle)
+
+    with pytest.raises(LoginThrottledError):
+        await service.login_admin("admin@example.com", "password", "10.0.0.1")
+    throttle.acquire.assert_awaited_once_with("admin@example.com", "10.0.0.1")
+    mock_repository.get_by_email.assert_not_awaited()
+    mock_verify.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.admin_service.verify_password_async", new_callable=AsyncMock)
+async def test_login_admin_reports_outcome_to_throttle(mock_verify, mock_repository):
+    admin_obj = MagicMock()
+    admin_obj.hashed_password = "hashed_pw"
+    mock_repository.get_by_email = AsyncMock(return_value=admin_obj)
+    throttle = make_throttle()
+    service = AdminService(mock_repository, throttle=throttle)
+
+    mock_verify.return_value = False
+    with pytest.raises(WrongPasswordError):
+        await service.login_admin("admin@example.com", "wrong", "10.0.0.1")
+    throttle.failed.assert_awaited_once_with("attempt")
+
+    mock_verify.return_value = True
+    await service.login_admin("admin@example.com", "password", "10.0.0.1")
+    throttle.succeeded.assert_awaited_once_with("attempt")
+
+    mock_verify.side_effect = HashingPoolFullError()
+    with pytest.raises(HashingPoolFullError):
+        await service.login_admin("admin@example.com", "password", "10.0.0.1")
+    throttle.release.assert_awaited_once_with("attempt")
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.admin_service.password_needs_rehash", return_value=True)
+@patch(
+    "src.app.services.admin_service.hash_password_async",
+    new_callable=AsyncMock,
+    return_value="new_hash",
+)
+@patch("src.app.services.admin_service.verify_password_async", new_callable=AsyncMock)
+async def test_login_admin_rehashes_outdated_hash_in_background(
+    mock_verify, mock_hash, mock_needs_rehash, mock_repository
+):
+    admin_obj = MagicMock(id="admin-1", hashed_password="old_hash")
+    mock_repository.get_by_email = AsyncMock(return_value=admin_obj)
+    mock_repository.update_password_hash = AsyncMock(return_value=True)
+    mock_verify.return_value = True
+    service = AdminService(mock_repository)
+
+    assert await service.login_admin("admin@example.com", "password") == admin_obj
+    await asyncio.gather(*admin_service._rehashes.values())
+
+    mock_hash.assert_awaited_once_with("password", operation="rehash")
+    mock_repository.update_password_hash.assert_awaited_once_with(
+        "admin-1", "old_hash", "new_hash"
+    )
+    assert admin_service._rehashes == {}
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.admin_service.password_needs_rehash", return_value=False)
+@patch("src.app.services.admin_service.hash_password_async", new_callable=AsyncMock)
+@patch("src.app.services.admin_service.verify_password_async", new_callable=AsyncMock)
+async def test_login_admin_keeps_current_hash(
+    mock_verify, mock_hash, mock_needs_rehash, mock_repository
+):
+    mock_repository.get_by_email = AsyncMock(return_value=MagicMock())
+    mock_verify.return_value = True
+
+    await AdminService(mock_repository).login_admin("admin@example.com", "password")
+
+    mock_hash.assert_not_awaited()
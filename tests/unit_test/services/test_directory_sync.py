@@ -0,0 +1,190 @@
+import httpx
+import pytest
+from benchmarks.stub_services import build_stub_app
+from src.app.externals.circuit_breaker import reset_breakers
+from src.app.externals.http_client import HTTPClientPool
+from src.app.repositories.user_directory_repository import SYNC_FIELDS, USER_FIELDS
+from src.app.services.directory_sync import (
+    USER_DIRECTORY_SYNC_NOT_MODIFIED,
+    DirectorySync,
+)
+
+
+class InMemoryDirectory:
+    def __init__(self):
+        self.docs = {}
+
+    async def upsert(self, upstream, rows, synced_at):
+        fields = USER_FIELDS if upstream == "users" else ("is_locked",)
+        for row in rows:
+            doc = self.docs.setdefault(row["id"], {})
+            doc.update({field: row[field] for field in fields})
+            doc[SYNC_FIELDS[upstream]] = synced_at
+
+    async def sweep(self, upstream, synced_before):
+        stamp = SYNC_FIELDS[upstream]
+        for id, doc in list(self.docs.items()):
+            if stamp in doc and doc[stamp] < synced_before:
+                if upstream == "users":
+                    del self.docs[id]
+                else:
+                    doc.pop("is_locked")
+                    doc.pop(stamp)
+
+    async def patch(self, user_ids, **changes):
+        for id in user_ids:
+            if id in self.docs:
+                self.docs[id].update(changes)
+
+
+class InMemoryLease:
+    def __init__(self):
+        self.owner = None
+        self.expired = False
+        self.succeeded_at = None
+
+    async def acquire(self, name, owner, ttl):
+        if self.owner in (None, owner) or self.expired:
+            self.owner, self.expired = owner, False
+            return True
+        return False
+
+    async def record_success(self, name, owner, at):
+        if self.owner == owner:
+            self.succeeded_at = at
+
+    async def last_success(self, name):
+        return self.succeeded_at
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setenv("URL_AUTH", "http://stub")
+    monkeypatch.setenv("URL_USERS", "http://stub")
+    reset_breakers()
+    return build_stub_app(users=5)
+
+
+def make_sync(stub, directory, full_every=10, lease=None):
+    http = HTTPClientPool(
+        timeout=5,
+        max_connections_per_host=10,
+        max_keepalive_per_host=5,
+        keepalive_expiry=5,
+        transport=httpx.ASGITransport(app=stub),
+    )
+    return DirectorySync(
+        directory,
+        http,
+        interval=1,
+        full_every=full_every,
+        overlap=0,
+        lease=lease,
+        lease_ttl=60,
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_sync_loads_both_listings(stub):
+    directory = InMemoryDirectory()
+    sync = make_sync(stub, directory)
+
+    assert not sync.ready
+    await sync.sync_once()
+
+    assert sync.ready
+    assert sorted(directory.docs) == ["0", "1", "2", "3", "4"]
+    assert directory.docs["0"]["is_locked"] is True
+    assert directory.docs["1"]["email"] == "user1@example.com"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_upstreams_answer_not_modified(stub):
+    sync = make_sync(stub, InMemoryDirectory())
+    await sync.sync_once()
+    before = USER_DIRECTORY_SYNC_NOT_MODIFIED.value("auth")
+
+    await sync.sync_once()
+
+    assert USER_DIRECTORY_SYNC_NOT_MODIFIED.value("auth") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_fetches_only_changed_rows(stub):
+    directory = InMemoryDirectory()
+    sync = make_sync(stub, directory)
+    await sync.sync_once()
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=stub), base_url="http://stub"
+    ) as client:
+        await client.patch("/auth/block/3", json={"block": True})
+    upserted = []
+    original = directory.upsert
+
+    async def tracking_upsert(upstream, rows, synced_at):
+        upserted.append((upstream, [row["id"] for row in rows]))
+        await original(upstream, rows, synced_at)
+
+    directory.upsert = tracking_upsert
+    await sync.sync_once()
+
+    assert sorted(upserted) == [("auth", ["3"]), ("users", [])]
+    assert directory.docs["3"]["is_locked"] is True
+
+
+@pytest.mark.asyncio
+async def test_full_sync_sweeps_removed_users(stub):
+    directory = InMemoryDirectory()
+    sync = make_sync(stub, directory, full_every=1)
+    await sync.sync_once()
+
+    stub.state.people.pop()
+    stub.state.version += 1
+    await sync.sync_once()
+
+    assert "4" not in directory.docs
+
+
+@pytest.mark.asyncio
+async def test_only_the_lease_holder_syncs(stub):
+    lease = InMemoryLease()
+    directory = InMemoryDirectory()
+    leader = make_sync(stub, directory, lease=lease)
+    follower = make_sync(stub, directory, lease=lease)
+    upserts = []
+    original = directory.upsert
+
+    async def tracking_upsert(upstream, rows, synced_at):
+        upserts.append(upstream)
+        await original(upstream, rows, synced_at)
+
+    directory.upsert = tracking_upsert
+
+    await leader.run_cycle()
+    await follower.run_cycle()
+
+    assert leader.leader and not follower.leader
+    assert sorted(upserts) == ["auth", "users"]
+    # The follower serves the directory the leader keeps fresh.
+    assert follower.ready
+    assert follower.last_success == leader.last_success
+
+
+@pytest.mark.asyncio
+async def test_follower_takes_over_an_expired_lease_with_a_full_sync(stub):
+    lease = InMemoryLease()
+    directory = InMemoryDirectory()
+    leader = make_sync(stub, directory, lease=lease)
+    follower = make_sync(stub, directory, lease=lease)
+    await leader.run_cycle()
+    await follower.run_cycle()
+
+    lease.expired = True
+    stub.state.people.pop()
+    stub.state.version += 1
+    await follower.run_cycle()
+
+    assert follower.leader
+    assert follower.cycles == 1
+    assert "4" not in directory.docs
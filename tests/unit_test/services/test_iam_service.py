@@ -1,8 +1,20 @@
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch
+import httpx
+from datetime import datetime, timezone
+from bson import ObjectId
+from unittest.mock import AsyncMock, MagicMock, patch
 from src.app.services.iam_service import IAMService
-from src.app.exceptions.exceptions import BadRequestError
+from src.app.externals.http_client import HTTPClientPool
+from src.app.externals.circuit_breaker import reset_breakers
+from src.app.repositories.logs_repository import encode_log_cursor
+from src.app.exceptions.exceptions import (
+    BadRequestError,
+    UserNotFoundError,
+    UpstreamError,
+)
+from src.app.cache.user_info_cache import UserInfoCache
+from src.app.schemas.admin_schemas import GetUserInfoResponse
 
 
 @pytest.fixture
@@ -15,13 +27,13 @@ def mock_repository():
 @patch("src.app.services.iam_service.block_user_auth", new_callable=AsyncMock)
 async def test_block_user_blocks_user(mock_block_user_auth, mock_repository):
     mock_repository.create_log.return_value = "log_created"
-    service = IAMService(mock_repository)
+    service = IAMService(mock_repository, http="pool", cache=MagicMock())
     user_id = "user123"
     to_block = True
 
     result = await service.block_user(user_id, to_block)
 
-    mock_block_user_auth.assert_awaited_once_with(user_id, to_block)
+    mock_block_user_auth.assert_awaited_once_with(user_id, to_block, "pool")
     mock_repository.create_log.assert_awaited_once_with(user_id, "block")
     assert result == "log_created"
 
@@ -30,13 +42,13 @@ async def test_block_user_blocks_user(mock_block_user_auth, mock_repository):
 @patch("src.app.services.iam_service.block_user_auth", new_callable=AsyncMock)
 async def test_block_user_unblocks_user(mock_block_user_auth, mock_repository):
     mock_repository.create_log.return_value = "log_created"
-    service = IAMService(mock_repository)
+    service = IAMService(mock_repository, http="pool", cache=MagicMock())
     user_id = "user123"
     to_block = False
 
     result = await service.block_user(user_id, to_block)
 
-    mock_block_user_auth.assert_awaited_once_with(user_id, to_block)
+    mock_block_user_auth.assert_awaited_once_with(user_id, to_block, "pool")
     mock_repository.create_log.assert_awaited_once_with(user_id, "unblock")
     assert result == "log_created"
 
@@ -45,13 +57,13 @@ async def test_block_user_unblocks_user(mock_block_user_auth, mock_repository):
 @patch("src.app.services.iam_service.change_rol_auth", new_callable=AsyncMock)
 async def test_change_role(mock_change_rol_auth, mock_repository):
     mock_repository.create_log.return_value = "log_created"
-    service = IAMService(mock_repository)
+    service = IAMService(mock_repository, http="pool", cache=MagicMock())
     user_id = "user123"
     rol = "student"
 
     result = await service.change_role(user_id, rol)
 
-    mock_change_rol_auth.assert_awaited_once_with(user_id, rol)
+    mock_change_rol_auth.assert_awaited_once_with(user_id, rol, "pool")
     mock_repository.create_log.assert_awaited_once_with(user_id, rol)
     assert result == "log_created"
 
@@ -73,3 +85,201 @@ async def test_assert_is_a_possible_role_raises_for_invalid_role(mock_repository
         await service.assertIsAPossibleRole("")
     with pytest.raises(BadRequestError):
         await service.assertIsAPossibleRole("STUDENT")
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.iam_service.change_rol_auth", new_callable=AsyncMock)
+@patch("src.app.services.iam_service.block_user_auth", new_callable=AsyncMock)
+async def test_writes_patch_cached_user_info(mock_block, mock_change, mock_repository):
+    cache = UserInfoCache(ttl=60, max_items=10)
+    user = GetUserInfoResponse(
+        id="user123",
+        name="Ada",
+        last_name="Lovelace",
+        email="ada@example.com",
+        role="student",
+        is_locked=False,
+    )
+    cache.put((0, None), [user], None, cache.generation)
+    service = IAMService(mock_repository, http="pool", cache=cache)
+
+    await service.block_user("user123", True)
+    await service.change_role("user123", "teacher")
+
+    cached = cache.get((0, None)).items[0]
+    assert cached.is_locked is True
+    assert cached.role == "teacher"
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.iam_service.block_user_auth", new_callable=AsyncMock)
+async def test_failed_upstream_write_leaves_cached_user_info(
+    mock_block, mock_repository
+):
+    mock_block.side_effect = UpstreamError("auth", 503)
+    cache = MagicMock()
+    directory = AsyncMock()
+    service = IAMService(mock_repository, http="pool", cache=cache, directory=directory)
+
+    with pytest.raises(UpstreamError):
+        await service.block_user("user123", True)
+
+    cache.patch.assert_not_called()
+    directory.patch.assert_not_awaited()
+    mock_repository.create_log.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.iam_service.block_user_auth", new_callable=AsyncMock)
+async def test_block_users_reports_partial_failures(mock_block, mock_repository):
+    async def fake_block(user_id, to_block, http):
+        if user_id == "missing":
+            raise UserNotFoundError(user_id)
+        if user_id == "broken":
+            raise Exception("Auth service request failed")
+
+    mock_block.side_effect = fake_block
+    cache = MagicMock()
+    service = IAMService(mock_repository, http="pool", cache=cache)
+
+    results = await service.block_users(["u1", "missing", "broken", "u1", "u2"], True)
+
+    assert [(r.user_id, r.status) for r in results] == [
+        ("u1", "ok"),
+        ("missing", "not_found"),
+        ("broken", "error"),
+        ("u2", "ok"),
+    ]
+    assert results[2].detail == "Auth service request failed"
+    mock_repository.create_logs.assert_awaited_once_with(["u1", "u2"], "block")
+    mock_repository.create_log.assert_not_awaited()
+    assert cache.patch.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.iam_service.change_rol_auth", new_callable=AsyncMock)
+async def test_change_roles_caps_concurrency(mock_change, mock_repository, monkeypatch):
+    running = 0
+    peak = 0
+
+    async def fake_change(user_id, rol, http):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    mock_change.side_effect = fake_change
+    monkeypatch.setattr("src.app.services.iam_service._settings.bulk_concurrency", 3)
+    service = IAMService(mock_repository, http="pool", cache=MagicMock())
+
+    results = await service.change_roles([f"u{i}" for i in range(10)], "teacher")
+
+    assert all(result.status == "ok" for result in results)
+    assert peak == 3
+    mock_repository.create_logs.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_change_roles_rejects_invalid_role(mock_repository):
+    service = IAMService(mock_repository, http="pool", cache=MagicMock())
+    with pytest.raises(BadRequestError):
+        await service.change_roles(["u1"], "admin")
+
+
+@pytest.mark.asyncio
+async def test_block_users_reports_upstream_5xx_as_error(mock_repository, monkeypatch):
+    monkeypatch.setenv("URL_AUTH", "http://fake-auth-service")
+    reset_breakers()
+    http = HTTPClientPool(
+        timeout=5,
+        max_connections_per_host=10,
+        max_keepalive_per_host=5,
+        keepalive_expiry=5,
+        transport=httpx.MockTransport(lambda request: httpx.Response(500)),
+    )
+    cache = MagicMock()
+    service = IAMService(mock_repository, http=http, cache=cache)
+
+    results = await service.block_users(["a", "b"], True)
+
+    assert [(r.user_id, r.status) for r in results] == [("a", "error"), ("b", "error")]
+    assert results[0].detail == "Upstream 'auth' answered 500"
+    mock_repository.create_logs.assert_not_awaited()
+    cache.patch.assert_not_called()
+    reset_breakers()
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.iam_service.block_user_auth", new_callable=AsyncMock)
+async def test_block_users_skips_log_when_all_fail(mock_block, mock_repository):
+    mock_block.side_effect = UserNotFoundError("u1")
+    service = IAMService(mock_repository, http="pool", cache=MagicMock())
+
+    results = await service.block_users(["u1"], False)
+
+    assert results[0].status == "not_found"
+    mock_repository.create_logs.assert_not_awaited()
+
+
+def make_find_logs(logs):
+    async def find_logs(**kwargs):
+        find_logs.kwargs = kwargs
+        for log in logs[: kwargs["limit"]]:
+            yield log
+
+    return find_logs
+
+
+LOGS = [
+    {
+        "_id": ObjectId(),
+        "user_id": f"u{i}",
+        "action": "block",
+        "timestamp": datetime(2025, 1, 1, 12, 59 - i, tzinfo=timezone.utc),
+    }
+    for i in range(3)
+]
+
+
+@pytest.mark.asyncio
+async def test_get_logs_sets_next_cursor_when_more_rows(mock_repository):
+    mock_repository.find_logs = make_find_logs(LOGS)
+    service = IAMService(mock_repository, http="pool", cache=MagicMock())
+
+    result = [log async for log in service.get_logs({"user_id": None}, None, 2)]
+
+    assert [log.user_id for log in result] == ["u0", "u1"]
+    assert mock_repository.find_logs.kwargs["limit"] == 3
+    assert service.next_cursor == encode_log_cursor(LOGS[1])
+
+
+@pytest.mark.asyncio
+async def test_get_logs_last_page_has_no_cursor(mock_repository):
+    mock_repository.find_logs = make_find_logs(LOGS)
+    service = IAMService(mock_repository, http="pool", cache=MagicMock())
+
+    result = [log async for log in service.get_logs({}, "cursor", 5)]
+
+    assert len(result) == 3
+    assert result[0].id == str(LOGS[0]["_id"])
+    assert mock_repository.find_logs.kwargs["after"] == "cursor"
+    assert service.next_cursor is None
+
+
+@pytest.mark.asyncio
+@patch("src.app.services.iam_service.block_user_auth", new_callable=AsyncMock)
+async def test_writes_patch_user_directory(mock_block, mock_repository):
+    directory = MagicMock()
+    directory.patch = AsyncMock()
+    service = IAMService(
+        mock_repository, http="pool", cache=MagicMock(), directory=directory
+    )
+
+    await service.block_user("1", True)
+    await service.block_users(["2", "3"], False)
+
+    assert directory.patch.await_args_list[0].args == (["1"],)
+    assert directory.patch.await_args_list[0].kwargs == {"is_locked": True}
+    assert directory.patch.await_args_list[1].args == (["2", "3"],)
+    assert directory.patch.await_args_list[1].kwargs == {"is_locked": False}
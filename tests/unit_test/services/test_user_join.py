@@ -0,0 +1,54 @@
+from src.app.services.user_join import INNER, LEFT, LockIndex, join_users
+
+
+def make_index(*pages):
+    index = LockIndex()
+    for page in pages:
+        index.add_page(page)
+    return index.freeze()
+
+
+def test_lock_index_lookup_across_pages():
+    index = make_index(
+        [{"id": "b", "is_locked": True}, {"id": "d", "is_locked": False}],
+        [{"id": "a", "is_locked": False}],
+    )
+
+    assert len(index) == 3
+    assert index.get("a") is False
+    assert index.get("b") is True
+    assert index.get("d") is False
+    assert index.get("c") is None
+    assert index.get("z") is None
+
+
+def test_inner_join_drops_users_missing_from_auth():
+    index = make_index([{"id": "1", "is_locked": True}])
+    users = [{"id": "1"}, {"id": "2"}]
+
+    assert list(join_users(users, index, INNER)) == [({"id": "1"}, True)]
+
+
+def test_left_join_keeps_users_missing_from_auth():
+    index = make_index([{"id": "1", "is_locked": True}])
+    users = [{"id": "1"}, {"id": "2"}]
+
+    assert list(join_users(users, index, LEFT)) == [
+        ({"id": "1"}, True),
+        ({"id": "2"}, None),
+    ]
+
+
+def test_join_is_lazy():
+    index = make_index([{"id": "1", "is_locked": False}])
+    seen = []
+
+    def users():
+        for id in ("1", "1", "1"):
+            seen.append(id)
+            yield {"id": id}
+
+    rows = join_users(users(), index)
+    next(rows)
+
+    assert seen == ["1"]
@@ -0,0 +1,79 @@
+import json
+import os
+import pytest
+from unittest.mock import patch
+from src.app import server
+from src.app.cache import user_info_cache
+from src.app.config.config import get_settings
+from src.app.externals import http_client
+from src.app.security import hashing
+
+
+@pytest.fixture
+def clean_settings(monkeypatch):
+    monkeypatch.delenv("USERS_INFO_CACHE_SHARED_PATH", raising=False)
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def test_worker_count_defaults_to_cpu_count():
+    assert server.worker_count(3) == 3
+    assert server.worker_count(0) == (os.cpu_count() or 1)
+
+
+def test_uvicorn_options_come_from_settings():
+    settings = get_settings().model_copy(update={"host": "0.0.0.0", "port": 9000})
+
+    options = server.uvicorn_options(settings, workers=4)
+
+    assert options["host"] == "0.0.0.0"
+    assert options["port"] == 9000
+    assert options["workers"] == 4
+
+
+def test_multiple_workers_share_a_cache_generation_file(clean_settings):
+    server.share_cache_generation(workers=2)
+
+    assert get_settings().users_info_cache_shared_path.endswith(".gen")
+
+
+def test_single_worker_keeps_a_private_cache(clean_settings):
+    server.share_cache_generation(workers=1)
+
+    assert get_settings().users_info_cache_shared_path == ""
+
+
+def test_main_runs_uvicorn_with_requested_workers(clean_settings):
+    with patch.object(server, "run_uvicorn") as run:
+        server.main(["--workers", "2"])
+
+    app, _, workers = run.call_args.args
+    assert app == server.APP
+    assert workers == 2
+
+
+def test_forked_worker_starts_with_fresh_singletons():
+    http_client.get_http_pool()
+    hashing.get_hashing_pool()
+    user_info_cache.get_user_info_cache()
+    parent_instance = user_info_cache.INSTANCE
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        state = {
+            "http": http_client._pool is None,
+            "hashing": hashing._pool is None,
+            "cache": user_info_cache._cache is None,
+            "instance": user_info_cache.INSTANCE != parent_instance,
+        }
+        os.write(write_fd, json.dumps(state).encode())
+        os._exit(0)
+    os.close(write_fd)
+    state = json.loads(os.read(read_fd, 1024))
+    os.waitpid(pid, 0)
+    os.close(read_fd)
+
+    assert state == {"http": True, "hashing": True, "cache": True, "instance": True}
+    hashing.shutdown_hashing_pool()
@@ -0,0 +1,76 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.app.startup_profile import (
+    by_package,
+    import_times,
+    parse_importtime,
+    total_seconds,
+)
+
+# Generous bound on `import src.app.main` in a fresh interpreter; it is about
+# 0.7s on a developer laptop, so crossing it means a real regression.
+IMPORT_BUDGET_SECONDS = 2.5
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     orjson
+import time:       300 |        420 |   src.app.routes.responses
+import time:      1000 |       1420 | src.app.main
+"""
+
+
+def test_parse_importtime_reads_times_and_depth():
+    times = parse_importtime(SAMPLE)
+
+    assert [(t.name, t.self_us, t.depth) for t in times] == [
+        ("orjson", 120, 2),
+        ("src.app.routes.responses", 300, 1),
+        ("src.app.main", 1000, 0),
+    ]
+    assert total_seconds(times) == pytest.approx(0.00142)
+
+
+def test_by_package_groups_first_party_modules_by_layer():
+    assert by_package(parse_importtime(SAMPLE)) == {
+        "src.app.main": 1000,
+        "src.app.routes": 300,
+        "orjson": 120,
+    }
+
+
+def test_app_import_stays_within_budget_and_skips_lazy_modules():
+    times = import_times()
+    imported = {t.name for t in times}
+
+    assert total_seconds(times) < IMPORT_BUDGET_SECONDS
+    assert "passlib" not in imported
+    assert "bcrypt" not in imported
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_startup_steps_concurrently():
+    from src.app.main import app, lifespan
+
+    async def slow(*args):
+        await asyncio.sleep(0.2)
+
+    with (
+        patch("src.app.db.db_client.get_client", MagicMock()),
+        patch("src.app.db.db_client.get_db", MagicMock()),
+        patch("src.app.db.db_client.warm_pool", side_effect=slow),
+        patch("src.app.db.indexes.prepare_indexes", side_effect=slow),
+        patch("src.app.externals.http_client.get_http_pool"),
+        patch("src.app.externals.http_client.close_http_pool", AsyncMock()),
+        patch("src.app.security.hash_policy.init_hash_policy", side_effect=slow),
+        patch("src.app.security.hashing.get_hashing_pool"),
+        patch("src.app.security.hashing.shutdown_hashing_pool"),
+        patch("src.app.repositories.log_writer.get_log_writer", AsyncMock()),
+        patch("src.app.repositories.log_writer.close_log_writer", AsyncMock()),
+    ):
+        start = time.perf_counter()
+        async with lifespan(app):
+            elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35